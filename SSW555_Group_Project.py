@@ -1,13 +1,769 @@
-from typing import Iterator, Tuple, IO, List, Dict, Set, DefaultDict
-from collections import defaultdict
+from typing import Any, Callable, ContextManager, Hashable, Iterable, Iterator, Match, NamedTuple, Optional, Pattern, Tuple, IO, List, Dict, Set, DefaultDict
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import array
+import asyncio
+import bisect
+import codecs
+import contextlib
+import cProfile
+import csv
 import datetime
+import gc
+import glob
+import hashlib
+import inspect
+import io
+import itertools
+import json
+import locale
+import mmap
+import multiprocessing
 import os
+import pickle
+import re
 import sys
+import threading
+import time
+import tracemalloc
 from prettytable import PrettyTable
 
+try:
+    import resource
+except ImportError:
+    # Not available on Windows. Peak memory is reported as not available.
+    resource = None
+
+_months: Dict[str, int] = { 'JAN' : 1, 'FEB' : 2, 'MAR' : 3, 'APR' : 4, 'MAY' : 5, 'JUN' : 6,
+                            'JUL' : 7, 'AUG' : 8, 'SEP' : 9, 'OCT' : 10, 'NOV' : 11, 'DEC' : 12, } #key = GEDCOM month : value = month number
+
+_date_qualifiers: Set[str] = {'ABT', 'CAL', 'EST', 'BEF', 'AFT', 'INT', 'FROM', 'TO', 'BET'}
+
+@lru_cache(maxsize=131072)
+def decode_gedcom_date(date_in_gedcom_format: str) -> Optional[datetime.date]:
+    '''Converts a date from the format set in a GEDCOM file (day, month, year) to a datetime.date.
+        Partial dates ("MAY 1950", "1950") default the missing day and month to 1, and qualifiers such as "ABT", "BEF" or "BET ... AND ..."
+        are ignored in favour of the first date given. Returns None if the date can not be decoded.
+        Results are cached since the same dates repeat heavily across large files.
+    '''
+
+    parts: List[str] = date_in_gedcom_format.upper().split()
+
+    while parts and parts[0] in _date_qualifiers:
+        parts.pop(0)
+
+    if 'AND' in parts:
+        parts = parts[:parts.index('AND')]
+    elif 'TO' in parts:
+        parts = parts[:parts.index('TO')]
+
+    day: str = '1'
+    month: str = 'JAN'
+
+    if len(parts) == 3:
+        day, month, year = parts
+    elif len(parts) == 2:
+        month, year = parts
+    elif len(parts) == 1:
+        year = parts[0]
+    else:
+        return None
+
+    if month not in _months or not day.isdigit() or not year.isdigit():
+        return None
+
+    try:
+        return datetime.date(int(year), _months[month], int(day))
+    except ValueError:
+        # Day out of range for the month, or year 0
+        return None
+
+
+def group_by_key(records: Iterable[Any], key: Callable[[Any], Hashable]) -> Dict[Hashable, List[Any]]:
+    '''Buckets records by the (hashable) key tuple returned by key() in a single pass.
+        Both the buckets and the records within a bucket keep the order of the input records
+    '''
+
+    groups: DefaultDict[Hashable, List[Any]] = defaultdict(list)
+
+    for record in records:
+        groups[key(record)].append(record)
+
+    return groups
+
+def find_duplicate_groups(records: Iterable[Any], key: Callable[[Any], Hashable]) -> Iterator[Tuple[Hashable, List[Any]]]:
+    '''Yields every (key, records) bucket from group_by_key() that holds more than one record'''
+
+    for group_key, group in group_by_key(records, key).items():
+        if len(group) > 1:
+            yield group_key, group
+
+
+class Finding(NamedTuple):
+    '''A single error or anomaly reported by a user story. The message is only formatted when the finding is rendered'''
+    story: str #e.g. 'US02'
+    severity: str #'ERROR' or 'ANOMALY'
+    record_ids: Tuple[str, ...] #individual and family IDs involved, the primary record first
+    dates: Tuple[datetime.date, ...] #dates involved in the finding
+    template: str
+    arguments: Tuple[Any, ...]
+
+    def render(self) -> str:
+        '''Formats the message of the finding'''
+        return self.template.format(*self.arguments)
+
+    def as_dict(self) -> Dict[str, Any]:
+        '''Returns the finding as a dictionary that can be written as JSON'''
+        return { 'story' : self.story, 'severity' : self.severity, 'record_ids' : list(self.record_ids),
+                 'dates' : [date.isoformat() for date in self.dates], 'message' : self.render() }
+
+
+class Story(NamedTuple):
+    '''A user story GedcomFile can run'''
+    id: str #e.g. 'US02'
+    category: str #'error', 'anomaly', 'list' or 'table'
+    method: str #GedcomFile method that prints the story's output
+    findings: Optional[str] #GedcomFile method that yields the story's findings, for error and anomaly stories
+    dependencies: Tuple[str, ...] #data the story needs, see GedcomFile._dependency_builders
+    scope: str = 'file' #records the findings are computed per: 'individuals', 'families', 'related families' (families and the families of their children
+                        #and grandchildren) or 'file' (the whole file). See GedcomFile.revalidate_file()
+
+
+def render_findings(findings: Iterable[Finding], file: Optional[IO[str]] = None) -> int:
+    '''Prints the messages of the findings. Returns the number of findings rendered'''
+
+    count: int = 0
+
+    for finding in findings:
+        print(finding.render(), file = file)
+        count += 1
+
+    return count
+
+
+def diff_findings(previous: Iterable[Finding], current: Iterable[Finding]) -> Tuple[List[Finding], List[Finding]]:
+    '''Compares two sets of findings by story and message. Returns the findings of current that are new, and the findings of previous that are resolved, in their order.
+        Findings in both (the same objects, e.g. the ones revalidate_file() kept) are matched without rendering them
+    '''
+
+    previous = list(previous)
+    current = list(current)
+    kept: Set[int] = {id(finding) for finding in previous}.intersection(id(finding) for finding in current)
+    previous = [finding for finding in previous if id(finding) not in kept]
+    current = [finding for finding in current if id(finding) not in kept]
+    previous_messages: Counter = Counter((finding.story, finding.render()) for finding in previous)
+    current_messages: Counter = Counter((finding.story, finding.render()) for finding in current)
+
+    new_findings: List[Finding] = list()
+    for finding in current:
+        key: Tuple[str, str] = (finding.story, finding.render())
+        if previous_messages[key] > 0:
+            previous_messages[key] -= 1
+        else:
+            new_findings.append(finding)
+
+    resolved_findings: List[Finding] = list()
+    for finding in previous:
+        key = (finding.story, finding.render())
+        if current_messages[key] > 0:
+            current_messages[key] -= 1
+        else:
+            resolved_findings.append(finding)
+
+    return new_findings, resolved_findings
+
+
+class Profiler:
+    '''class Profiler
+        Records the wall time, CPU time, peak memory and item counts (lines, records, findings, ...) of each stage of a run.
+        Stages are measured one after another, not nested
+    '''
+
+    def __init__(self) -> None:
+        '''Sets the container for the measured stages'''
+
+        self.stages: List[Dict[str, Any]] = list()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, int]]:
+        '''Context manager that measures one stage. Yields a dictionary the stage can add its item counts to'''
+
+        counts: Dict[str, int] = dict()
+        wall_start: float = time.perf_counter()
+        cpu_start: float = time.process_time()
+
+        try:
+            yield counts
+        finally:
+            self.stages.append({ 'stage' : name, 'wall_seconds' : time.perf_counter() - wall_start, 'cpu_seconds' : time.process_time() - cpu_start,
+                                 'peak_memory_kb' : peak_memory_kb(), 'counts' : counts })
+
+    def as_dict(self) -> Dict[str, Any]:
+        '''Returns the measured stages, and their totals, as a dictionary that can be written as JSON'''
+
+        return { 'stages' : self.stages, 'wall_seconds' : sum(stage['wall_seconds'] for stage in self.stages),
+                 'cpu_seconds' : sum(stage['cpu_seconds'] for stage in self.stages), 'peak_memory_kb' : peak_memory_kb() }
+
+    def summary_table(self) -> PrettyTable:
+        '''Returns a table of the measured stages'''
+
+        table: PrettyTable = PrettyTable(field_names = ['Stage', 'Wall (s)', 'CPU (s)', 'Peak memory (MB)', 'Items'])
+        table.align['Stage'] = 'l'
+        table.align['Items'] = 'l'
+
+        for stage in self.stages:
+            peak: Optional[int] = stage['peak_memory_kb']
+            table.add_row([stage['stage'], f"{stage['wall_seconds']:.4f}", f"{stage['cpu_seconds']:.4f}", 'NA' if peak is None else f'{peak / 1024:.1f}',
+                           ', '.join(f'{name}: {count}' for name, count in stage['counts'].items())])
+
+        return table
+
+
+class MethodProfiler:
+    '''class MethodProfiler
+        Wraps chosen methods of one GedcomFile in cProfile and/or tracemalloc.
+        Every call of a wrapped method dumps a .pstats file and a report of the top allocations into the output directory
+    '''
+
+    def __init__(self, output_directory: str, use_cprofile: bool = True, use_tracemalloc: bool = True, top_allocations: int = 25) -> None:
+        '''Sets the output directory, the tools to profile with and the number of allocations reported'''
+
+        self.output_directory: str = output_directory
+        self.use_cprofile: bool = use_cprofile
+        self.use_tracemalloc: bool = use_tracemalloc
+        self.top_allocations: int = top_allocations
+        self.calls: Counter = Counter() #number of calls of each wrapped method so far
+        self.reports: List[str] = list() #files written so far
+        self.active: bool = False #whether a wrapped method is being profiled
+
+    def attach(self, gedcom: 'GedcomFile', method_names: Iterable[str]) -> None:
+        '''Wraps the methods of this GedcomFile instance. Other instances are not affected'''
+
+        os.makedirs(self.output_directory, exist_ok = True)
+
+        for name in method_names:
+            setattr(gedcom, name, self.wrap(name, getattr(gedcom, name)))
+
+    def wrap(self, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        '''Returns the method profiled on every call. Generators are run to the end while profiled, so the findings they yield are measured too'''
+
+        @wraps(method)
+        def profiled(*args: Any, **kwargs: Any) -> Any:
+            # A wrapped method called by another one is measured as part of the outer call
+            if self.active:
+                return method(*args, **kwargs)
+
+            self.calls[name] += 1
+            prefix: str = os.path.join(self.output_directory, f'{name}.{self.calls[name]}')
+
+            tracing: bool = self.use_tracemalloc and not tracemalloc.is_tracing()
+            if tracing:
+                tracemalloc.start()
+            before: Optional[tracemalloc.Snapshot] = tracemalloc.take_snapshot() if self.use_tracemalloc else None
+            profile: Optional[cProfile.Profile] = cProfile.Profile() if self.use_cprofile else None
+
+            self.active = True
+            try:
+                if profile is not None:
+                    profile.enable()
+                result: Any = method(*args, **kwargs)
+                if inspect.isgenerator(result):
+                    result = iter(list(result))
+            finally:
+                if profile is not None:
+                    profile.disable()
+                self.active = False
+
+                # Snapshot before dumping the stats, so the report does not include the profiler's own allocations
+                if before is not None:
+                    self.write_allocations(f'{prefix}.allocations.txt', name, tracemalloc.take_snapshot().compare_to(before, 'lineno'))
+                    if tracing:
+                        tracemalloc.stop()
+
+                if profile is not None:
+                    profile.dump_stats(f'{prefix}.pstats')
+                    self.reports.append(f'{prefix}.pstats')
+
+            return result
+
+        return profiled
+
+    def write_allocations(self, file_name: str, name: str, statistics: List[tracemalloc.StatisticDiff]) -> None:
+        '''Writes the lines that allocated the most memory during one call, and still held it when the call returned'''
+
+        with open(file_name, 'w') as file:
+            print(f'Top {self.top_allocations} allocations of {name}', file = file)
+            for statistic in statistics[:self.top_allocations]:
+                print(statistic, file = file)
+
+        self.reports.append(file_name)
+
+
+class StreamingTable:
+    '''class StreamingTable
+        Prints a table as PrettyTable does, without keeping all of its rows in memory: rows are rendered and printed one chunk at a time.
+        The column widths come from the header and the first chunk, or are given, and only grow when a later row is wider.
+        A table that fits in one chunk prints exactly as PrettyTable prints it
+    '''
+
+    def __init__(self, field_names: List[str], file: Optional[IO[str]] = None, chunk_size: int = 1000, widths: Optional[List[int]] = None, paged: bool = False) -> None:
+        '''Sets the header, where the table is printed, the number of rows per chunk, the starting column widths and whether each chunk is a page with its own header'''
+
+        self.field_names: List[str] = field_names
+        self.file: Optional[IO[str]] = file
+        self.chunk_size: int = max(1, chunk_size)
+        self.paged: bool = paged
+        self.widths: Dict[str, int] = dict(zip(field_names, widths)) if widths else dict()
+        self.rows: List[List[Any]] = list() #rows not printed yet
+        self.bottom_border: Optional[str] = None #border closing the rows printed so far
+
+    def __enter__(self) -> 'StreamingTable':
+        return self
+
+    def __exit__(self, *exception: Any) -> None:
+        self.close()
+
+    def add_row(self, row: List[Any]) -> None:
+        '''Adds a row, printing the chunk it completes'''
+
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        '''Prints the rows added so far, except for the bottom border, which is printed by the next page or by close()'''
+
+        if not self.rows:
+            return
+
+        table: PrettyTable = PrettyTable(field_names = self.field_names)
+        # Older PrettyTable versions only accept one width for all the columns in the min_width setter
+        table.min_width.update(self.widths)
+        table.add_rows(self.rows)
+        self.rows = list()
+
+        continued: bool = self.bottom_border is not None and not self.paged
+        lines: List[str] = table.get_string(header = not continued).splitlines()
+
+        if continued and lines[0] == self.bottom_border:
+            # Same widths as the rows above, so the top border is not needed
+            lines = lines[1:]
+        elif self.paged and self.bottom_border is not None:
+            print(f'{self.bottom_border}\n', file = self.file)
+
+        print('\n'.join(lines[:-1]), file = self.file)
+        self.bottom_border = lines[-1]
+
+        # Each column is padded with one space on both sides
+        self.widths = { name: len(border) - 2 for name, border in zip(self.field_names, self.bottom_border.split('+')[1:-1]) }
+
+    def close(self) -> None:
+        '''Prints the remaining rows and the bottom border. A table without rows prints its header'''
+
+        self.flush()
+
+        if self.bottom_border is None:
+            print(PrettyTable(field_names = self.field_names), file = self.file)
+        else:
+            print(self.bottom_border, file = self.file)
+            self.bottom_border = None
+
+
+def isoformat_date(value: Any) -> Optional[str]:
+    '''Returns a date as YYYY-MM-DD, or None for a missing date ('NA' or empty)'''
+    return value.isoformat() if type(value) == datetime.date else None
+
+
+def format_id_set(ids: Set[str]) -> str:
+    '''Returns a set of IDs as it prints, but with the IDs sorted. A set iterates in an order that depends on how it was built, e.g. by a worker process or from a snapshot'''
+    return '{' + ', '.join(repr(record_id) for record_id in sorted(ids)) + '}'
+
+
+# Columns of the exported tables, and their types: 'text', 'date' (YYYY-MM-DD), 'int', 'bool' or 'list' (of text)
+_export_columns: Dict[str, List[Tuple[str, str]]] = {
+    'individuals' : [('id', 'text'), ('name', 'text'), ('sex', 'text'), ('birth', 'date'), ('age', 'int'), ('living', 'bool'), ('death', 'date'),
+                     ('child_of', 'list'), ('spouse_of', 'list')],
+    'families' : [('id', 'text'), ('married', 'date'), ('divorced', 'date'), ('husband_id', 'text'), ('husband_name', 'text'), ('wife_id', 'text'),
+                  ('wife_name', 'text'), ('children', 'list')],
+    'findings' : [('story', 'text'), ('severity', 'text'), ('record_ids', 'list'), ('dates', 'list'), ('message', 'text')],
+}
+
+
+class RecordWriter(ABC):
+    '''class RecordWriter
+        Writes the exported tables (see _export_columns) as their rows come, without keeping them in memory
+    '''
+
+    def __enter__(self) -> 'RecordWriter':
+        return self
+
+    def __exit__(self, *exception: Any) -> None:
+        self.close()
+
+    @abstractmethod
+    def write_table(self, table: str, rows: Iterable[Dict[str, Any]]) -> int:
+        '''Writes the rows of a table. Returns the number of rows written'''
+
+    def close(self) -> None:
+        '''Finishes writing'''
+
+
+class JsonLinesWriter(RecordWriter):
+    '''class JsonLinesWriter
+        Writes every row as a JSON object on its own line, with the name of its table, to a file or to stdout ('-')
+    '''
+
+    def __init__(self, output: str) -> None:
+        '''Opens the output file'''
+
+        self.file: IO[str] = sys.stdout if output == '-' else open(output, 'w')
+
+    def write_table(self, table: str, rows: Iterable[Dict[str, Any]]) -> int:
+        count: int = 0
+
+        for row in rows:
+            self.file.write(json.dumps({ 'table' : table, **row }) + '\n')
+            count += 1
+
+        return count
+
+    def close(self) -> None:
+        if self.file is sys.stdout:
+            self.file.flush()
+        else:
+            self.file.close()
+
+
+class CsvWriter(RecordWriter):
+    '''class CsvWriter
+        Writes each table to <table>.csv in the output directory. Lists are joined with semicolons, and missing values are empty
+    '''
+
+    def __init__(self, output: str) -> None:
+        '''Creates the output directory'''
+
+        self.directory: str = output
+        os.makedirs(output, exist_ok = True)
+
+    def write_table(self, table: str, rows: Iterable[Dict[str, Any]]) -> int:
+        columns: List[Tuple[str, str]] = _export_columns[table]
+        count: int = 0
+
+        with open(os.path.join(self.directory, f'{table}.csv'), 'w', newline = '') as file:
+            writer = csv.writer(file)
+            writer.writerow(name for name, _ in columns)
+
+            for row in rows:
+                writer.writerow(';'.join(row[name]) if kind == 'list' else ('' if row[name] is None else row[name]) for name, kind in columns)
+                count += 1
+
+        return count
+
+
+class ColumnarWriter(RecordWriter):
+    '''class ColumnarWriter
+        Writes each column of each table to its own file in the output directory, as a machine array a bulk loader can read as is:
+            date: <table>.<column>.i32, days since 0001-01-01 (date.toordinal()), 0 when missing
+            int: <table>.<column>.i32, -2147483648 (the smallest int32) when missing, as ages can be negative
+            bool: <table>.<column>.i8, 0 or 1
+            text and list: <table>.<column>.utf8, the values one after the other (lists joined with semicolons),
+                           and <table>.<column>.offsets.i64, the offset where each value ends
+        schema.json describes the tables, their columns, row counts and the byte order of the arrays. See read_columnar_table()
+    '''
+
+    _flush_rows: int = 65536 #rows kept in the column arrays before they are appended to their files
+    _missing_int: int = -2 ** 31 #value of a missing int
+    # Array typecodes of the fixed width columns. The size of a C int or long depends on the platform, so the one with the right size is picked
+    _int32: str = next(typecode for typecode in ('i', 'l') if array.array(typecode).itemsize == 4)
+    _int64: str = next(typecode for typecode in ('q', 'l') if array.array(typecode).itemsize == 8)
+
+    def __init__(self, output: str) -> None:
+        '''Creates the output directory'''
+
+        self.directory: str = output
+        self.schema: Dict[str, Any] = { 'byteorder' : sys.byteorder, 'tables' : dict() }
+        os.makedirs(output, exist_ok = True)
+
+    def write_table(self, table: str, rows: Iterable[Dict[str, Any]]) -> int:
+        columns: List[Tuple[str, str]] = _export_columns[table]
+        files: Dict[str, IO[bytes]] = dict()
+        arrays: Dict[str, array.array] = dict()
+        text_ends: Dict[str, int] = dict() #offset where the text written so far ends, per text column
+        count: int = 0
+
+        for name, kind in columns:
+            if kind in ('text', 'list'):
+                files[f'{name}.utf8'] = open(os.path.join(self.directory, f'{table}.{name}.utf8'), 'wb')
+                files[f'{name}.offsets'] = open(os.path.join(self.directory, f'{table}.{name}.offsets.i64'), 'wb')
+                arrays[f'{name}.utf8'] = array.array('B')
+                arrays[f'{name}.offsets'] = array.array(ColumnarWriter._int64)
+                text_ends[name] = 0
+            else:
+                suffix: str = 'i8' if kind == 'bool' else 'i32'
+                files[name] = open(os.path.join(self.directory, f'{table}.{name}.{suffix}'), 'wb')
+                arrays[name] = array.array('b' if kind == 'bool' else ColumnarWriter._int32)
+
+        try:
+            for row in rows:
+                for name, kind in columns:
+                    value: Any = row[name]
+
+                    if kind in ('text', 'list'):
+                        encoded: bytes = (';'.join(value) if kind == 'list' else value or '').encode()
+                        arrays[f'{name}.utf8'].frombytes(encoded)
+                        text_ends[name] += len(encoded)
+                        arrays[f'{name}.offsets'].append(text_ends[name])
+                    elif kind == 'date':
+                        arrays[name].append(0 if value is None else datetime.date.fromisoformat(value).toordinal())
+                    elif kind == 'int':
+                        arrays[name].append(ColumnarWriter._missing_int if value is None else value)
+                    else:
+                        arrays[name].append(1 if value else 0)
+
+                count += 1
+                if count % ColumnarWriter._flush_rows == 0:
+                    self.flush(files, arrays)
+
+            self.flush(files, arrays)
+        finally:
+            for file in files.values():
+                file.close()
+
+        self.schema['tables'][table] = { 'rows' : count, 'columns' : [{ 'name' : name, 'type' : kind } for name, kind in columns] }
+        return count
+
+    def flush(self, files: Dict[str, IO[bytes]], arrays: Dict[str, array.array]) -> None:
+        '''Appends the column arrays to their files, and empties them'''
+
+        for key, values in arrays.items():
+            values.tofile(files[key])
+            del values[:]
+
+    def close(self) -> None:
+        with open(os.path.join(self.directory, 'schema.json'), 'w') as file:
+            json.dump(self.schema, file, indent = 2)
+
+
+def read_columnar_table(directory: str, table: str) -> Dict[str, List[Any]]:
+    '''Reads a table written by ColumnarWriter back into lists of values per column, with the missing values as None'''
+
+    with open(os.path.join(directory, 'schema.json')) as file:
+        schema: Dict[str, Any] = json.load(file)
+
+    columns: Dict[str, List[Any]] = dict()
+
+    for column in schema['tables'][table]['columns']:
+        name: str = column['name']
+        kind: str = column['type']
+        path: str = os.path.join(directory, f'{table}.{name}')
+
+        if kind in ('text', 'list'):
+            values: array.array = array.array(ColumnarWriter._int64)
+            with open(f'{path}.offsets.i64', 'rb') as file:
+                values.frombytes(file.read())
+            with open(f'{path}.utf8', 'rb') as file:
+                text: bytes = file.read()
+            if schema['byteorder'] != sys.byteorder:
+                values.byteswap()
+
+            strings: List[str] = [text[start:end].decode() for start, end in zip(itertools.chain((0,), values), values)]
+            columns[name] = [string.split(';') if string else [] for string in strings] if kind == 'list' else strings
+        else:
+            values = array.array('b' if kind == 'bool' else ColumnarWriter._int32)
+            with open(f"{path}.{'i8' if kind == 'bool' else 'i32'}", 'rb') as file:
+                values.frombytes(file.read())
+            if schema['byteorder'] != sys.byteorder:
+                values.byteswap()
+
+            if kind == 'date':
+                columns[name] = [datetime.date.fromordinal(value).isoformat() if value else None for value in values]
+            elif kind == 'int':
+                columns[name] = [None if value == ColumnarWriter._missing_int else value for value in values]
+            else:
+                columns[name] = [bool(value) for value in values]
+
+    return columns
+
+
+_record_writers: Dict[str, type] = { 'jsonl' : JsonLinesWriter, 'csv' : CsvWriter, 'columnar' : ColumnarWriter }
+
+
+def count_lines(file_name: str) -> int:
+    '''Returns the number of lines of a file'''
+
+    count: int = 0
+    last_block: bytes = b''
+
+    with open(file_name, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            count += block.count(b'\n')
+            last_block = block
+
+    # The last line may not end with a newline
+    return count + 1 if last_block and not last_block.endswith(b'\n') else count
+
+
+def peak_memory_kb() -> Optional[int]:
+    '''Returns the peak resident memory of this process so far in KB, or None where the resource module is not available'''
+
+    if resource is None:
+        return None
+
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports KB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+_worker_gedcom: Optional['GedcomFile'] = None #the GEDCOM file validated by this worker process
+
+def _set_worker_gedcom(gedcom: 'GedcomFile') -> None:
+    '''Process pool initializer: keeps the GEDCOM file the worker validates'''
+    global _worker_gedcom
+    _worker_gedcom = gedcom
+
+
+def _run_worker_story(story: str) -> List[Finding]:
+    '''Runs one story in a worker process and returns its findings'''
+    return list(getattr(_worker_gedcom, story)())
+
+
+def find_record_boundaries(buffer: bytes, number_of_shards: int) -> List[int]:
+    '''Splits a GEDCOM file held in a bytes-like buffer (e.g. an mmap) into about number_of_shards byte ranges.
+        Every range except the first starts at a '0 <id> INDI' or '0 <id> FAM' line, so no record is split between two ranges.
+        Returns the start offsets of the ranges followed by the size of the buffer
+    '''
+
+    size: int = len(buffer)
+    boundaries: List[int] = [0]
+
+    for shard in range(1, number_of_shards):
+        position: int = max(size * shard // number_of_shards - 1, boundaries[-1])
+
+        while True:
+            position = buffer.find(b'\n0 ', position)
+            if position == -1:
+                boundaries.append(size)
+                return boundaries
+
+            position += 1
+            end_of_line: int = buffer.find(b'\n', position)
+            tokens: List[bytes] = buffer[position:end_of_line if end_of_line != -1 else size].split()
+
+            if tokens[-1] == b'INDI' or tokens[-1] == b'FAM':
+                break
+
+        if position > boundaries[-1]:
+            boundaries.append(position)
+
+    boundaries.append(size)
+    return boundaries
+
+
+def compile_gedcom_line_pattern(valid_tags: Dict[str, str]) -> Pattern[bytes]:
+    '''Returns the pattern the memory-mapped reader finds the lines of a GEDCOM file with. Every match is one line, captured in one of three ways:
+        a valid line in its usual form, '<level> <tag>' or '<level> <tag> <value>' with printable ASCII separated by single spaces (level and tag, and value),
+        a '0 <id> INDI' or '0 <id> FAM' line (ID and tag), or any other non blank line as it is.
+        Blank lines, lines of level 3 or more and level 1 or 2 lines with a tag that is not valid at their level are never valid, so the pattern skips them without a match
+    '''
+
+    def tags_of_level(level: str) -> bytes:
+        '''Returns the valid tags of a level as regular expression alternatives'''
+        return b'|'.join(tag.encode() for tag, tag_level in valid_tags.items() if tag_level == level and tag != 'INDI' and tag != 'FAM')
+
+    invalid_line: bytes = (rb'(?:1 (?!(?:' + tags_of_level('1') + rb')\s)[!-~]+(?=\s)|2 (?!(?:' + tags_of_level('2') + rb')\s)[!-~]+(?=\s)|[3-9] )[^\r\n]*\r?\n'
+                           rb'|[ \t\r\f\v]*\n')
+    valid_line: bytes = (rb'(0 (?:' + tags_of_level('0') + rb')|1 (?:' + tags_of_level('1') + rb')|2 (?:' + tags_of_level('2') + rb'))'
+                         rb'(?: ((?:[!-~]+ )*[!-~]+))?\r?$')
+    record_line: bytes = rb'0 ([!-~]+) (INDI|FAM)\r?$'
+
+    # The last alternative ends the search at the end of the buffer, once only skipped lines are left
+    return re.compile(rb'^(?:' + invalid_line + rb')*(?:' + valid_line + rb'|' + record_line + rb'|([^\n]+|\Z))', re.MULTILINE)
+
+
+def record_state(record: Any) -> Tuple[Any, ...]:
+    '''Returns the values of the slots of an Individual or Family record'''
+    return tuple(getattr(record, slot) for slot in record.__slots__)
+
+
+def restore_record(record_class: type, state: Tuple[Any, ...]) -> Any:
+    '''Rebuilds an Individual or Family record from the values returned by record_state()'''
+
+    record = record_class.__new__(record_class)
+    for slot, value in zip(record_class.__slots__, state):
+        setattr(record, slot, value)
+
+    # IDs are interned when parsed. Keep them that way.
+    record.id = sys.intern(record.id)
+    return record
+
+
+def file_digest(file_name: str) -> str:
+    '''Returns the SHA-256 digest of a file'''
+
+    digest = hashlib.sha256()
+
+    with open(file_name, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def text_digest(text: str) -> bytes:
+    '''Returns a short digest of some text, e.g. of a record, to tell whether it changed without keeping it'''
+
+    return hashlib.blake2b(text.encode('utf-8'), digest_size = 16).digest()
+
+
+def matching_length(previous: str, previous_start: int, current: str, current_start: int, block_size: int = 1 << 16) -> int:
+    '''Returns for how many characters previous from previous_start on and current from current_start on are the same.
+        Whole blocks are compared first, then halves of the block that differs, so the text that did not change costs a few string comparisons
+    '''
+
+    limit: int = min(len(previous) - previous_start, len(current) - current_start)
+    length: int = 0
+    step: int = block_size
+
+    while step:
+        while length + step <= limit and previous[previous_start + length:previous_start + length + step] == current[current_start + length:current_start + length + step]:
+            length += step
+        step //= 2
+
+    return length
+
+
+def is_ascii_compatible(encoding: str) -> bool:
+    '''Returns whether a text encoding writes the lines of a GEDCOM file as ASCII bytes, e.g. UTF-8 or Latin-1 but not UTF-16, so they can be found in the raw bytes'''
+    return '\n0 @I1@ INDI\r\n'.encode(encoding) == b'\n0 @I1@ INDI\r\n'
+
+
+def _parse_shard(file_name: str, start: int, end: int, encoding: str) -> Tuple[List['Individual'], List['Family']]:
+    '''Parses bytes start to end of a GEDCOM file in a worker process. Returns the individual and family records in file order, duplicates included'''
+
+    gedcom: GedcomFile = GedcomFile(encoding = encoding)
+    individuals: List[Individual] = list()
+    families: List[Family] = list()
+
+    with open(file_name, 'rb') as file, mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ) as buffer:
+        lines: IO[str] = io.StringIO(buffer[start:end].decode(encoding), newline = None)
+
+    for record in gedcom.iter_records(gedcom.stream_valid_entries(lines)):
+        if type(record) == Individual:
+            individuals.append(record)
+        else:
+            families.append(record)
+
+    return individuals, families
+
+
 class Family:
     '''class Family'''
     _pretty_table_headers: List[str] = ['ID', 'Married', 'Divorced', 'Husband ID', 'Husband Name', 'Wife ID', 'Wife Name', 'Children']
+    __slots__ = ('id', 'marriage_date', 'divorce_date', 'husband_id', 'husband_name', 'wife_id', 'wife_name', 'children', 'preceding_tag_related_to_date')
 
     def __init__(self):
         '''Initializes the details for an instance of a family'''
@@ -26,16 +782,16 @@ class Family:
         '''Assigns family detail based on a given tag'''
         
         if tag == 'FAM':
-            self.id = argument
+            self.id = sys.intern(argument)
         
         if tag == 'HUSB':
-            self.husband_id = argument
+            self.husband_id = sys.intern(argument)
 
         if tag == 'WIFE':
-            self.wife_id = argument
+            self.wife_id = sys.intern(argument)
         
         if tag == 'CHIL':
-            self.children.add(argument)
+            self.children.add(sys.intern(argument))
         
         if tag == 'MARR' or tag == 'DIV':
             self.preceding_tag_related_to_date = tag
@@ -49,11 +805,11 @@ class Family:
             preceding tag, which is either "MARR" or "DIV"
         '''
 
-        day, month, year = date_in_gedcom_format.split(" ")
-        day: int = int(day)
-        year: int = int(year)
-        month: int = datetime.datetime.strptime(month, '%b').month
-        date_in_final_format: str = datetime.date(year, month, day)
+        date_in_final_format: Optional[datetime.date] = decode_gedcom_date(date_in_gedcom_format)
+
+        if date_in_final_format is None:
+            # Date could not be decoded. Leave the date as not available.
+            return
 
         if self.preceding_tag_related_to_date == 'MARR':
             self.marriage_date = date_in_final_format
@@ -64,13 +820,20 @@ class Family:
     def return_pretty_table_row(self) -> List[str]:
         '''Returns a list that is to be used as a row in the families pretty table'''
 
-        return [self.id, self.marriage_date, self.divorce_date, self.husband_id, self.husband_name, self.wife_id, self.wife_name, (self.children or "None")]
+        return [self.id, self.marriage_date, self.divorce_date, self.husband_id, self.husband_name, self.wife_id, self.wife_name, (format_id_set(self.children) if self.children else "None")]
+
+    def as_dict(self) -> Dict[str, Any]:
+        '''Returns the family as a dictionary that can be written as JSON, with the columns of _export_columns['families']'''
+
+        return { 'id' : self.id, 'married' : isoformat_date(self.marriage_date), 'divorced' : isoformat_date(self.divorce_date), 'husband_id' : self.husband_id,
+                 'husband_name' : self.husband_name, 'wife_id' : self.wife_id, 'wife_name' : self.wife_name, 'children' : sorted(self.children) }
 
 
 class Individual:
     '''class Individual'''
 
     _headers_for_prettytable: List[str] = ["ID", "Name", "Gender", "Birthday", "Age", "Alive", "Death", "Child", "Spouse"]
+    __slots__ = ('id', 'name', 'sex', 'birth', 'age', 'living', 'death_date', 'famc', 'fams', 'preceding_tag_related_to_date')
 
     def __init__(self):
         '''Initializes the details for an instance of an individual'''
@@ -90,7 +853,7 @@ class Individual:
         '''Assigns family detail based on a given tag'''
 
         if tag == 'INDI':
-            self.id = argument
+            self.id = sys.intern(argument)
 
         elif tag == 'NAME':
             self.name = argument
@@ -102,10 +865,10 @@ class Individual:
             self.preceding_tag_related_to_date = tag
         
         elif tag == 'FAMC':
-            self.famc.add(argument)
+            self.famc.add(sys.intern(argument))
         
         elif tag == 'FAMS':
-            self.fams.add(argument)
+            self.fams.add(sys.intern(argument))
 
         elif tag == 'DATE':
             self.process_individual_record_date_tag(argument)
@@ -116,11 +879,11 @@ class Individual:
             preceding tag, which is either "BIRT" or "DEAT"
         '''
 
-        day, month, year = date_in_gedcom_format.split(" ")
-        day: int = int(day)
-        year: int = int(year)
-        month: int = datetime.datetime.strptime(month, '%b').month
-        date_in_final_format: str = datetime.date(year, month, day)
+        date_in_final_format: Optional[datetime.date] = decode_gedcom_date(date_in_gedcom_format)
+
+        if date_in_final_format is None:
+            # Date could not be decoded. Leave the date as not available.
+            return
 
         if self.preceding_tag_related_to_date == 'BIRT':
             self.birth = date_in_final_format
@@ -134,6 +897,10 @@ class Individual:
     def setAge(self) -> None: 
         '''Calculates the age of an individual'''
 
+        if type(self.birth) != datetime.date:
+            # Birth date not (yet) provided, so age can not be calculated.
+            return
+
         if self.living:
             today = datetime.date.today()
         else:
@@ -143,7 +910,14 @@ class Individual:
     def return_pretty_table_row(self) -> List[str]:
         '''Returns a list that is to be used as a row for the individuals pretty table'''
 
-        return [self.id, self.name, self.sex, self.birth, self.age, self.living, self.death_date, (self.famc or "None"), (self.fams or "NA")]
+        return [self.id, self.name, self.sex, self.birth, self.age, self.living, self.death_date, (format_id_set(self.famc) if self.famc else "None"),
+                (format_id_set(self.fams) if self.fams else "NA")]
+
+    def as_dict(self) -> Dict[str, Any]:
+        '''Returns the individual as a dictionary that can be written as JSON, with the columns of _export_columns['individuals']'''
+
+        return { 'id' : self.id, 'name' : self.name, 'sex' : self.sex, 'birth' : isoformat_date(self.birth), 'age' : self.age if type(self.age) == int else None,
+                 'living' : bool(self.living), 'death' : isoformat_date(self.death_date), 'child_of' : sorted(self.famc), 'spouse_of' : sorted(self.fams) }
 
     def return_living_and_marital_details(self) -> Tuple[bool, int, str]:
         '''Implemented for US30 & US31. 
@@ -155,31 +929,315 @@ class Individual:
         return self.name, self.age, self.living, len(self.fams) 
 
 
+class RelationshipIndex:
+    '''class RelationshipIndex
+        Precomputes parents, children, spouses, siblings and families for every individual, so validators can look up
+        relationships without joining _individual_dt and _family_dt again
+    '''
+
+    def __init__(self, individual_dt: Dict[str, Individual], family_dt: Dict[str, Family]) -> None:
+        '''Builds the index with one pass over the individuals and their families'''
+
+        self._families_as_child: Dict[str, Set[str]] = dict()
+        self._families_as_spouse: Dict[str, Set[str]] = dict()
+        self._parents: Dict[str, List[str]] = dict()
+        self._children: Dict[str, List[str]] = dict()
+        self._spouses: Dict[str, List[Tuple[str, str]]] = dict()
+        self._siblings: Dict[str, List[str]] = dict()
+        self._family_position: Dict[str, int] = dict()
+        self._parent_families: DefaultDict[str, List[str]] = defaultdict(list)
+
+        # Families that list a child, in the order the families appear in the file
+        for position, (family_id, family) in enumerate(family_dt.items()):
+            self._family_position[family_id] = position
+
+            for child_id in family.children:
+                if family_id not in self._parent_families[child_id]:
+                    self._parent_families[child_id].append(family_id)
+
+        for individual_id, individual in individual_dt.items():
+            self._index_individual(individual_id, individual, individual_dt, family_dt)
+
+    def _index_individual(self, individual_id: str, individual: Individual, individual_dt: Dict[str, Individual], family_dt: Dict[str, Family]) -> None:
+        '''Indexes the relationships of one individual. The families that list the individual with CHIL must be in _parent_families already'''
+
+        parents: List[str] = list()
+        siblings: List[str] = list()
+        families_as_child: Set[str] = {family_id for family_id in individual.famc if family_id in family_dt}
+
+        # Sets iterate in an order that depends on how they were built, so the families are walked in file order and the children by ID
+        for family_id in sorted(families_as_child, key = self._family_position.__getitem__):
+            family: Family = family_dt[family_id]
+
+            for parent_id in (family.husband_id, family.wife_id):
+                if parent_id in individual_dt and parent_id not in parents:
+                    parents.append(parent_id)
+
+            for sibling_id in sorted(family.children):
+                if sibling_id != individual_id and sibling_id in individual_dt and sibling_id not in siblings:
+                    siblings.append(sibling_id)
+
+        children: List[str] = list()
+        spouses: List[Tuple[str, str]] = list()
+        families_as_spouse: Set[str] = {family_id for family_id in individual.fams if family_id in family_dt}
+
+        for family_id in sorted(families_as_spouse, key = self._family_position.__getitem__):
+            family = family_dt[family_id]
+            spouse_id: str = family.husband_id if individual_id == family.wife_id else family.wife_id
+
+            if spouse_id in individual_dt:
+                spouses.append((family_id, spouse_id))
+
+            for child_id in sorted(family.children):
+                if child_id in individual_dt and child_id not in children:
+                    children.append(child_id)
+
+        # Families the child claims with FAMC, even if the family does not list the child with CHIL
+        parent_families: List[str] = self._parent_families[individual_id]
+        if not families_as_child.issubset(parent_families):
+            parent_families.extend(families_as_child.difference(parent_families))
+            parent_families.sort(key=self._family_position.__getitem__)
+
+        self._families_as_child[individual_id] = families_as_child
+        self._families_as_spouse[individual_id] = families_as_spouse
+        self._parents[individual_id] = parents
+        self._children[individual_id] = children
+        self._spouses[individual_id] = spouses
+        self._siblings[individual_id] = siblings
+
+    def update(self, individual_dt: Dict[str, Individual], family_dt: Dict[str, Family], individual_ids: Iterable[str], family_ids: Iterable[str], reordered: bool = False) -> None:
+        '''Updates the index in place after the records of family_ids were added, changed or removed. individual_ids are the individuals to index again:
+            the changed ones and every member of the changed families, from either side of the links, before and after the change.
+            The positions of the families are only counted again if a family was added or reordered
+        '''
+
+        family_ids = list(family_ids)
+
+        for family_id in family_ids:
+            if family_id not in family_dt:
+                self._family_position.pop(family_id, None)
+
+        if reordered or any(family_id in family_dt and family_id not in self._family_position for family_id in family_ids):
+            self._family_position = { family_id : position for position, family_id in enumerate(family_dt) }
+
+        for individual_id in individual_ids:
+            # The families that list the child now: those that did before, unless they changed, and the changed ones
+            listing_families: Set[str] = {family_id for family_id in itertools.chain(self._parent_families.get(individual_id, ()), family_ids)
+                                          if family_id in family_dt and individual_id in family_dt[family_id].children}
+            self._parent_families[individual_id] = sorted(listing_families, key = self._family_position.__getitem__)
+
+            if individual_id in individual_dt:
+                self._index_individual(individual_id, individual_dt[individual_id], individual_dt, family_dt)
+            else:
+                for relationships in (self._families_as_child, self._families_as_spouse, self._parents, self._children, self._spouses, self._siblings):
+                    relationships.pop(individual_id, None)
+
+    def parents_of(self, individual_id: str) -> List[str]:
+        '''Returns the IDs of the husband and wife of every family the individual is a child of'''
+
+        return self._parents.get(individual_id, [])
+
+    def children_of(self, individual_id: str) -> List[str]:
+        '''Returns the IDs of the children of every family the individual is a spouse in'''
+
+        return self._children.get(individual_id, [])
+
+    def spouses_of(self, individual_id: str) -> List[Tuple[str, str]]:
+        '''Returns a (family ID, spouse ID) tuple for every family the individual is a spouse in'''
+
+        return self._spouses.get(individual_id, [])
+
+    def siblings_of(self, individual_id: str) -> List[str]:
+        '''Returns the IDs of the other children of every family the individual is a child of'''
+
+        return self._siblings.get(individual_id, [])
+
+    def parent_families_of(self, child_id: str) -> List[str]:
+        '''Returns the IDs of the families the individual is a child of, either by the family's CHIL or the individual's FAMC, in file order'''
+
+        return self._parent_families.get(child_id, [])
+
+    def family_position(self, family_id: str) -> int:
+        '''Returns the position of a family in the file'''
+
+        return self._family_position[family_id]
+
+    def families_of(self, individual_id: str) -> Tuple[Set[str], Set[str]]:
+        '''Returns the IDs of the families the individual is a child of, and the IDs of the families the individual is a spouse in'''
+
+        return self._families_as_child.get(individual_id, set()), self._families_as_spouse.get(individual_id, set())
+
+
+class RecordLinks:
+    '''class RecordLinks
+        Links between individuals and families, followed from both sides (HUSB, WIFE and CHIL as well as FAMS and FAMC), so inconsistent records are linked too.
+        GedcomFile.affected_scope() follows them from the records that changed
+    '''
+
+    def __init__(self, individual_dt: Dict[str, Individual], family_dt: Dict[str, Family]) -> None:
+        '''Links every individual and family'''
+
+        self.members: DefaultDict[str, Set[str]] = defaultdict(set) #key = family ID : value = husband, wife and children
+        self.children: DefaultDict[str, Set[str]] = defaultdict(set) #key = family ID : value = children
+        self.families_of: DefaultDict[str, Set[str]] = defaultdict(set) #key = individual ID : value = families as spouse or child
+        self.spouse_families: DefaultDict[str, Set[str]] = defaultdict(set) #key = individual ID : value = families as spouse
+
+        for family_id, family in family_dt.items():
+            for spouse_id in (family.husband_id, family.wife_id):
+                self.members[family_id].add(spouse_id)
+                self.families_of[spouse_id].add(family_id)
+                self.spouse_families[spouse_id].add(family_id)
+
+            for child_id in family.children:
+                self.members[family_id].add(child_id)
+                self.children[family_id].add(child_id)
+                self.families_of[child_id].add(family_id)
+
+        for individual_id, individual in individual_dt.items():
+            for family_id in individual.fams:
+                self.members[family_id].add(individual_id)
+                self.families_of[individual_id].add(family_id)
+                self.spouse_families[individual_id].add(family_id)
+
+            for family_id in individual.famc:
+                self.members[family_id].add(individual_id)
+                self.children[family_id].add(individual_id)
+                self.families_of[individual_id].add(family_id)
+
+    def update(self, individual_dt: Dict[str, Individual], family_dt: Dict[str, Family], individual_ids: Iterable[str], family_ids: Iterable[str]) -> None:
+        '''Links the records of individual_ids and family_ids again after they were added, changed or removed. Only the links they had or have now are looked at'''
+
+        pairs: Set[Tuple[str, str]] = set()
+
+        for individual_id in individual_ids:
+            individual: Optional[Individual] = individual_dt.get(individual_id)
+            pairs.update((individual_id, family_id) for family_id in self.families_of.get(individual_id, ()))
+            if individual is not None:
+                pairs.update((individual_id, family_id) for family_id in itertools.chain(individual.fams, individual.famc))
+
+        for family_id in family_ids:
+            family: Optional[Family] = family_dt.get(family_id)
+            pairs.update((individual_id, family_id) for individual_id in self.members.get(family_id, ()))
+            if family is not None:
+                pairs.update((individual_id, family_id) for individual_id in itertools.chain((family.husband_id, family.wife_id), family.children))
+
+        for individual_id, family_id in pairs:
+            individual = individual_dt.get(individual_id)
+            family = family_dt.get(family_id)
+            as_spouse: bool = (family is not None and individual_id in (family.husband_id, family.wife_id)) or (individual is not None and family_id in individual.fams)
+            as_child: bool = (family is not None and individual_id in family.children) or (individual is not None and family_id in individual.famc)
+
+            for links, key, value, linked in ((self.members, family_id, individual_id, as_spouse or as_child), (self.children, family_id, individual_id, as_child),
+                                              (self.families_of, individual_id, family_id, as_spouse or as_child), (self.spouse_families, individual_id, family_id, as_spouse)):
+                if linked:
+                    links[key].add(value)
+                elif key in links:
+                    links[key].discard(value)
+
+
 class GedcomFile:
     '''class GedcomFile'''
 
     _valid_tags: Dict[str, str] = {  'INDI' : '0', 'NAME' : '1', 'SEX' : '1', 'BIRT' : '1', 'DEAT' : '1', 'FAMC' : '1',
                                 'FAMS' : '1', 'FAM' : '0', 'MARR' : '1', 'HUSB' : '1', 'WIFE' : '1', 'CHIL' : '1', 
                                 'DIV' : '1', 'DATE' : '2', 'HEAD' : '0', 'TRLR' : '0', 'NOTE' : '0', } #key = tag : value = level
-    
-    _individual_dt: Dict[str, Individual] = dict()
-    _family_dt: Dict[str, Family] = dict()
-    _individuals_living_and_married: Dict[str, str] = dict()
-    _individuals_living_over_thirty_and_never_married: Dict[str, str] = dict()
-    _list_of_duplicate_individual_ids: List[Individual] = list()
-    _list_of_duplicate_family_ids: List[Family] = list()
 
-    def __init__(self) -> None:
-        '''Sets containers to store the input and output lines'''
+    _snapshot_version: int = 5 #change whenever the records saved by save_snapshot() change shape
+
+    # Tags whose arguments the records use. The memory-mapped reader never decodes the arguments of the other tags.
+    _decoded_tags: Set[str] = { 'NAME', 'SEX', 'DATE', 'FAMC', 'FAMS', 'HUSB', 'WIFE', 'CHIL' }
+    # key = level and tag of a valid line, e.g. b'1 NAME' : value = (level, tag, '') entry of the line. INDI and FAM follow the format exceptions instead.
+    _mapped_entries: Dict[bytes, Tuple[int, str, str]] = { f'{level} {tag}'.encode() : (int(level), tag, '') for tag, level in _valid_tags.items() if tag != 'INDI' and tag != 'FAM' }
+    _mapped_line: Pattern[bytes] = compile_gedcom_line_pattern(_valid_tags)
+    # Lines whose level could be 0, i.e. that start with a 0 after any blanks
+    _level_zero_line: Pattern[str] = re.compile(r'^[^\S\n]*0', re.MULTILINE)
+
+    # Every story main() can run, in the order it runs them: ID, category, method, findings generator and the data the story needs
+    _stories: List[Story] = [ Story('INDI', 'table', 'print_individuals_pretty', None, ()), # includes US27
+                              Story('FAM', 'table', 'print_family_pretty', None, ('spouse_names',)),
+                              #Sprint 1
+                              Story('US34', 'anomaly', 'US34_list_large_age_differences', 'US34_findings', ('spouse_names',), 'families'),
+                              Story('US35', 'anomaly', 'US35_list_recent_births', 'US35_findings', (), 'individuals'),
+                              Story('US04', 'error', 'US4_Marriage_before_divorce', 'US4_findings', ('spouse_names',), 'families'),
+                              Story('US21', 'error', 'US21_correct_gender_for_role', 'US21_findings', ('spouse_names',), 'families'),
+                              Story('US30', 'list', 'list_individuals_living_and_married', None, ('living_and_marital',)),
+                              Story('US31', 'list', 'list_individuals_living_over_thirty_never_married', None, ('living_and_marital',)),
+                              Story('US03', 'error', 'US03_birth_death', 'US03_findings', (), 'individuals'),
+                              Story('US06', 'error', 'US06_divorce_before_death', 'US06_findings', ('spouse_names',), 'families'),
+                              #Sprint 2
+                              Story('US02', 'error', 'US2_birth_before_marriage', 'US2_findings', (), 'families'),
+                              Story('US05', 'error', 'US5_marriage_before_death', 'US5_findings', (), 'families'),
+                              Story('US07', 'error', 'US07_Death150', 'US07_findings', (), 'individuals'),
+                              Story('US12', 'anomaly', 'US12_Mother_Father_older', 'US12_findings', (), 'families'),
+                              Story('US28', 'list', 'US28_print_siblings', None, ()),
+                              Story('US36', 'list', 'US36_list_recent_deaths', None, ()),
+                              Story('US37', 'list', 'US37_list_recent_survivors', None, ('relationships',)),
+                              #Sprint 3
+                              Story('US32', 'list', 'US32_list_multiple_births', None, ()),
+                              Story('US33', 'list', 'US33_list_orphans', None, ('relationships',)),
+                              Story('US19', 'anomaly', 'US19_married_first_cousins', 'US19_findings', ('spouse_names', 'relationships'), 'related families'),
+                              Story('US22', 'error', 'US22_uni_ids_indi_fam', 'US22_findings', ()),
+                              Story('US23', 'error', 'US23_uni_name_birth', 'US23_findings', ()),
+                              Story('US24', 'anomaly', 'US24_unique_families_by_spouses', 'US24_findings', ('spouse_names',)),
+                              Story('US25', 'anomaly', 'US25_unique_first_names_in_families', 'US25_findings', (), 'families'),
+                              Story('US16', 'error', 'US16_male', 'US16_findings', (), 'families'),
+                              #Sprint 4
+                              Story('US01', 'error', 'US01_dates_b4_current', 'US01_findings', ()),
+                              Story('US17', 'error', 'US17_no_marraige_2_children', 'US17_findings', ('spouse_names', 'relationships'), 'related families'),
+                              Story('US38', 'list', 'US38_print_upcoming_birthdays', None, ()),
+                              Story('US39', 'list', 'US39_print_upcoming_anniversaries', None, ('spouse_names',)),
+                              Story('US14', 'anomaly', 'US14_multiple_births', 'US14_findings', (), 'families'),
+                              Story('US15', 'anomaly', 'US15_siblings15', 'US15_findings', (), 'families'),
+                              Story('US26', 'error', 'US26_corresponding_entries_individuals', 'US26_individual_findings', ('spouse_names',), 'individuals'),
+                              Story('US26', 'error', 'US26_corresponding_entries_families', 'US26_family_findings', (), 'families'),
+                              Story('US29', 'list', 'US29_print_deceased_individuals', None, ()), ]
+
+    _story_categories: Tuple[str, ...] = ('error', 'anomaly', 'list', 'table')
+
+    # key = data a story depends on : value = method that builds it. Built in this order.
+    _dependency_builders: Dict[str, str] = { 'spouse_names' : 'family_set_spouse_names', 'relationships' : 'relationship_index',
+                                             'living_and_marital' : 'parse_individuals_based_on_living_and_marital_details', }
+
+    def __init__(self, profiler: Optional[Profiler] = None, table_options: Optional[Dict[str, Any]] = None, max_generations: Optional[int] = None,
+                 encoding: Optional[str] = None) -> None:
+        '''Sets containers to store the input and output lines, and the individual and family records of this GEDCOM file.
+            The records belong to the instance, so several GEDCOM files can be loaded in the same process without sharing state.
+            A profiler, if given, measures each stage and story that runs. Table options, if given, are the StreamingTable arguments the large listings are printed with.
+            Max generations, if given, makes US19 report every couple related within that many generations instead of first cousins only.
+            Encoding, if given, is the text encoding every reader decodes the files with, instead of the locale's
+        '''
 
         self._input: List[str] = list()
         self._output: List[str] = list()
         self._validated_list: List[str] = list()        
 
+        self._individual_dt: Dict[str, Individual] = dict()
+        self._family_dt: Dict[str, Family] = dict()
+        self._individuals_living_and_married: Dict[str, str] = dict()
+        self._individuals_living_over_thirty_and_never_married: Dict[str, str] = dict()
+        self._list_of_duplicate_individual_ids: List[Individual] = list()
+        self._list_of_duplicate_family_ids: List[Family] = list()
+        self._relationship_index: Optional[RelationshipIndex] = None
+        # State kept by revalidate_file() between runs
+        self._file_content: str = '' #the text of the file as it was validated
+        self._record_offsets: List[int] = list() #where each level 0 record starts in the text, the first one at 0 even if the text does not start with a record
+        self._record_keys: List[Optional[Tuple[str, str]]] = list() #(tag, ID) of each record at these offsets, None if it is not an INDI or FAM record
+        self._record_digests: List[bytes] = list() #digest of each record at these offsets when the text is not kept, e.g. after load_snapshot()
+        self._text_length: int = 0 #length of the text, kept with the digests
+        self._record_positions: Optional[Dict[str, Dict[str, int]]] = None #see record_positions()
+        self._record_links: Optional[RecordLinks] = None
+        self._findings_by_story: Dict[str, List[Finding]] = dict() #key = findings generator : value = its findings
+        self._findings_date: Optional[datetime.date] = None #the day the findings were computed on, as ages change with it
+        self._scope: Optional[Tuple[Dict[str, Individual], Dict[str, Family], Dict[str, Family]]] = None #records the scoped stories run on, None for all of them
+        self._profiler: Optional[Profiler] = profiler
+        self._table_options: Optional[Dict[str, Any]] = table_options #None prints the large listings with PrettyTable
+        self._max_generations: Optional[int] = max_generations #None for the first cousins check of US19
+        self._encoding: str = locale.getpreferredencoding(False) if encoding is None else encoding #what open() uses by default
+
     def read_file(self, file_name: str) -> None:
         '''Reads a GEDCOM file and populates the self._input list container with the lines from the GEDCOM file'''
 
-        file: IO = open(file_name)
+        file: IO = open(file_name, encoding = self._encoding)
 
         with file:
             for line in file:
@@ -192,20 +1250,28 @@ class GedcomFile:
             #skip blank lines
             if len(line) == 0:
                 continue
-            line: List[str] = line.split()
-            level: str = line[0]
-            tag: str = line[1]
-            arguments: str = f'{" ".join(line[2:])}'
+            level, tag, validity, arguments = self.validate_line(line.split())
+            self._output.append(f'<-- {level}|{tag}|{validity}|{arguments}')
 
-            if 'INDI' in line or 'FAM' in line:
-                self.validate_tags_for_exceptions(line, level, tag)
-            else:
-                if tag in GedcomFile._valid_tags and level == GedcomFile._valid_tags[tag]:
-                    self._output.append(f'<-- {level}|{tag}|Y|{arguments}')
-                else:
-                    self._output.append(f'<-- {level}|{tag}|N|{arguments}')
+    def validate_line(self, line: List[str]) -> Tuple[str, str, str, str]:
+        '''Determines whether the tag of a single split GEDCOM line is valid.
+            Returns a tuple containing the level, tag, validity ('Y' or 'N') and arguments of the line
+        '''
+
+        level: str = line[0]
+        tag: str = line[1] if len(line) > 1 else ''
+
+        if 'INDI' in line or 'FAM' in line:
+            return self.validate_tags_for_exceptions(line, level, tag)
+
+        arguments: str = f'{" ".join(line[2:])}'
+
+        if tag in GedcomFile._valid_tags and level == GedcomFile._valid_tags[tag]:
+            return level, tag, 'Y', arguments
+        else:
+            return level, tag, 'N', arguments
       
-    def validate_tags_for_exceptions(self, line: List[str], level: str, default_tag: str) -> None:
+    def validate_tags_for_exceptions(self, line: List[str], level: str, default_tag: str) -> Tuple[str, str, str, str]:
         '''Validates the tags for any line that meets the formatting exception identified in Project02 description.
             Format exceptions identified are: '0 <id> INDI' and '0 <id> FAM'
         '''
@@ -215,13 +1281,13 @@ class GedcomFile:
             arguments: str = f'{line[1]}'
 
             if tag in GedcomFile._valid_tags and level == GedcomFile._valid_tags[tag]:
-                self._output.append(f'<-- {level}|{tag}|Y|{arguments}')
+                return level, tag, 'Y', arguments
             else:
-                self._output.append(f'<-- {level}|{tag}|N|{arguments}')
+                return level, tag, 'N', arguments
 
         else:
             arguments: str = f'{line[-1]}'
-            self._output.append(f'<-- {level}|{default_tag}|N|{arguments}')
+            return level, default_tag, 'N', arguments
         
     def update_validated_list(self) -> None:
         '''Create a list of validated gedcom entries'''
@@ -240,14 +1306,253 @@ class GedcomFile:
             argument: str = valid_line[2]
             yield level, tag, argument
 
+    def stream_valid_entries(self, lines: Iterable[str]) -> Iterator[Tuple[int, str, str]]:
+        '''Generator that validates raw GEDCOM lines one at a time and yields the level, tag and argument of every valid line.
+            Applies the same rules as validate_tags_for_output() without keeping any copy of the file in memory
+        '''
+
+        for line in lines:
+            line: List[str] = line.split()
+
+            #skip blank lines
+            if len(line) == 0:
+                continue
+
+            level, tag, validity, argument = self.validate_line(line)
+            if validity == 'Y':
+                yield int(level), tag, argument
+
+    def stream_valid_tokens(self, buffer: mmap.mmap, start: int = 0, end: Optional[int] = None, chunk_size: int = 1 << 20) -> Iterator[Tuple[int, str, str]]:
+        '''Generator that validates the lines between the byte offsets start and end of a memory-mapped GEDCOM file and yields the level, tag and argument of every valid line.
+            Applies the same rules as validate_line(), but only decodes the arguments of the tags the records use. Other valid tags get an empty argument.
+            The lines are found by _mapped_line a chunk of about chunk_size bytes at a time, which skips most invalid lines without any Python code.
+            Unusual lines, e.g. lines with extra blanks or that mention INDI or FAM outside a record line, are decoded and handed to validate_line() as they are
+        '''
+
+        entries: Dict[bytes, Tuple[int, str, str]] = GedcomFile._mapped_entries
+        decoded_entries: Dict[bytes, Tuple[int, str, str]] = { level_and_tag : entry for level_and_tag, entry in entries.items() if entry[1] in GedcomFile._decoded_tags }
+        find_lines: Callable[..., Iterator[Match[bytes]]] = GedcomFile._mapped_line.finditer
+        end = len(buffer) if end is None else end
+
+        while start < end:
+            # Chunks end at the end of a line
+            stop: int = min(start + chunk_size, end)
+            if stop < end:
+                line_end: int = buffer.rfind(b'\n', start, stop)
+                if line_end == -1:
+                    line_end = buffer.find(b'\n', stop, end)
+                stop = end if line_end == -1 else line_end + 1
+
+            for match in find_lines(buffer, start, stop):
+                level_and_tag, value, record_id, record_tag, line = match.groups()
+                if level_and_tag is not None:
+                    if value is None:
+                        yield entries[level_and_tag]
+                        continue
+                    if b'INDI' not in value and b'FAM' not in value:
+                        entry: Optional[Tuple[int, str, str]] = decoded_entries.get(level_and_tag)
+                        yield entries[level_and_tag] if entry is None else (entry[0], entry[1], value.decode('ascii'))
+                        continue
+                    line = level_and_tag + b' ' + value
+                elif record_tag is not None:
+                    # '0 <id> INDI' or '0 <id> FAM'
+                    yield 0, record_tag.decode('ascii'), record_id.decode('ascii')
+                    continue
+
+                # Everything else is decoded and validated as text. A carriage return ends a line there too, as in the text reader.
+                if line:
+                    yield from self.stream_valid_entries(io.StringIO(line.decode(self._encoding), newline = None))
+
+            start = stop
+
+    def parse_file_streaming(self, file_name: str) -> None:
+        '''Reads a GEDCOM file line by line and builds the individual and family records in a single pass.
+            Skips the self._input, self._output and self._validated_list containers used by the step by step ingest
+        '''
+
+        file: IO = open(file_name, encoding = self._encoding)
+
+        with file:
+            self.parse_entries(self.stream_valid_entries(file))
+
+    def parse_file_mapped(self, file_name: str) -> None:
+        '''Builds the individual and family records from a memory-mapped GEDCOM file in a single pass.
+            Unlike parse_file_streaming(), only the arguments the records use are ever decoded
+        '''
+
+        if os.path.getsize(file_name) == 0:
+            self.parse_entries(())
+            return
+
+        if not is_ascii_compatible(self._encoding):
+            # The lines can not be found in the raw bytes
+            self.parse_file_streaming(file_name)
+            return
+
+        with open(file_name, 'rb') as file, mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ) as buffer:
+            if buffer.find(b'\n') == -1 and buffer.find(b'\r') != -1:
+                # Lines end with a bare carriage return. Let the text mode reader split them.
+                self.parse_file_streaming(file_name)
+            else:
+                self.parse_entries(self.stream_valid_tokens(buffer))
+
+    def save_snapshot(self, snapshot_file: str, file_name: str) -> None:
+        '''Saves the parsed records of file_name to snapshot_file, keyed by the size, modification time and SHA-256 digest of file_name'''
+
+        status: os.stat_result = os.stat(file_name)
+        snapshot: Dict[str, Any] = { 'version' : GedcomFile._snapshot_version,
+                                     'size' : status.st_size,
+                                     'mtime' : status.st_mtime_ns,
+                                     'digest' : file_digest(file_name),
+                                     # Records are saved as tuples of their slots, so the snapshot does not depend on the module name the classes were loaded under
+                                     'individuals' : [record_state(individual) for individual in self._individual_dt.values()],
+                                     'families' : [record_state(family) for family in self._family_dt.values()],
+                                     'duplicate individuals' : [record_state(individual) for individual in self._list_of_duplicate_individual_ids],
+                                     'duplicate families' : [record_state(family) for family in self._list_of_duplicate_family_ids],
+                                     # What revalidate_file() needs to patch the findings after the next change
+                                     'record offsets' : self._record_offsets,
+                                     'record keys' : self._record_keys,
+                                     'record digests' : self.record_digests(),
+                                     'text length' : self._text_length,
+                                     'findings' : { story : [tuple(finding) for finding in findings] for story, findings in self._findings_by_story.items() },
+                                     'findings date' : self._findings_date,
+                                     'max generations' : self._max_generations, }
+
+        # Write a temporary file first, so a run that is interrupted never leaves half a snapshot behind
+        temporary_file: str = f'{snapshot_file}.{os.getpid()}.tmp'
+        with open(temporary_file, 'wb') as file:
+            pickle.dump(snapshot, file, protocol = pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_file, snapshot_file)
+
+    def load_snapshot(self, snapshot_file: str, file_name: Optional[str] = None) -> bool:
+        '''Loads the records saved by save_snapshot() if they still match file_name: same size, and same modification time or same content.
+            Without a file name, the snapshot is loaded whatever the file looks like now, e.g. for revalidate_file() to compare it with.
+            Returns False, without changing anything, if there is no usable snapshot. Snapshots are pickles, so only load the ones this program wrote
+        '''
+
+        try:
+            with open(snapshot_file, 'rb') as file:
+                snapshot: Dict[str, Any] = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return False
+
+        if snapshot.get('version') != GedcomFile._snapshot_version:
+            return False
+
+        if file_name is not None:
+            status: os.stat_result = os.stat(file_name)
+
+            if snapshot['size'] != status.st_size:
+                return False
+
+            if snapshot['mtime'] != status.st_mtime_ns and snapshot['digest'] != file_digest(file_name):
+                return False
+
+        self._individual_dt = { individual.id : individual for individual in (restore_record(Individual, state) for state in snapshot['individuals']) }
+        self._family_dt = { family.id : family for family in (restore_record(Family, state) for state in snapshot['families']) }
+        self._list_of_duplicate_individual_ids = [restore_record(Individual, state) for state in snapshot['duplicate individuals']]
+        self._list_of_duplicate_family_ids = [restore_record(Family, state) for state in snapshot['duplicate families']]
+        self.forget_derived_data()
+        self._record_offsets = snapshot['record offsets']
+        self._record_keys = snapshot['record keys']
+        self._record_digests = snapshot['record digests']
+        self._text_length = snapshot['text length']
+        self._findings_by_story = { story : [Finding(*state) for state in findings] for story, findings in snapshot['findings'].items() }
+        self._findings_date = snapshot['findings date']
+
+        if snapshot['max generations'] != self._max_generations:
+            # The US19 findings were looked for at another distance, so revalidate_file() starts again from a full validation
+            self._findings_by_story = dict()
+
+        # Ages of living individuals depend on today's date, not only on the file
+        for individual in self._individual_dt.values():
+            individual.setAge()
+
+        return True
+
     def parse_validated_gedcom(self) -> None:
         '''Parses the gedcom entries for individuals and families'''
+
+        self.parse_entries(self.parse_valid_entry())
+
+    def parse_file_sharded(self, file_name: str, workers: int) -> None:
+        '''Builds the individual and family records of a large GEDCOM file on a pool of worker processes.
+            The memory-mapped file is split at level 0 INDI/FAM lines, each worker parses some of the ranges, and the records are added back in file order,
+            so the result (duplicate IDs included) is the same as parse_file_streaming()
+        '''
+
+        if workers <= 1 or os.path.getsize(file_name) == 0 or not is_ascii_compatible(self._encoding):
+            self.parse_file_streaming(file_name)
+            return
+
+        with open(file_name, 'rb') as file, mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ) as buffer:
+            # A few ranges per worker keeps the workers busy when the records are not spread evenly
+            boundaries: List[int] = find_record_boundaries(buffer, workers * 4)
+
+        if len(boundaries) <= 2:
+            self.parse_file_streaming(file_name)
+            return
+
+        self.forget_derived_data()
+
+        context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+
+        with ProcessPoolExecutor(max_workers = workers, mp_context = context) as executor:
+            shards = executor.map(_parse_shard, [file_name] * (len(boundaries) - 1), boundaries[:-1], boundaries[1:], [self._encoding] * (len(boundaries) - 1))
+
+            for individuals, families in shards:
+                for record in individuals:
+                    self.add_record(record)
+                for record in families:
+                    self.add_record(record)
+
+    def parse_entries(self, entries: Iterable[Tuple[int, str, str]]) -> None:
+        '''Builds the individual and family records from (level, tag, argument) entries that have already been validated'''
+
+        self.forget_derived_data()
+
+        for record in self.iter_records(entries):
+            self.add_record(record)
+
+    def forget_derived_data(self) -> None:
+        '''Drops the relationship index, record offsets and links and findings computed so far, after the records changed'''
+
+        self._relationship_index = None
+        self._file_content = ''
+        self._record_offsets = list()
+        self._record_keys = list()
+        self._record_digests = list()
+        self._text_length = 0
+        self._record_positions = None
+        self._record_links = None
+        self._findings_by_story = dict()
+        self._findings_date = None
+
+    def add_record(self, record: Any) -> None:
+        '''Stores an individual or family record. A record whose ID is already taken is kept in the duplicate list for US22'''
+
+        if type(record) == Individual:
+            records, duplicates = self._individual_dt, self._list_of_duplicate_individual_ids
+        else:
+            records, duplicates = self._family_dt, self._list_of_duplicate_family_ids
+
+        record_id: str = sys.intern(record.id)
+
+        if record_id in records:
+            duplicates.append(record)
+        else:
+            records[record_id] = record
+
+    def iter_records(self, entries: Iterable[Tuple[int, str, str]]) -> Iterator[Any]:
+        '''Generator that yields each individual or family record as soon as its level 0 line is read.
+            The rest of the record is filled in as the iteration continues
+        '''
         
         # Default our flags to neither an individual or family
         individual_record = False
         family_record = False
         
-        for _, tag, argument in self.parse_valid_entry():
+        for _, tag, argument in entries:
             if tag == "INDI":
                 # Subsequent records will define an individual
                 individual_record = True
@@ -255,12 +1560,9 @@ class GedcomFile:
                 
                 # Since this is the start - Create the Individual!
                 individual: Individual = Individual()
-                individual_id: str = argument
-
-                if individual_id in self._individual_dt:
-                    self._list_of_duplicate_individual_ids.append(individual)
-                else:
-                    self._individual_dt[individual_id] = individual
+                individual.details(tag, argument)
+                yield individual
+                continue
                 
             elif tag == "FAM":
                 # Subsequent records will define a family
@@ -269,12 +1571,9 @@ class GedcomFile:
                 
                 # Since this is the start - Create the Family!
                 family: Family = Family()
-                family_id: str = argument
-
-                if family_id in self._family_dt:
-                    self._list_of_duplicate_family_ids.append(family)
-                else:
-                    self._family_dt[family_id] = family
+                family.details(tag, argument)
+                yield family
+                continue
                 
             elif tag == "TRLR" or tag == "HEAD" or tag == "NOTE":
                  # this is neither a family or an individual.
@@ -287,148 +1586,732 @@ class GedcomFile:
             elif family_record:
                 family.details(tag,argument)
 
+    def check_findings(self, stories: Optional[Iterable[Story]] = None, limit: Optional[int] = None) -> List[Finding]:
+        '''Check mode: runs the error stories (all of them by default) in story order, and stops as soon as limit findings are found. Call prepare_stories() first'''
+
+        error_stories: List[Story] = [story for story in (GedcomFile._stories if stories is None else stories) if story.category == 'error' and story.findings]
+
+        with self.profile_stage('check') as counts:
+            # The findings generators are lazy, so the stories after the limit is reached never run
+            findings: List[Finding] = list(itertools.islice((finding for story in error_stories for finding in getattr(self, story.findings)()), limit))
+            counts['findings'] = len(findings)
+
+        return findings
+
+    def export_records(self, writer: RecordWriter, stories: Iterable[Story], workers: int = 1, use_threads: bool = False) -> Dict[str, int]:
+        '''Writes the individuals and families, if the People (INDI) and Families (FAM) stories are among the stories, and the findings of the error and anomaly stories.
+            Call prepare_stories() first. Returns the number of rows written per table
+        '''
+
+        stories = list(stories)
+        story_ids: Set[str] = {story.id for story in stories}
+        counts: Dict[str, int] = dict()
+
+        if 'INDI' in story_ids:
+            counts['individuals'] = writer.write_table('individuals', (self._individual_dt[individual_id].as_dict() for individual_id in sorted(self._individual_dt)))
+        if 'FAM' in story_ids:
+            counts['families'] = writer.write_table('families', (family.as_dict() for family in self._family_dt.values()))
+
+        counts['findings'] = writer.write_table('findings', (finding.as_dict() for finding in self.collect_findings(workers, use_threads, stories)))
+        return counts
+
+    @contextlib.contextmanager
+    def print_table(self, field_names: List[str]) -> Iterator[Any]:
+        '''Context manager for the large listings. Yields a table to add rows to: a PrettyTable printed at the end,
+            or a StreamingTable printing the rows as they are added if the instance has table options
+        '''
+
+        if self._table_options is None:
+            table: PrettyTable = PrettyTable(field_names = field_names)
+            yield table
+            print(table)
+        else:
+            with StreamingTable(field_names, **self._table_options) as table:
+                yield table
+
     def print_individuals_pretty(self) -> PrettyTable:
         '''Prints a prettytable containing details for individuals'''
 
-        individuals_pretty_table: PrettyTable = PrettyTable(field_names= Individual._headers_for_prettytable)
-        
-        for individual in self._individual_dt.values():
-            individuals_pretty_table.add_row(individual.return_pretty_table_row())
-        
-        individuals_pretty_table.sortby = 'ID'
         print("People")
-        print(individuals_pretty_table)
+
+        # Sorting the IDs, rather than the rows, lists the individuals by ID as they are printed
+        with self.print_table(Individual._headers_for_prettytable) as individuals_pretty_table:
+            for individual_id in sorted(self._individual_dt):
+                individuals_pretty_table.add_row(self._individual_dt[individual_id].return_pretty_table_row())
+
+        print("\n")
+
+    def print_family_pretty(self) -> PrettyTable:
+        '''Prints a prettytable containing details for individuals'''
+
+        print("Families")
+
+        with self.print_table(Family._pretty_table_headers) as family_pretty_table:
+            for family in self._family_dt.values():
+                family_pretty_table.add_row(family.return_pretty_table_row())
+
         print("\n")
 
-    def print_family_pretty(self) -> PrettyTable:
-        '''Prints a prettytable containing details for individuals'''
+    def build_relationship_index(self) -> RelationshipIndex:
+        '''Builds the relationship index for the records parsed so far'''
+
+        self._relationship_index = RelationshipIndex(self._individual_dt, self._family_dt)
+        return self._relationship_index
+
+    def relationship_index(self) -> RelationshipIndex:
+        '''Returns the relationship index, building it the first time it is needed'''
+
+        if self._relationship_index is None:
+            self.build_relationship_index()
+        return self._relationship_index
+
+    def family_set_spouse_names(self, family_ids: Optional[Iterable[str]] = None):
+        '''Sets the names of the husband and wife of every family, or only of family_ids'''
+
+        for entry in (self._family_dt if family_ids is None else (family_id for family_id in family_ids if family_id in self._family_dt)):
+            
+            husband_id = self._family_dt[entry].husband_id
+            try:
+                husband_name = self._individual_dt[husband_id].name
+            except KeyError:
+                husband_name = "Unknown"      
+            self._family_dt[entry].husband_name = husband_name   
+
+            wife_id = self._family_dt[entry].wife_id
+            try:
+                wife_name = self._individual_dt[wife_id].name                    
+            except KeyError:
+                wife_name = "Unknown"  
+            self._family_dt[entry].wife_name = wife_name        
+            
+    def report_findings(self, findings: Iterable[Finding]) -> List[str]:
+        '''Renders and prints each finding. Returns the rendered messages'''
+
+        output: List[str] = list()
+
+        for finding in findings:
+            message: str = finding.render()
+            print(message)
+            output.append(message)
+
+        return output
+
+    @classmethod
+    def select_stories(cls, story_ids: Optional[Iterable[str]] = None, categories: Optional[Iterable[str]] = None) -> List[Story]:
+        '''Returns the registered stories with one of the IDs (e.g. US3, us03) or in one of the categories, in registry order. Returns every story if neither is given'''
+
+        if story_ids is None and categories is None:
+            return list(cls._stories)
+
+        wanted_ids: Set[str] = {cls.normalize_story_id(story_id) for story_id in story_ids or ()}
+
+        unknown_ids: Set[str] = wanted_ids.difference(story.id for story in cls._stories)
+        if unknown_ids:
+            raise ValueError(f'Unknown stories: {", ".join(sorted(unknown_ids))}')
+
+        wanted_categories: Set[str] = set(categories or ())
+        unknown_categories: Set[str] = wanted_categories.difference(cls._story_categories)
+        if unknown_categories:
+            raise ValueError(f'Unknown categories: {", ".join(sorted(unknown_categories))}')
+
+        return [story for story in cls._stories if story.id in wanted_ids or story.category in wanted_categories]
+
+    @staticmethod
+    def normalize_story_id(story_id: str) -> str:
+        '''Returns the story ID as registered, e.g. US03 for US3 or us03'''
+
+        story_id = story_id.upper()
+        if story_id.startswith('US') and story_id[2:].isdigit():
+            story_id = f'US{int(story_id[2:]):02d}'
+        return story_id
+
+    @classmethod
+    def profiled_methods(cls, names: Iterable[str]) -> List[str]:
+        '''Returns the methods to profile for each name: the methods of the story with this ID (e.g. US23), or the GedcomFile method with this name'''
+
+        stories: Dict[str, Story] = {story.id: story for story in cls._stories}
+        methods: List[str] = list()
+
+        for name in names:
+            story: Optional[Story] = stories.get(cls.normalize_story_id(name))
+            if story is not None:
+                methods.extend(method for method in (story.method, story.findings) if method)
+            elif not name.startswith('_') and callable(getattr(cls, name, None)):
+                methods.append(name)
+            else:
+                raise ValueError(f'Unknown story or method: {name}')
+
+        # Wrapping a method twice would profile it twice
+        return list(dict.fromkeys(methods))
+
+    def prepare_stories(self, stories: Iterable[Story]) -> None:
+        '''Builds the data the stories depend on, and nothing else'''
+
+        needed: Set[str] = {dependency for story in stories for dependency in story.dependencies}
+
+        for dependency, builder in GedcomFile._dependency_builders.items():
+            if dependency in needed:
+                with self.profile_stage(f'prepare {dependency}'):
+                    getattr(self, builder)()
+
+    def run_stories(self, stories: Iterable[Story]) -> None:
+        '''Runs the stories in order, printing their tables, lists and messages. Call prepare_stories() first'''
+
+        for story in stories:
+            with self.profile_stage(f'{story.id} {story.method}') as counts:
+                result: Any = getattr(self, story.method)()
+
+                # Stories return their findings or the rows they listed, if anything. The large listings yield their rows as they print them
+                if inspect.isgenerator(result):
+                    counts['items'] = sum(1 for row in result)
+                elif type(result) in (list, dict, set):
+                    counts['items'] = len(result)
+
+    def profile_stage(self, name: str) -> ContextManager[Dict[str, int]]:
+        '''Returns a context manager that measures a stage with the profiler, or does nothing if there is no profiler'''
+
+        if self._profiler is None:
+            return contextlib.nullcontext(dict())
+        return self._profiler.stage(name)
+
+    def collect_findings(self, workers: int = 1, use_threads: bool = False, stories: Optional[Iterable[Story]] = None) -> List[Finding]:
+        '''Quiet mode: runs the error and anomaly stories (all of them by default) without formatting or printing anything, and returns their findings.
+            With more than one worker the stories run concurrently on a process pool (or a thread pool), and their findings are merged back in story order.
+        '''
+
+        finding_stories: List[str] = [story.findings for story in (GedcomFile._stories if stories is None else stories) if story.findings]
+
+        if workers <= 1:
+            findings: List[Finding] = list()
+
+            for story in finding_stories:
+                with self.profile_stage(story) as counts:
+                    count: int = len(findings)
+                    findings.extend(getattr(self, story)())
+                    counts['findings'] = len(findings) - count
+
+            return findings
+
+        # The stories run at the same time, so they are only measured together
+        with self.profile_stage(f'findings on {workers} workers') as counts:
+            if use_threads:
+                with ThreadPoolExecutor(max_workers = workers) as executor:
+                    results: Iterator[List[Finding]] = executor.map(lambda story: list(getattr(self, story)()), finding_stories)
+                    findings = [finding for story_findings in results for finding in story_findings]
+            else:
+                # Forked workers inherit the parsed records. Where fork is not available, the records are pickled once per worker instead.
+                context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+
+                with ProcessPoolExecutor(max_workers = workers, mp_context = context, initializer = _set_worker_gedcom, initargs = (self,)) as executor:
+                    results = executor.map(_run_worker_story, finding_stories)
+                    findings = [finding for story_findings in results for finding in story_findings]
+
+            counts['findings'] = len(findings)
+
+        return findings
+
+    def individuals_in_scope(self) -> Dict[str, Individual]:
+        '''Returns the individuals the individual scoped stories run on: all of them, unless revalidate_file() narrowed them down'''
+
+        return self._individual_dt if self._scope is None else self._scope[0]
+
+    def families_in_scope(self) -> Dict[str, Family]:
+        '''Returns the families the family scoped stories run on: all of them, unless revalidate_file() narrowed them down'''
+
+        return self._family_dt if self._scope is None else self._scope[1]
+
+    def related_families_in_scope(self) -> Dict[str, Family]:
+        '''Returns the families the stories that look at parents and grandparents run on: all of them, unless revalidate_file() narrowed them down'''
+
+        return self._family_dt if self._scope is None else self._scope[2]
+
+    def find_records(self, text: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, Optional[Tuple[str, str]]]]:
+        '''Generator that splits text[start:end] into its level 0 records, the same way iter_records() does. start must be the start of a line.
+            Yields where each record starts and its (tag, ID), or None for HEAD, TRLR and NOTE records, which never reach the individual and family records.
+            The first record starts at start, with None if no record starts there
+        '''
+
+        record_tags: Set[str] = { 'INDI', 'FAM', 'HEAD', 'TRLR', 'NOTE' }
+        end = len(text) if end is None else end
+        record_start: int = start
+        key: Optional[Tuple[str, str]] = None
+
+        for match in GedcomFile._level_zero_line.finditer(text, start, end):
+            line_end: int = text.find('\n', match.start(), end)
+            fields: List[str] = text[match.start():end if line_end == -1 else line_end].split()
+
+            # Only a valid level 0 INDI, FAM, HEAD, TRLR or NOTE line starts a new record
+            level, line_tag, validity, argument = self.validate_line(fields)
+            if validity == 'Y' and line_tag in record_tags:
+                if match.start() > record_start:
+                    yield record_start, key
+
+                record_start, key = match.start(), ((line_tag, argument) if line_tag == 'INDI' or line_tag == 'FAM' else None)
+
+        yield record_start, key
+
+    def record_digests(self) -> List[bytes]:
+        '''Returns the digest of each record at the record offsets, see text_digest()'''
+
+        if self._record_digests or not self._file_content:
+            return self._record_digests
+
+        ends: List[int] = self._record_offsets[1:] + [len(self._file_content)]
+        return [text_digest(self._file_content[offset:end]) for offset, end in zip(self._record_offsets, ends)]
+
+    def resplit_records(self, previous_text: str, text: str) -> Tuple[List[int], List[Optional[Tuple[str, str]]], Dict[Tuple[str, str], bytes], List[Tuple[Tuple[str, str], str]], bool]:
+        '''Splits text into records again, after the text validated last, previous_text, changed into it. The records are walked along both texts:
+            records that are the same, one after the other, are only moved, and the text between them is split again with find_records().
+            Returns the offsets and keys of every record, the INDI and FAM records that were split again as they were before (key and digest of the text),
+            the INDI and FAM records that replace them (key and text, in file order), and whether a record moved past records that were not split again
+        '''
+
+        offsets: List[int] = self._record_offsets
+        keys: List[Optional[Tuple[str, str]]] = self._record_keys
+        current_offsets: List[int] = list()
+        current_keys: List[Optional[Tuple[str, str]]] = list()
+        previous_records: Dict[Tuple[str, str], bytes] = dict()
+        current_records: List[Tuple[Tuple[str, str], str]] = list()
+        # key = (tag, ID) of a record split again : value = where the changed part of the text it was in before, and is in now, starts among the previous records
+        previous_areas: Dict[Tuple[str, str], int] = dict()
+        current_areas: Dict[Tuple[str, str], int] = dict()
+        index: int = 0
+        position: int = 0
+
+        while index < len(offsets):
+            start: int = offsets[index]
+            length: int = matching_length(previous_text, start, text, position)
+
+            if start + length == len(previous_text) and position + length == len(text):
+                current_offsets.extend(offset + position - start for offset in offsets[index:])
+                current_keys.extend(keys[index:])
+                break
+
+            # A record is the same if the record after it is the same too: its first line is unchanged, so it still starts a record there
+            same: int = max(bisect.bisect_right(offsets, start + length) - 2, index)
+            current_offsets.extend(offset + position - start for offset in offsets[index:same])
+            current_keys.extend(keys[index:same])
+            changed_start: int = offsets[same] + position - start
+
+            # The first of the next few records (some may be gone) found unchanged, at the start of a line, is where the texts are the same again
+            following: int = len(offsets)
+            changed_end: int = len(text)
+
+            for candidate in range(same + 1, min(same + 9, len(offsets))):
+                found: int = text.find(previous_text[offsets[candidate]:offsets[candidate + 1] if candidate + 1 < len(offsets) else len(previous_text)], changed_start)
+
+                if found != -1 and (found == 0 or text[found - 1] == '\n'):
+                    following, changed_end = candidate, found
+                    break
+
+            for replaced in range(same, following):
+                if keys[replaced] is not None:
+                    previous_records[keys[replaced]] = text_digest(previous_text[offsets[replaced]:offsets[replaced + 1] if replaced + 1 < len(offsets) else len(previous_text)])
+                    previous_areas[keys[replaced]] = same
+
+            if changed_end > changed_start:
+                records: List[Tuple[int, Optional[Tuple[str, str]]]] = list(self.find_records(text, changed_start, changed_end))
+                for record, (offset, key) in enumerate(records):
+                    current_offsets.append(offset)
+                    current_keys.append(key)
+                    if key is not None:
+                        current_records.append((key, text[offset:records[record + 1][0] if record + 1 < len(records) else changed_end]))
+                        current_areas[key] = same
+
+            index, position = following, changed_end
+
+        moved: bool = any(previous_areas.get(key, area) != area for key, area in current_areas.items())
+        return current_offsets, current_keys, previous_records, current_records, moved
+
+    def split_records_by_digest(self, text: str) -> Tuple[List[int], List[Optional[Tuple[str, str]]], Dict[Tuple[str, str], bytes], List[Tuple[Tuple[str, str], str]], bool]:
+        '''Like resplit_records(), when only the digests of the records validated last are known. The records at the start and at the end of text
+            whose digests are the same are only moved, and the text between them is split again
+        '''
+
+        offsets: List[int] = self._record_offsets
+        keys: List[Optional[Tuple[str, str]]] = self._record_keys
+        digests: List[bytes] = self._record_digests
+        ends: List[int] = offsets[1:] + [self._text_length]
+        shift: int = len(text) - self._text_length
+
+        # A record is the same if the record after it is the same too: its first line is unchanged, so it still starts a record there
+        first: int = 0
+        while first < len(offsets) and text_digest(text[offsets[first]:ends[first]]) == digests[first]:
+            first += 1
+        if first < len(offsets) or shift:
+            first = max(first - 1, 0)
+
+        # From the end, a record is the same if it starts a line
+        last: int = len(offsets)
+        while (last > first and offsets[last - 1] + shift > offsets[first] and text[offsets[last - 1] + shift - 1] == '\n'
+               and text_digest(text[offsets[last - 1] + shift:ends[last - 1] + shift]) == digests[last - 1]):
+            last -= 1
+
+        changed_start: int = offsets[first] if first < len(offsets) else len(text)
+        changed_end: int = offsets[last] + shift if last < len(offsets) else len(text)
+        records: List[Tuple[int, Optional[Tuple[str, str]]]] = list(self.find_records(text, changed_start, changed_end)) if changed_end > changed_start else list()
+        records_ends: List[int] = [offset for offset, key in records[1:]] + [changed_end]
+
+        previous_records: Dict[Tuple[str, str], bytes] = {keys[index] : digests[index] for index in range(first, last) if keys[index] is not None}
+        current_records: List[Tuple[Tuple[str, str], str]] = [(key, text[offset:end]) for (offset, key), end in zip(records, records_ends) if key is not None]
+        current_offsets: List[int] = offsets[:first] + [offset for offset, key in records] + [offset + shift for offset in offsets[last:]]
+        current_keys: List[Optional[Tuple[str, str]]] = keys[:first] + [key for offset, key in records] + keys[last:]
+
+        return current_offsets, current_keys, previous_records, current_records, False
+
+    def record_links(self) -> RecordLinks:
+        '''Returns the links between the individuals and families, linking them the first time they are needed'''
+
+        if self._record_links is None:
+            self._record_links = RecordLinks(self._individual_dt, self._family_dt)
+        return self._record_links
+
+    def record_positions(self) -> Dict[str, Dict[str, int]]:
+        '''Returns the position of each individual and family in the file, by 'individuals' and 'families', counting them the first time they are needed'''
+
+        if self._record_positions is None:
+            self._record_positions = { 'individuals' : { record_id : position for position, record_id in enumerate(self._individual_dt) },
+                                       'families' : { record_id : position for position, record_id in enumerate(self._family_dt) }, }
+        return self._record_positions
+
+    def affected_scope(self, individual_ids: Iterable[str], family_ids: Iterable[str]) -> Tuple[Set[str], Set[str], Set[str]]:
+        '''Returns the IDs of the records whose findings may change when the given individuals and families change:
+            the individuals (the changed ones, and the members of the families below), the families (the changed ones, and the ones the changed individuals belong to)
+            and the related families (those families, and the families of their children and grandchildren, or of as many generations down as US19 looks up).
+            Follows the links of the records as they are now, from both sides, see RecordLinks
+        '''
+
+        links: RecordLinks = self.record_links()
+        individuals: Set[str] = set(individual_ids)
+        families: Set[str] = set(family_ids)
+
+        for individual_id in individuals:
+            families.update(links.families_of.get(individual_id, ()))
+
+        for family_id in families:
+            individuals.update(links.members.get(family_id, ()))
+
+        # US17 looks at the spouses' parents and US19 at their grandparents, or as many generations up as it is asked to
+        related_families: Set[str] = set(families)
+        generation: Set[str] = families
+
+        for _ in range(max(2, self._max_generations or 0)):
+            generation = {spouse_family_id for family_id in generation for child_id in links.children.get(family_id, ())
+                          for spouse_family_id in links.spouse_families.get(child_id, ())}.difference(related_families)
+            related_families.update(generation)
+
+        return individuals, families, related_families
+
+    def revalidate_file(self, file_name: str, stories: Optional[Iterable[Story]] = None) -> List[Finding]:
+        '''Validates a GEDCOM file that was validated before (e.g. loaded from a snapshot) and returns the findings of the error and anomaly stories, like collect_findings().
+            The text is compared with the text validated last, and only the records around the parts that changed are split and parsed again.
+            The records, their links and the relationship index are patched for the records that changed, and the stories that work per record only run on the records the change can affect.
+            Their previous findings for the other records are kept. Stories that compare the whole file run in full.
+            Falls back to a full validation the first time, on another day (ages change), or if the file has duplicate IDs
+        '''
+
+        finding_stories: List[Story] = [story for story in (GedcomFile._stories if stories is None else stories) if story.findings]
+        today: datetime.date = datetime.date.today()
+
+        file: IO = open(file_name, encoding = self._encoding)
+
+        with file:
+            text: str = file.read()
+
+        previous_text: str = self._file_content
+        offsets: List[int] = self._record_offsets
+        keys: List[Optional[Tuple[str, str]]] = self._record_keys
+        full: bool = (not offsets or self._list_of_duplicate_individual_ids or self._list_of_duplicate_family_ids
+                      or self._findings_date != today or any(story.findings not in self._findings_by_story for story in finding_stories))
+        # A snapshot keeps the digests of the records rather than the text
+        unchanged: bool = text == previous_text and not self._record_digests
+
+        if not full and not unchanged:
+            offsets, keys, previous_records, split_records, moved = (self.split_records_by_digest(text) if self._record_digests
+                                                                     else self.resplit_records(previous_text, text))
+            current_records: Dict[Tuple[str, str], str] = dict(split_records)
+
+            # An ID that is taken already, elsewhere in the file or twice among the records split again, is a duplicate for US22
+            full = (len(current_records) < len(split_records)
+                    or any(key not in previous_records and key[1] in (self._individual_dt if key[0] == 'INDI' else self._family_dt) for key in current_records))
+
+        if full:
+            self._individual_dt = dict()
+            self._family_dt = dict()
+            self._list_of_duplicate_individual_ids = list()
+            self._list_of_duplicate_family_ids = list()
+
+            records = list(self.find_records(text))
+            ends: List[int] = [offset for offset, key in records[1:]] + [len(text)]
+            self.parse_entries(self.stream_valid_entries(line for (offset, key), record_end in zip(records, ends) if key is not None
+                                                         for line in text[offset:record_end].split('\n')))
+            self.prepare_stories(finding_stories)
+
+            self._findings_by_story = { story.findings : list(getattr(self, story.findings)()) for story in finding_stories }
+            self._record_offsets = [offset for offset, key in records]
+            self._record_keys = [key for offset, key in records]
+
+        elif not unchanged:
+            changed: List[Tuple[str, str]] = [key for key, record in current_records.items() if previous_records.get(key) != text_digest(record)]
+            removed: List[Tuple[str, str]] = [key for key in previous_records if key not in current_records]
+
+            # New records are added at the end of the dictionaries. If that is not where they are in the file, or records moved, the dictionaries are put back in file order
+            reordered: bool = moved
+
+            for tag, records_dt in (('INDI', self._individual_dt), ('FAM', self._family_dt)):
+                kept_ids: List[str] = [record_id for record_tag, record_id in previous_records if record_tag == tag and (tag, record_id) in current_records]
+                current_ids: List[str] = [record_id for record_tag, record_id in current_records if record_tag == tag]
+                last_id: Optional[str] = next(reversed(records_dt), None)
+
+                if current_ids[:len(kept_ids)] != kept_ids or (len(current_ids) > len(kept_ids) and last_id is not None and (tag, last_id) not in previous_records):
+                    reordered = True
+
+            if reordered:
+                # The records that moved changed position, which the order of findings and relationships depends on
+                changed = list(current_records)
+
+            changed_individuals: Set[str] = {record_id for tag, record_id in changed + removed if tag == 'INDI'}
+            changed_families: Set[str] = {record_id for tag, record_id in changed + removed if tag == 'FAM'}
+
+            # Follow the links before the change too, e.g. to the old families of a child who moved
+            individuals, families, related_families = self.affected_scope(changed_individuals, changed_families)
+
+            for tag, record_id in removed:
+                del (self._individual_dt if tag == 'INDI' else self._family_dt)[record_id]
+
+            for key in changed:
+                for record in self.iter_records(self.stream_valid_entries(current_records[key].split('\n'))):
+                    (self._individual_dt if type(record) == Individual else self._family_dt)[record.id] = record
+
+            self._record_offsets = offsets
+            self._record_keys = keys
+
+            if reordered:
+                self._individual_dt = { record_id : self._individual_dt[record_id] for tag, record_id in filter(None, self._record_keys) if tag == 'INDI' }
+                self._family_dt = { record_id : self._family_dt[record_id] for tag, record_id in filter(None, self._record_keys) if tag == 'FAM' }
+                self._record_positions = None
+            elif self._record_positions is not None:
+                for tag, record_id in changed + removed:
+                    positions: Dict[str, int] = self._record_positions['individuals' if tag == 'INDI' else 'families']
+
+                    if record_id not in (self._individual_dt if tag == 'INDI' else self._family_dt):
+                        del positions[record_id]
+                    elif record_id not in positions:
+                        positions[record_id] = next(reversed(positions.values()), -1) + 1
+
+            # Patch the links, then follow them after the change
+            self._record_links.update(self._individual_dt, self._family_dt, changed_individuals, changed_families)
+            scope: Tuple[Set[str], Set[str], Set[str]] = self.affected_scope(changed_individuals, changed_families)
+            individuals.update(scope[0])
+            families.update(scope[1])
+            related_families.update(scope[2])
+
+            # Patch what the stories depend on for the records in scope, rather than build it again
+            if self._relationship_index is not None:
+                self._relationship_index.update(self._individual_dt, self._family_dt, individuals, changed_families, reordered)
+            self.family_set_spouse_names(families)
+
+            positions_of: Dict[str, Dict[str, int]] = dict(self.record_positions())
+            positions_of['related families'] = positions_of['families']
+            scope_ids: Dict[str, Set[str]] = { 'individuals' : individuals, 'families' : families, 'related families' : related_families }
+            self._scope = ({ record_id : self._individual_dt[record_id] for record_id in individuals if record_id in self._individual_dt },
+                           { record_id : self._family_dt[record_id] for record_id in families if record_id in self._family_dt },
+                           { record_id : self._family_dt[record_id] for record_id in related_families if record_id in self._family_dt })
+
+            try:
+                findings_by_story: Dict[str, List[Finding]] = dict()
+
+                for story in finding_stories:
+                    if story.scope == 'file':
+                        findings_by_story[story.findings] = list(getattr(self, story.findings)())
+                        continue
+
+                    # Keep the findings of the records outside the scope, and put the new ones in file order among them
+                    position: Dict[str, int] = positions_of[story.scope]
+                    findings: List[Finding] = [finding for finding in self._findings_by_story[story.findings]
+                                               if finding.record_ids[0] not in scope_ids[story.scope] and finding.record_ids[0] in position]
+                    findings.extend(getattr(self, story.findings)())
+                    findings.sort(key = lambda finding: position[finding.record_ids[0]])
+                    findings_by_story[story.findings] = findings
+            finally:
+                self._scope = None
+
+            self._findings_by_story = findings_by_story
+
+        else:
+            # Nothing changed. Only keep the findings of the stories asked for.
+            self._findings_by_story = { story.findings : self._findings_by_story[story.findings] for story in finding_stories }
+
+        self._file_content = text
+        self._record_digests = list()
+        self._text_length = len(text)
+        self._findings_date = today
+
+        return [finding for story in finding_stories for finding in self._findings_by_story[story.findings]]
+
+    def watch_file(self, file_name: str, stories: Optional[Iterable[Story]] = None, interval: float = 0.2) -> Iterator[Tuple[List[Finding], List[Finding]]]:
+        '''Generator that keeps the records and findings of a GEDCOM file in memory, and validates the file again with revalidate_file() whenever it is saved.
+            Polls the modification time and size of the file every interval seconds. Yields the new and the resolved findings after each validation; the first time, every finding is new.
+            A file that can not be validated, e.g. one saved in the middle of an edit with a reference to a missing record, is reported and waited out.
+            Only the changed records are validated again after the first time, and only the findings that changed are compared
+        '''
 
-        family_pretty_table: PrettyTable = PrettyTable(field_names= Family._pretty_table_headers)
+        stories = None if stories is None else list(stories)
+        previous_findings: List[Finding] = list()
+        signature: Optional[Tuple[int, int]] = None
+        validated_on: Optional[datetime.date] = None
+        frozen: bool = False
 
-        for family in self._family_dt.values():
-            family_pretty_table.add_row(family.return_pretty_table_row())
-        
-        print("Families")
-        print(family_pretty_table)
-        print("\n")
+        try:
+            while True:
+                try:
+                    status: os.stat_result = os.stat(file_name)
+                except FileNotFoundError:
+                    # Some editors save by removing the file and writing it again
+                    time.sleep(interval)
+                    continue
 
-    def family_set_spouse_names(self):
-        for entry in self._family_dt:
-            
-            husband_id = self._family_dt[entry].husband_id
-            try:
-                husband_name = self._individual_dt[husband_id].name
-            except KeyError:
-                husband_name = "Unknown"      
-            self._family_dt[entry].husband_name = husband_name   
+                # Ages change at midnight even if the file does not
+                if (status.st_mtime_ns, status.st_size) != signature or validated_on != datetime.date.today():
+                    signature = (status.st_mtime_ns, status.st_size)
+                    validated_on = datetime.date.today()
+
+                    try:
+                        findings: List[Finding] = self.revalidate_file(file_name, stories)
+                    except KeyError as error:
+                        # The records are only partly updated. Start again from a full validation.
+                        self.forget_derived_data()
+                        print(f'{file_name}: could not validate, {error} is missing', file = sys.stderr)
+                    except Exception as error:
+                        # e.g. a bad date, or a file rewritten while it was read
+                        self.forget_derived_data()
+                        print(f'{file_name}: could not validate, {type(error).__name__}: {error}', file = sys.stderr)
+                    else:
+                        # Link the records now rather than when the file is saved next
+                        self.record_links()
+
+                        # Most records are kept until the watch stops, so after the first validation the garbage collector is told to stop walking them
+                        # each time a later validation triggers a full collection
+                        if not frozen:
+                            gc.collect()
+                            gc.freeze()
+                            frozen = True
+
+                        yield diff_findings(previous_findings, findings)
+                        previous_findings = findings
+
+                time.sleep(interval)
+        finally:
+            if frozen:
+                gc.unfreeze()
 
-            wife_id = self._family_dt[entry].wife_id
-            try:
-                wife_name = self._individual_dt[wife_id].name                    
-            except KeyError:
-                wife_name = "Unknown"  
-            self._family_dt[entry].wife_name = wife_name        
-            
     def US03_birth_death(self):
         ''' Birth before death '''
-        x = []
-        for k, v in self._individual_dt.items():
-            if v.death_date != 'NA' and v.birth != 'NA':
+        return self.report_findings(self.US03_findings())
+
+    def US03_findings(self) -> Iterator[Finding]:
+        ''' Birth before death '''
+        for k, v in self.individuals_in_scope().items():
+            if type(v.death_date) == datetime.date and type(v.birth) == datetime.date:
                 if(v.death_date < v.birth):
-                    output = f"ERROR: US03: Individual ID: {k} Name: {v.name} has death date {v.death_date} before birth {v.birth}"
-                    print(output)
-                    x.append(output)
-        return x
+                    yield Finding('US03', 'ERROR', (k,), (v.death_date, v.birth),
+                                  "ERROR: US03: Individual ID: {0} Name: {1} has death date {2} before birth {3}", (k, v.name, v.death_date, v.birth))
 
     def US06_divorce_before_death(self):
         '''Divorce can take place only before death of both individuals '''
-        x = []
-        for k, v in self._family_dt.items():
+        return self.report_findings(self.US06_findings())
+
+    def US06_findings(self) -> Iterator[Finding]:
+        '''Divorce can take place only before death of both individuals '''
+        for k, v in self.families_in_scope().items():
             if v.divorce_date != 'NA':
-                hd = self._individual_dt[v.husband_id].death_date
-                wd = self._individual_dt[v.wife_id].death_date
+                # Spouses without a record are reported by US26
+                hd = self._individual_dt[v.husband_id].death_date if v.husband_id in self._individual_dt else 'NA'
+                wd = self._individual_dt[v.wife_id].death_date if v.wife_id in self._individual_dt else 'NA'
                 if hd != 'NA' and v.divorce_date > hd:
-                    output = f"ERROR: US06: family:{k}: Wife ID: {v.wife_id} Wife Name: {v.wife_name} Divorced {v.divorce_date} after husband's death:  ID: {v.husband_id} Name: {v.husband_name} death date: {hd}"
-                    print(output)
-                    x.append(output)
+                    yield Finding('US06', 'ERROR', (k, v.wife_id, v.husband_id), (v.divorce_date, hd),
+                                  "ERROR: US06: family:{0}: Wife ID: {1} Wife Name: {2} Divorced {3} after husband's death:  ID: {4} Name: {5} death date: {6}",
+                                  (k, v.wife_id, v.wife_name, v.divorce_date, v.husband_id, v.husband_name, hd))
                 if wd != 'NA' and v.divorce_date > wd:
-                   output = f"ERROR: US06: family:{k}: Husband ID: {v.husband_id} Husband Name: {v.husband_name} Divorced {v.divorce_date} after wife's death:  ID: {v.wife_id} Name: {v.wife_name} death date: {wd}"
-                   print(output)
-                   x.append(output)
-        return x            
+                    yield Finding('US06', 'ERROR', (k, v.husband_id, v.wife_id), (v.divorce_date, wd),
+                                  "ERROR: US06: family:{0}: Husband ID: {1} Husband Name: {2} Divorced {3} after wife's death:  ID: {4} Name: {5} death date: {6}",
+                                  (k, v.husband_id, v.husband_name, v.divorce_date, v.wife_id, v.wife_name, wd))
                
     def US07_Death150(self):
         ''' Death for all dead people and currently living must be less than 150'''
-        x = []
-
-        for k, v in self._individual_dt.items():
-            if v.age != 'NA' and v.age >= 150:
-                output = f"ERROR: US07: Individual ID: {k} Name: {v.name} is more more than 150 years old!"
+        return self.report_findings(self.US07_findings())
 
+    def US07_findings(self) -> Iterator[Finding]:
+        ''' Death for all dead people and currently living must be less than 150'''
+        for k, v in self.individuals_in_scope().items():
+            # Age can not be determined without a birth date
+            if type(v.age) != str and v.age >= 150:
                 if v.death_date != 'NA':
-                    output += f"Death date is {v.death_date}"
-
-                print(output)
-                x.append(output)
-        return x
+                    yield Finding('US07', 'ERROR', (k,), (v.death_date,),
+                                  "ERROR: US07: Individual ID: {0} Name: {1} is more more than 150 years old!Death date is {2}", (k, v.name, v.death_date))
+                else:
+                    yield Finding('US07', 'ERROR', (k,), (),
+                                  "ERROR: US07: Individual ID: {0} Name: {1} is more more than 150 years old!", (k, v.name))
 
     def US12_Mother_Father_older(self):
         ''' Mother's age - Sons age should be < 60, Father's age - Son's age should be < 80 '''
-        x = set()
+        findings: List[Finding] = list(self.US12_findings())
+        self.report_findings(findings)
 
-        for k in self._family_dt.values():
-            if k.wife_id != 'NA':
-                w = self._individual_dt[k.wife_id]
-                if w.age == 'NA':
-                    print(f"US12: Individual ID:{w.id} Mother's Name:{w.name} Age is NA")
-                    continue
-            if k.husband_id != 'NA':
-                h = self._individual_dt[k.husband_id]
-                if h.age == 'NA':
-                    print(f"US12: Individual ID:{h.id} Father's Name:{h.name} Age is NA")
+        return {finding.record_ids[0] for finding in findings}
+
+    def US12_findings(self) -> Iterator[Finding]:
+        ''' Mother's age - Sons age should be < 60, Father's age - Son's age should be < 80 '''
+        for k in self.families_in_scope().values():
+            w = self._individual_dt.get(k.wife_id)
+            h = self._individual_dt.get(k.husband_id)
+
+            # Skip families where a parent is unknown or a parent's age is not available
+            if w is None or h is None or type(w.age) == str or type(h.age) == str:
+                continue
+
+            for c in [self._individual_dt[ch] for ch in sorted(k.children) if ch in self._individual_dt]:
+                if type(c.age) == str:
                     continue
-            if k.children:
-                for c in [self._individual_dt[ch] for ch in k.children]:
-                    if c.age == 'NA':
-                        print(f"US12: The child name:{c.name} with ID {c.id} has Age NA")
-                    if w.age - c.age >= 60:
-                        output = f"ANOMALY: US12: Family ID:{k.id} Mother's ID:{w.id} and Name:{w.name} and Age:{w.age} is 60 years or older than Child's ID: {c.id} Name: {c.name} Age: {c.age}"
-                        print(output)
-                        x.add(k.id)
-                    if h.age - c.age >= 80:
-                        output = f"ANOMALY: US12: Family ID:{k.id} Father's ID:{h.id} and Name:{h.name} and Age:{h.age} is 80 years or older than Child's ID: {c.id} Name: {c.name} Age: {c.age}"
-                        print(output)
-                        x.add(k.id)
-
-        return x
+                if w.age - c.age >= 60:
+                    yield Finding('US12', 'ANOMALY', (k.id, w.id, c.id), (),
+                                  "ANOMALY: US12: Family ID:{0} Mother's ID:{1} and Name:{2} and Age:{3} is 60 years or older than Child's ID: {4} Name: {5} Age: {6}",
+                                  (k.id, w.id, w.name, w.age, c.id, c.name, c.age))
+                if h.age - c.age >= 80:
+                    yield Finding('US12', 'ANOMALY', (k.id, h.id, c.id), (),
+                                  "ANOMALY: US12: Family ID:{0} Father's ID:{1} and Name:{2} and Age:{3} is 80 years or older than Child's ID: {4} Name: {5} Age: {6}",
+                                  (k.id, h.id, h.name, h.age, c.id, c.name, c.age))
 
     def US16_male(self):
         '''' Male members of the family must have the same last name'''
-        r = []
-        for x in self._family_dt.values():
+        findings: List[Finding] = list(self.US16_findings())
+        self.report_findings(findings)
+
+        return [finding.record_ids[0] for finding in findings]
+
+    def US16_findings(self) -> Iterator[Finding]:
+        '''' Male members of the family must have the same last name'''
+        for x in self.families_in_scope().values():
+            if x.husband_id not in self._individual_dt:
+                continue
+
             h_id = self._individual_dt[x.husband_id].id
             fullname = self._individual_dt[x.husband_id].name
             if ('/' not in fullname):
                 continue
 
-            last_name = (self._individual_dt[x.husband_id].name).split('/')[1]
-            child_lname = []
+            last_name = fullname.split('/')[1]
 
-            if x.husband_id != 'NA' and x.children:
-                for child_id in x.children:
-                    c = self._individual_dt[child_id]
-                    if c.sex == 'M':
-                        if ('/' not in c.name):
-                            continue
-
-                        child_lname.append(c.name.split('/')[1])
+            for child_id in sorted(x.children):
+                c = self._individual_dt.get(child_id)
+                # Children without a record are reported by US26
+                if c is None or c.sex != 'M' or ('/' not in c.name):
+                    continue
 
-                for name in child_lname:
-                    if name != last_name:
-                        output = f"ERROR: US16: Family ID:{x.id} Last name do not match, Father's Name:{fullname} ID:{h_id} and Child's Name: {c.name} Child ID: {c.id}"
-                        print(output)
-                        r.append(x.id)
-        return r
+                if c.name.split('/')[1] != last_name:
+                    yield Finding('US16', 'ERROR', (x.id, h_id, c.id), (),
+                                  "ERROR: US16: Family ID:{0} Last name do not match, Father's Name:{1} ID:{2} and Child's Name: {3} Child ID: {4}",
+                                  (x.id, fullname, h_id, c.name, c.id))
 
     def families(self, family_set):
         '''yields a family object for a given set of family ids'''
@@ -438,197 +2321,297 @@ class GedcomFile:
     def find_grandparents(self, indi_id):
         '''Finds all grandparents for a given individual'''
         r = list()
-        indi = self._individual_dt[indi_id]
-
-        # Run through all the families where this individual is a child. Normally expected only 1 family.
-        for parent_fam in self.families(indi.famc):
+        relationships = self.relationship_index()
 
-            # Find the grandparents on the father's side.
-            for grandparent_fam in self.families(self._individual_dt[parent_fam.husband_id].famc):
-                r.append(grandparent_fam.husband_id)
-                r.append(grandparent_fam.wife_id)
-
-            # Find the grandparents on the mother's side
-            for grandparent_fam in self.families(self._individual_dt[parent_fam.wife_id].famc):
-                r.append(grandparent_fam.husband_id)
-                r.append(grandparent_fam.wife_id)
+        # Run through the parents of this individual, father's side first, then the mother's side.
+        for parent_id in relationships.parents_of(indi_id):
+            r.extend(relationships.parents_of(parent_id))
                 
         return r
 
+    def ancestor_depths(self, individual_id: str, max_depth: Optional[int] = None) -> Dict[str, int]:
+        '''Returns the ancestors of an individual with their generation distance: 1 for parents, 2 for grandparents, and so on up to max_depth (all of them by default).
+            The ancestors are walked one generation at a time, so each is reached at its closest distance and only once.
+            A cyclic lineage (an individual who is their own ancestor) stops at the cycle instead of looping, and the individual is not their own ancestor.
+        '''
+
+        relationships = self.relationship_index()
+        depths: Dict[str, int] = dict()
+        generation: List[str] = [individual_id]
+        depth: int = 0
+
+        while generation and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_generation: List[str] = list()
+
+            for current_id in generation:
+                for parent_id in relationships.parents_of(current_id):
+                    if parent_id not in depths and parent_id != individual_id:
+                        depths[parent_id] = depth
+                        next_generation.append(parent_id)
+
+            generation = next_generation
+
+        return depths
+
+    def common_ancestors(self, first_id: str, second_id: str, max_depth: Optional[int] = None) -> Dict[str, Tuple[int, int]]:
+        '''Returns the ancestors shared by two individuals, up to max_depth generations from both, with the generation distance from each of them'''
+
+        first_ancestors: Dict[str, int] = self.ancestor_depths(first_id, max_depth)
+        second_ancestors: Dict[str, int] = self.ancestor_depths(second_id, max_depth)
+
+        if len(second_ancestors) < len(first_ancestors):
+            return {ancestor_id: (first_ancestors[ancestor_id], depth) for ancestor_id, depth in second_ancestors.items() if ancestor_id in first_ancestors}
+        return {ancestor_id: (depth, second_ancestors[ancestor_id]) for ancestor_id, depth in first_ancestors.items() if ancestor_id in second_ancestors}
+
+    def find_related_couples(self, max_generations: int, families: Optional[Iterable[Family]] = None) -> Iterator[Tuple[Family, str, int, int]]:
+        '''Yields every couple (of the given families, all of them by default) that shares an ancestor no more than max_generations away from both spouses.
+            Each result is a tuple of: the family, the closest shared ancestor's ID, and that ancestor's generation distance from the husband and from the wife.
+            e.g. max_generations = 2 finds siblings, uncle/niece and first cousins. max_generations = 3 also finds second cousins.
+        '''
+
+        for fam in (self._family_dt.values() if families is None else families):
+            shared: Dict[str, Tuple[int, int]] = self.common_ancestors(fam.husband_id, fam.wife_id, max_generations)
+            within_reach: List[Tuple[int, int, str]] = [(husband_depth, wife_depth, ancestor_id) for ancestor_id, (husband_depth, wife_depth) in shared.items()]
+
+            if within_reach:
+                husband_depth, wife_depth, ancestor_id = min(within_reach, key = lambda entry: (entry[0] + entry[1], entry[0]))
+                yield fam, ancestor_id, husband_depth, wife_depth
+
+    def describe_consanguinity(self, first_depth: int, second_depth: int) -> str:
+        '''Names the relationship of two individuals from their generation distances to their closest shared ancestor'''
+
+        closer: int = min(first_depth, second_depth)
+        removed: int = abs(first_depth - second_depth)
+
+        if closer == 1 and removed == 0:
+            return 'siblings'
+
+        if closer == 1:
+            return f"{'great-' * (removed - 2)}{'grand-' if removed > 1 else ''}uncle/aunt and {'great-' * (removed - 2)}{'grand-' if removed > 1 else ''}niece/nephew"
+
+        ordinals: List[str] = ['first', 'second', 'third', 'fourth', 'fifth', 'sixth', 'seventh', 'eighth', 'ninth']
+        degree: str = ordinals[closer - 2] if closer - 2 < len(ordinals) else f'{closer - 1}th'
+        description: str = f'{degree} cousins'
+
+        if removed == 1:
+            description += ' once removed'
+        elif removed == 2:
+            description += ' twice removed'
+        elif removed > 2:
+            description += f' {removed} times removed'
+
+        return description
+
     def US19_married_first_cousins(self): 
-        r = list()
-        for fam in self._family_dt.values():
-            grandparents =  self.find_grandparents(fam.husband_id)
-            grandparents += self.find_grandparents(fam.wife_id)
-            
-            # OK, now we have a list of grandparents from both spouses.
-            # IF any grandparents are repeated in this list, then the spouses share a 
-            # grandparent - and therefore are first cousins.
-            if len(grandparents) == len(set(grandparents)):
-                continue
-            else:
-                print(f"ANOMALY: US19: Family id: {fam.id} Husband name: {fam.husband_name}, husband id: {fam.husband_id} and wife name: {fam.wife_name}, wife id: {fam.wife_id} are first cousins")
-                r.append(fam.id)
-        return(r)
+        findings: List[Finding] = list(self.US19_findings())
+        for finding in findings:
+            print(finding.render())
+
+        return [finding.record_ids[0] for finding in findings]
+
+    def US19_findings(self) -> Iterator[Finding]:
+        '''Spouses should not be first cousins, or related within max_generations if the instance has it'''
+        if self._max_generations is not None:
+            for fam, ancestor_id, husband_depth, wife_depth in self.find_related_couples(self._max_generations, self.related_families_in_scope().values()):
+                yield Finding('US19', 'ANOMALY', (fam.id, fam.husband_id, fam.wife_id, ancestor_id), (),
+                              "ANOMALY: US19: Family id: {0} Husband name: {1}, husband id: {2} and wife name: {3}, wife id: {4} are {5}, sharing ancestor {6}",
+                              (fam.id, fam.husband_name, fam.husband_id, fam.wife_name, fam.wife_id, self.describe_consanguinity(husband_depth, wife_depth), ancestor_id))
+            return
+
+        for fam in self.related_families_in_scope().values():
+            # The spouses are first cousins if they share a grandparent, so there is no need to look further back
+            shared = self.common_ancestors(fam.husband_id, fam.wife_id, 2)
+
+            if any(depths == (2, 2) for depths in shared.values()):
+                yield Finding('US19', 'ANOMALY', (fam.id, fam.husband_id, fam.wife_id), (),
+                              "ANOMALY: US19: Family id: {0} Husband name: {1}, husband id: {2} and wife name: {3}, wife id: {4} are first cousins",
+                              (fam.id, fam.husband_name, fam.husband_id, fam.wife_name, fam.wife_id))
 
     def US01_dates_b4_current(self):
+        '''Dates (birth, marriage, divorce, death) should not be after the current date'''
+        return self.report_findings(self.US01_findings())
+
+    def US01_findings(self) -> Iterator[Finding]:
         '''Dates (birth, marriage, divorce, death) should not be after the current date'''
         current_date = datetime.date.today()
-        r = list()
         for  fam in self._family_dt.values():
             if fam.marriage_date != 'NA':
                 if fam.marriage_date > current_date:
-                    output =f"Error US01 Family'ID:{fam.id} has marriage dates on {fam.marriage_date} after current date"
-                    print(output)
-                    r.append(output)
+                    yield Finding('US01', 'ERROR', (fam.id,), (fam.marriage_date,),
+                                  "Error US01 Family'ID:{0} has marriage dates on {1} after current date", (fam.id, fam.marriage_date))
 
             if fam.divorce_date != 'NA':
                 if fam.divorce_date > current_date:
-                    output = f"Error US01 Family'ID:{fam.id} has divorce date on {fam.divorce_date} after current date"
-                    print(output)
-                    r.append(output)
+                    yield Finding('US01', 'ERROR', (fam.id,), (fam.divorce_date,),
+                                  "Error US01 Family'ID:{0} has divorce date on {1} after current date", (fam.id, fam.divorce_date))
 
         for  indi in self._individual_dt.values():
             if indi.birth != '':
                 if indi.birth > current_date:
-                    output = f"Error US01 Individual'ID:{indi.id} has birth date on {indi.birth} after current date"
-                    print(output)
-                    r.append(output)
+                    yield Finding('US01', 'ERROR', (indi.id,), (indi.birth,),
+                                  "Error US01 Individual'ID:{0} has birth date on {1} after current date", (indi.id, indi.birth))
 
             if indi.death_date != 'NA':        
                 if indi.death_date > current_date:
-                    output = f"Error US01 Individual'ID:{indi.id} has death date on {indi.death_date} after current date"
-                    print(output)
-                    r.append(output)
-        return r
+                    yield Finding('US01', 'ERROR', (indi.id,), (indi.death_date,),
+                                  "Error US01 Individual'ID:{0} has death date on {1} after current date", (indi.id, indi.death_date))
    
     def US17_no_marraige_2_children(self):
         '''Parents should not marry any of their children'''
-        fam_list = list(self._family_dt.values())
-        r = list()
-        for fam in fam_list:
+        return self.report_findings(self.US17_findings())
+
+    def US17_findings(self) -> Iterator[Finding]:
+        '''Parents should not marry any of their children'''
+        relationships = self.relationship_index()
+
+        for fam in self.related_families_in_scope().values():
            if fam.husband_id != 'NA' and fam.wife_id !='NA':
-                for famchild in fam_list:
-                    if fam.husband_id in famchild.children and fam.wife_id == famchild.wife_id:
-                         output = f"Error US17 Family ID {fam.id} Mother: wife's ID {fam.wife_id} wife's name {fam.wife_name} is married to her child's ID {famchild.husband_id} child's name {famchild.husband_name}"
-                         print(output)
-                         r.append(output)
-                    elif fam.wife_id in famchild.children and fam.husband_id == famchild.husband_id:
-                        output = f"Error US17 Family ID {fam.id} Father: Father's ID {fam.husband_id} husban's name {fam.husband_name} is married to his child's ID {famchild.wife_id} child's name {famchild.wife_name}"
-                        print(output)
-                        r.append(output)
-        return r 
+                # Only the families the husband or the wife is a child of can make this an error
+                husband_parent_families: List[str] = relationships.parent_families_of(fam.husband_id)
+                wife_parent_families: List[str] = relationships.parent_families_of(fam.wife_id)
+                parent_families: Set[str] = set(husband_parent_families).union(wife_parent_families)
+
+                for famchild_id in sorted(parent_families, key = relationships.family_position):
+                    famchild: Family = self._family_dt[famchild_id]
+
+                    if famchild_id in husband_parent_families and fam.wife_id == famchild.wife_id:
+                        yield Finding('US17', 'ERROR', (fam.id, fam.wife_id, fam.husband_id), (),
+                                      "Error US17 Family ID {0} Mother: wife's ID {1} wife's name {2} is married to her child's ID {3} child's name {4}",
+                                      (fam.id, fam.wife_id, fam.wife_name, famchild.husband_id, famchild.husband_name))
+                    elif famchild_id in wife_parent_families and fam.husband_id == famchild.husband_id:
+                        yield Finding('US17', 'ERROR', (fam.id, fam.husband_id, fam.wife_id), (),
+                                      "Error US17 Family ID {0} Father: Father's ID {1} husban's name {2} is married to his child's ID {3} child's name {4}",
+                                      (fam.id, fam.husband_id, fam.husband_name, famchild.wife_id, famchild.wife_name))
 
     def US14_multiple_births(self):
         '''No more than five siblings should be born at the same time '''
-        r = []
-        for k, v in self._family_dt.items():
-            multiple_birth = self.Determine_multiple_birth(v.children)
-            
-            if len(multiple_birth) > 5:
-                r.append(k)
+        r = [finding.record_ids[0] for finding in self.US14_findings()]
         if r:
             print(f"ANOMALY: US14: Families {', '.join(r)} has more than 5 children born on the same time ")
 
         return r
 
+    def US14_findings(self) -> Iterator[Finding]:
+        '''No more than five siblings should be born at the same time '''
+        for k, v in self.families_in_scope().items():
+            birth_events = self.multiple_birth_groups(v.children)
+            
+            for birth_event in birth_events:
+                if len(birth_event) > 5:
+                    yield Finding('US14', 'ANOMALY', (k,), (birth_event[0].birth,),
+                                  "ANOMALY: US14: Family {0} has more than 5 children born on the same time: {1} children born on {2}", (k, len(birth_event), birth_event[0].birth))
+                    break
+
     def US15_siblings15(self):
         '''There should be fewer than 15 siblings in a family '''
-        r = []
-        for k,v in self._family_dt.items():
-            if (len(v.children) >= 15):
-                r.append(k)
+        r = [finding.record_ids[0] for finding in self.US15_findings()]
         
         if r:
             print(f"ANOMALY: US15: Families {', '.join(r)} have more than 15 children born")
 
         return r
+
+    def US15_findings(self) -> Iterator[Finding]:
+        '''There should be fewer than 15 siblings in a family '''
+        for k,v in self.families_in_scope().items():
+            if (len(v.children) >= 15):
+                yield Finding('US15', 'ANOMALY', (k,), (), "ANOMALY: US15: Family {0} has {1} children", (k, len(v.children)))
                         
     def US2_birth_before_marriage(self):
         ''''Birth should occur before marriage of an individual'''
         r = list()
-        for id in self._family_dt.keys():
+        for finding in self.US2_findings():
+            print(finding.render())
+            r.append(f"ERROR: US2: FAMILY: {finding.record_ids[0]}")
+        return r
+
+    def US2_findings(self) -> Iterator[Finding]:
+        ''''Birth should occur before marriage of an individual'''
+        for id in self.families_in_scope().keys():
             if self._family_dt[id].marriage_date != 'NA':
                 marDate = self._family_dt[id].marriage_date
                 indi_bdates = {}
                 husID = self._family_dt[id].husband_id
                 wifeID = self._family_dt[id].wife_id
-                indi_bdates[husID] = self._individual_dt[husID].birth
-                indi_bdates[wifeID] = self._individual_dt[wifeID].birth
+                for spouse_id in (husID, wifeID):
+                    # Spouses without a record are reported by US26
+                    if spouse_id in self._individual_dt:
+                        indi_bdates[spouse_id] = self._individual_dt[spouse_id].birth
                 for ids, vals in indi_bdates.items():
-                    if vals !='NA':
+                    if type(vals) == datetime.date:
                         birthDate = vals
                         if marDate < birthDate:
-                            output = f"ERROR: US2: FAMILY: {id} Individual: {ids} Name: {self._individual_dt[ids].name} birth: {birthDate} should be before marriage date {marDate}"
-                            output2 = f"ERROR: US2: FAMILY: {id}"
-                            print(output)
-                            r.append(output2)
-        return r
+                            yield Finding('US02', 'ERROR', (id, ids), (birthDate, marDate),
+                                          "ERROR: US2: FAMILY: {0} Individual: {1} Name: {2} birth: {3} should be before marriage date {4}",
+                                          (id, ids, self._individual_dt[ids].name, birthDate, marDate))
 
     def US5_marriage_before_death(self):
         '''Marriage should occur before death of either spouse'''
         r = list()
-        for id in self._family_dt.keys():
+        for finding in self.US5_findings():
+            print(finding.render())
+            r.append(f"ERROR: US5: FAMILY:{finding.record_ids[0]}")
+        return r
+
+    def US5_findings(self) -> Iterator[Finding]:
+        '''Marriage should occur before death of either spouse'''
+        for id in self.families_in_scope().keys():
             if self._family_dt[id].marriage_date != 'NA':
                 marDate = self._family_dt[id].marriage_date
                 indi_ddates = {} #inidvidual death dates dic 
                 husID = self._family_dt[id].husband_id
                 wifeID = self._family_dt[id].wife_id
-                indi_ddates[husID] = self._individual_dt[husID].death_date
-                indi_ddates[wifeID] = self._individual_dt[wifeID].death_date
+                for spouse_id in (husID, wifeID):
+                    # Spouses without a record are reported by US26
+                    if spouse_id in self._individual_dt:
+                        indi_ddates[spouse_id] = self._individual_dt[spouse_id].death_date
                 for ids, vals in indi_ddates.items():
                      if vals !='NA': # to find death date for each indivdual 
                          deathDate = vals
                          if deathDate < marDate: #Compare if  death date for inidvidual happens before marriage date 
-                             output = f"ERROR: US5: Family: {id} Individual: {ids} Name: {self._individual_dt[ids].name} dies on {deathDate} before marriage date on {marDate}"
-                             output2 = f"ERROR: US5: FAMILY:{id}"              
-                             print(output)
-                             r.append(output2)
-        return r
+                             yield Finding('US05', 'ERROR', (id, ids), (deathDate, marDate),
+                                           "ERROR: US5: Family: {0} Individual: {1} Name: {2} dies on {3} before marriage date on {4}",
+                                           (id, ids, self._individual_dt[ids].name, deathDate, marDate))
     
     def US22_uni_ids_indi_fam(self):
         '''All individual IDs should be unique and all family IDs should be unique '''
+        return self.report_findings(self.US22_findings())
 
-        output = list()
+    def US22_findings(self) -> Iterator[Finding]:
+        '''All individual IDs should be unique and all family IDs should be unique '''
         for dup_family in self._list_of_duplicate_family_ids:
-            output.append(f"ERROR: US22: Family ID: {dup_family.id} with wife ID: {dup_family.wife_id} and husband ID: {dup_family.husband_id} "+\
-                     f"is a duplicate of Family ID: {dup_family.id} with wife ID: {self._family_dt[dup_family.id].wife_id} and husband id: {self._family_dt[dup_family.id].husband_id}")
+            yield Finding('US22', 'ERROR', (dup_family.id,), (),
+                          "ERROR: US22: Family ID: {0} with wife ID: {1} and husband ID: {2} is a duplicate of Family ID: {0} with wife ID: {3} and husband id: {4}",
+                          (dup_family.id, dup_family.wife_id, dup_family.husband_id, self._family_dt[dup_family.id].wife_id, self._family_dt[dup_family.id].husband_id))
 
         for dup_ind in self._list_of_duplicate_individual_ids:
-            output.append(f"ERROR: US22: Individual ID: {dup_ind.id} with name {dup_ind.name} is a duplicate of individual ID {dup_ind.id} "+\
-                     f"with name {self._individual_dt[dup_ind.id].name}")
-
-        for entry in output:
-            print(entry)
-        return output
+            yield Finding('US22', 'ERROR', (dup_ind.id,), (),
+                          "ERROR: US22: Individual ID: {0} with name {1} is a duplicate of individual ID {0} with name {2}",
+                          (dup_ind.id, dup_ind.name, self._individual_dt[dup_ind.id].name))
 
     
     def US23_uni_name_birth(self):
         ''' No more than one individual with the same name and birth date should appear in a GEDCOM file'''
-        r = list()
+        return self.report_findings(self.US23_findings())
+
+    def US23_findings(self) -> Iterator[Finding]:
+        ''' No more than one individual with the same name and birth date should appear in a GEDCOM file'''
+        individuals_by_name_and_birth = group_by_key(self._individual_dt.values(), key = lambda individual: (individual.name, individual.birth))
 
         for inid, vals in self._individual_dt.items():
-            dup_names = list()
-            dup_birthdates = list()
-
-            for ids in self._individual_dt.keys():
-                if self._individual_dt[ids].name == vals.name:
-                    dup_names.append(ids)
-            if len (dup_names) > 1:
-                for idis in dup_names:
-                    if self._individual_dt[idis].birth == vals.birth:
-                        dup_birthdates.append(idis)
-                if len(dup_birthdates) > 1:
-                    output = f"ERROR US23 Individuals ids {inid} and name {vals.name} found duplicated name and birthdate"
-                    print(output)
-                    r.append(output)
-        return r
+            if len(individuals_by_name_and_birth[(vals.name, vals.birth)]) > 1:
+                yield Finding('US23', 'ERROR', (inid,), (vals.birth,),
+                              "ERROR US23 Individuals ids {0} and name {1} found duplicated name and birthdate", (inid, vals.name))
     
 
     def US4_Marriage_before_divorce(self): 
         '''Marriage should occur before divorce of spouses, and divorce can only occur after marriage'''
-        r = list()
-        for id in self._family_dt:
+        return self.report_findings(self.US4_findings())
+
+    def US4_findings(self) -> Iterator[Finding]:
+        '''Marriage should occur before divorce of spouses, and divorce can only occur after marriage'''
+        for id in self.families_in_scope():
             marDate = self._family_dt[id].marriage_date
             divDate = self._family_dt[id].divorce_date
             if divDate != 'NA' and marDate != 'NA':
@@ -637,15 +2620,17 @@ class GedcomFile:
                     h_id = self._family_dt[id].husband_id
                     w_name = self._family_dt[id].wife_name
                     w_id = self._family_dt[id].wife_id
-                    output = f"ERROR:US04:FAMILY:<{id}> Divorce {divDate} happens before marriage {marDate} Husband: ID {h_id}, Name {h_name}  Wife: ID {w_id}, Name {w_name}"  
-                    print(output)
-                    r.append(output)
-        return r
+                    yield Finding('US04', 'ERROR', (id, h_id, w_id), (divDate, marDate),
+                                  "ERROR:US04:FAMILY:<{0}> Divorce {1} happens before marriage {2} Husband: ID {3}, Name {4}  Wife: ID {5}, Name {6}",
+                                  (id, divDate, marDate, h_id, h_name, w_id, w_name))
 
     def US21_correct_gender_for_role(self):
         '''Husband in family should be male and wife in family should be female'''
-        r = list()
-        for fm in self._family_dt.values():
+        return self.report_findings(self.US21_findings())
+
+    def US21_findings(self) -> Iterator[Finding]:
+        '''Husband in family should be male and wife in family should be female'''
+        for fm in self.families_in_scope().values():
             try:
                 husband_sex = self._individual_dt[fm.husband_id].sex
             except KeyError:
@@ -653,9 +2638,8 @@ class GedcomFile:
                 pass
             else:
                 if husband_sex != "M":
-                    output = f"ERROR: US21: FAMILY:<{fm.id}> Incorrect sex for husband id: {fm.husband_id} name: {fm.husband_name} sex: {husband_sex} "
-                    print(output)
-                    r.append(output)
+                    yield Finding('US21', 'ERROR', (fm.id, fm.husband_id), (),
+                                  "ERROR: US21: FAMILY:<{0}> Incorrect sex for husband id: {1} name: {2} sex: {3} ", (fm.id, fm.husband_id, fm.husband_name, husband_sex))
 
             try:
                wife_sex = self._individual_dt[fm.wife_id].sex
@@ -664,15 +2648,18 @@ class GedcomFile:
                 pass
             else:
                 if wife_sex != "F":
-                    output = f"ERROR: US21: FAMILY:<{fm.id}> Incorrect sex for wife id: {fm.wife_id} name: {fm.wife_name} sex: {wife_sex} "
-                    print(output)
-                    r.append(output) 
-        return r
+                    yield Finding('US21', 'ERROR', (fm.id, fm.wife_id), (),
+                                  "ERROR: US21: FAMILY:<{0}> Incorrect sex for wife id: {1} name: {2} sex: {3} ", (fm.id, fm.wife_id, fm.wife_name, wife_sex))
 
     def US34_list_large_age_differences(self):
         '''US 34: List all couples who were married when the older spouse was more than twice as old as the younger spouse '''
-        output = ""
-        for family in self._family_dt.values():
+        output = "".join(finding.render() + "\n" for finding in self.US34_findings())
+        print(output, end="")
+        return output
+
+    def US34_findings(self) -> Iterator[Finding]:
+        '''US 34: List all couples who were married when the older spouse was more than twice as old as the younger spouse '''
+        for family in self.families_in_scope().values():
             
             try:
                 husband = self._individual_dt[family.husband_id]
@@ -688,35 +2675,31 @@ class GedcomFile:
                 # Invalid age, so skip this family.
                 continue
 
+            # OK, if we're still here, then we may have an Anomaly to report. 
             if husband.age > (wife.age * 2):
-                husband_is_older = True
+                yield Finding('US34', 'ANOMALY', (family.id, family.husband_id, family.wife_id), (),
+                              "ANOMALY: US34: FAMILY: {0} Name: {1}, id: {2}, age: {3} is more than 2x in age as spouse: {4}, id: {5}, age: {6}",
+                              (family.id, family.husband_name, family.husband_id, husband.age, family.wife_name, family.wife_id, wife.age))
             elif wife.age > (husband.age * 2):
-                husband_is_older = False
-            else:
-                # No need to report this married couple.
-                continue
-
-            # OK, if we're still here, then we have an Anomaly to report. 
-            output += f"ANOMALY: US34: FAMILY: {family.id} "
+                yield Finding('US34', 'ANOMALY', (family.id, family.wife_id, family.husband_id), (),
+                              "ANOMALY: US34: FAMILY: {0} Name: {1}, id: {2}, age: {3} is more than 2x in age as spouse: {4}, id: {5}, age: {6}",
+                              (family.id, family.wife_name, family.wife_id, wife.age, family.husband_name, family.husband_id, husband.age))
+            
 
-            if husband_is_older:
-                output += f"Name: {family.husband_name}, id: {family.husband_id}, age: {husband.age} is more than 2x in age as spouse: {family.wife_name}, id: {family.wife_id}, age: {wife.age}\n"        
-            else:
-                output += f"Name: {family.wife_name}, id: {family.wife_id}, age: {wife.age} is more than 2x in age as spouse: {family.husband_name}, id: {family.husband_id}, age: {husband.age}\n"
-        
+    def US35_list_recent_births(self):
+        '''US35: List all people in a GEDCOM file who were born in the last 30 days'''
+        output = "".join(finding.render() + "\n" for finding in self.US35_findings())
         print(output, end="")
         return output
-            
 
-    def US35_list_recent_births(self):
+    def US35_findings(self) -> Iterator[Finding]:
         '''US35: List all people in a GEDCOM file who were born in the last 30 days'''
-        output = ""
-        for person in self._individual_dt.values():
+        today = datetime.date.today()
+        for person in self.individuals_in_scope().values():
             birth_date = person.birth
             if type(birth_date) != datetime.date:
                 # Invalid entry
                 continue
-            today = datetime.date.today()
             age_days = (today - birth_date).days  # difference results in datetime.timedelta
 
             if age_days < 0:
@@ -724,9 +2707,8 @@ class GedcomFile:
                 continue
             
             if age_days <= 30:
-                output += f"ANOMALY: US35: Name: {person.name}, Individual: ID {person.id}, born {age_days} days ago! Birthday: {birth_date}\n"
-        print(output, end="")
-        return output
+                yield Finding('US35', 'ANOMALY', (person.id,), (birth_date,),
+                              "ANOMALY: US35: Name: {0}, Individual: ID {1}, born {2} days ago! Birthday: {3}", (person.name, person.id, age_days, birth_date))
 
     def parse_individuals_based_on_living_and_marital_details(self) -> None:
         '''US30 & US31: Identifies whether an individual is: Living and married, or Living, over 30 years old and has never been married. After identifying, stores the 
@@ -736,21 +2718,21 @@ class GedcomFile:
             name, age, alive, number_of_times_married = individual.return_living_and_marital_details()
             
             if alive == True and number_of_times_married > 0:
-                GedcomFile._individuals_living_and_married[individual_id] = name
+                self._individuals_living_and_married[individual_id] = name
             
-            elif alive == True and age > 30 and number_of_times_married == 0:
-                GedcomFile._individuals_living_over_thirty_and_never_married[individual_id] = name
+            elif alive == True and type(age) == int and age > 30 and number_of_times_married == 0:
+                self._individuals_living_over_thirty_and_never_married[individual_id] = name
 
     def list_individuals_living_and_married(self) -> None:
         '''US30: Prints a prettytable that lists all individuals that are alive and married'''
 
         pretty_table_for_living_and_married_people: PrettyTable = PrettyTable(field_names=['ID', 'Name'])
 
-        if len(GedcomFile._individuals_living_and_married) == 0:
+        if len(self._individuals_living_and_married) == 0:
             pretty_table_for_living_and_married_people.add_row(['None', 'None'])
         
         else:
-            for individual_id, name in GedcomFile._individuals_living_and_married.items():
+            for individual_id, name in self._individuals_living_and_married.items():
                 pretty_table_for_living_and_married_people.add_row([individual_id, name])
         
         print(f'\nUS30: All Individuals Living and Married:\n{pretty_table_for_living_and_married_people}\n')
@@ -760,11 +2742,11 @@ class GedcomFile:
 
         pretty_table_for_living_over_thirty_never_married: PrettyTable = PrettyTable(field_names=['ID', 'Name'])
 
-        if len(GedcomFile._individuals_living_over_thirty_and_never_married) == 0:
+        if len(self._individuals_living_over_thirty_and_never_married) == 0:
             pretty_table_for_living_over_thirty_never_married.add_row(['None', 'None'])
         
         else:
-            for individual_id, name in GedcomFile._individuals_living_over_thirty_and_never_married.items():
+            for individual_id, name in self._individuals_living_over_thirty_and_never_married.items():
                 pretty_table_for_living_over_thirty_never_married.add_row([individual_id, name])
         
         print(f'US31: All Individuals Living, Over 30, and Never Married:\n{pretty_table_for_living_over_thirty_never_married}\n')
@@ -774,16 +2756,19 @@ class GedcomFile:
 
     def US28_list_all_siblings_from_oldest_to_youngest(self) -> List[List[str]]:
         '''Lists all siblings in a family from oldest to youngest'''
+        return list(self.US28_print_siblings())
+
+    def US28_print_siblings(self) -> Iterator[List[Any]]:
+        '''Prints all siblings in a family from oldest to youngest, and yields each row as it is added to the table. Only the caller keeps the rows, if it needs them'''
 
-        pretty_table_for_all_siblings: PrettyTable = PrettyTable(field_names = ['Family ID', 'Child ID', 'Child Name', 'Child Age'])
-        all_siblings: List[List[str]] = list()
+        print('\nUS28: All Siblings Ordered by Age From Oldest to Youngest:')
 
-        for siblings in self.US28_order_siblings_by_age():
-            all_siblings.append(siblings)
-            pretty_table_for_all_siblings.add_row(siblings)
- 
-        print(f'\nUS28: All Siblings Ordered by Age From Oldest to Youngest:\n{pretty_table_for_all_siblings}\n')
-        return all_siblings
+        with self.print_table(['Family ID', 'Child ID', 'Child Name', 'Child Age']) as pretty_table_for_all_siblings:
+            for siblings in self.US28_order_siblings_by_age():
+                pretty_table_for_all_siblings.add_row(siblings)
+                yield siblings
+
+        print()
 
     def US28_order_siblings_by_age(self) -> Iterator[List[List[str]]]:
         '''US28: Orders the siblings in each family by age from oldest to youngest''' 
@@ -795,12 +2780,16 @@ class GedcomFile:
             children: Set[str] = family.children
 
             if len(children) > 1:
-                for child_id in children:
+                for child_id in sorted(children):
+                    # Children without a record are reported by US26
+                    if child_id not in self._individual_dt:
+                        continue
                     name: str = self._individual_dt[child_id].name
                     age: str = self._individual_dt[child_id].age
                     family_siblings.append([fam_id, child_id, name, age])
 
-                for siblings_sorted_by_age in sorted(family_siblings, reverse = True, key = lambda n: n[-1]):
+                # Siblings without a birth date have no age, and are listed last
+                for siblings_sorted_by_age in sorted(family_siblings, reverse = True, key = lambda n: n[-1] if type(n[-1]) == int else float('-inf')):
                     yield siblings_sorted_by_age
 
                 family_siblings = list()
@@ -841,11 +2830,70 @@ class GedcomFile:
 
 
     def walk_down_family_tree(self, family, descendant_lst) -> None:
-        '''Recursive method for finding all descendants'''
-        for child_id in self._family_dt[family].children:
-            descendant_lst.append(child_id)
-            for fam in self._individual_dt[child_id].fams:
-                self.walk_down_family_tree(fam, descendant_lst)
+        '''Appends all descendants of a family to descendant_lst'''
+        descendant_lst.extend(self.iter_family_descendants(family))
+
+    def iter_family_descendants(self, family_id: str) -> Iterator[str]:
+        '''Lazily yields the IDs of all descendants of a family: children, grandchildren, and so on'''
+
+        return self.walk_descendants([family_id])
+
+    def iter_descendants(self, individual_id: str) -> Iterator[str]:
+        '''Lazily yields the IDs of all descendants of an individual, through every family the individual is a spouse in'''
+
+        if individual_id not in self._individual_dt:
+            return iter(())
+        return self.walk_descendants(sorted(self._individual_dt[individual_id].fams))
+
+    def walk_descendants(self, family_ids: Iterable[str]) -> Iterator[str]:
+        '''Iterative, depth first walk down the family tree starting at the given families.
+            Each individual and family is visited once, so shared subtrees are not walked twice and cyclic data
+            (an individual who is their own ancestor) can not loop forever. Deep lineages do not hit the recursion limit.
+        '''
+
+        visited_individuals: Set[str] = set()
+        visited_families: Set[str] = set()
+        pending: List[Iterator[str]] = list()
+
+        def children_of_families(family_ids: Iterable[str]) -> Iterator[str]:
+            '''Yields the children of the families that have not been walked yet'''
+            for family_id in family_ids:
+                if family_id in self._family_dt and family_id not in visited_families:
+                    visited_families.add(family_id)
+                    yield from sorted(self._family_dt[family_id].children)
+
+        pending.append(children_of_families(family_ids))
+
+        while pending:
+            child_id: Optional[str] = next(pending[-1], None)
+
+            if child_id is None:
+                # All children of this branch have been walked
+                pending.pop()
+                continue
+
+            if child_id in visited_individuals or child_id not in self._individual_dt:
+                continue
+
+            visited_individuals.add(child_id)
+            yield child_id
+            pending.append(children_of_families(sorted(self._individual_dt[child_id].fams)))
+
+    def iter_ancestors(self, individual_id: str) -> Iterator[str]:
+        '''Lazily yields the IDs of all ancestors of an individual, generation by generation: parents, grandparents, and so on.
+            Each ancestor is yielded once, even if the data is cyclic.
+        '''
+
+        relationships = self.relationship_index()
+        visited: Set[str] = {individual_id}
+        pending: deque = deque([individual_id])
+
+        while pending:
+            for parent_id in relationships.parents_of(pending.popleft()):
+                if parent_id not in visited:
+                    visited.add(parent_id)
+                    yield parent_id
+                    pending.append(parent_id)
 
 
     def US37_list_recent_survivors(self) -> None:
@@ -854,23 +2902,22 @@ class GedcomFile:
 
         pt_survivors: PrettyTable = PrettyTable(field_names=['Recently Deceased ID', 'Recently Deceased Name', 'Surviver ID', 'Surviver Name', "Relationship to Deceased"])
 
+        relationships = self.relationship_index()
+
         for d_id, name, _ in recently_deceased_lst:
-            for spousefamid in self._individual_dt[d_id].fams:
-                if d_id == self._family_dt[spousefamid].wife_id:
-                    spouseid = self._family_dt[spousefamid].husband_id
-                else:
-                    spouseid = self._family_dt[spousefamid].wife_id
-                
-                if self._individual_dt[spouseid].living:
+            spouses: Dict[str, str] = dict(relationships.spouses_of(d_id))
+
+            for spousefamid in sorted(relationships.families_of(d_id)[1], key = relationships.family_position):
+                spouseid = spouses.get(spousefamid)
+
+                if spouseid is not None and self._individual_dt[spouseid].living:
                     if self._family_dt[spousefamid].divorce_date != 'NA':
                         Prefix = "Ex-"
                     else:
                         Prefix = ""
                     pt_survivors.add_row([d_id, name, spouseid, self._individual_dt[spouseid].name, Prefix+"Spouse"])
                 
-                d_lst = list()
-                self.walk_down_family_tree(spousefamid, d_lst)
-                for descendant in d_lst:
+                for descendant in self.iter_family_descendants(spousefamid):
                     if self._individual_dt[descendant].living:
                         pt_survivors.add_row([d_id, name, descendant, self._individual_dt[descendant].name, "Descendant"])
 
@@ -881,24 +2928,37 @@ class GedcomFile:
         return pt_survivors
 
                   
+    def multiple_birth_groups(self, famc) -> List[List[Individual]]:
+        '''Groups the given siblings into birth events. Siblings born within one day of each other belong to the same event.
+            Sorts the siblings by birth date and sweeps through them once, so the cost is O(n log n).
+            Returns only the events with 2 or more siblings, each ordered by birth date
+        '''
+        # if birthdate not provided, then skip
+        children: List[Individual] = [self._individual_dt[child] for child in sorted(famc) if child in self._individual_dt and type(self._individual_dt[child].birth) != str]
+        children.sort(key = lambda child: child.birth)
+
+        birth_events: List[List[Individual]] = list()
+        current_event: List[Individual] = list()
+
+        for child in children:
+            # If the difference from the previous sibling is one day or less, then both are part of same multiple birth
+            if current_event and (child.birth - current_event[-1].birth).days <= 1:
+                current_event.append(child)
+            else:
+                if len(current_event) > 1:
+                    birth_events.append(current_event)
+                current_event = [child]
+
+        if len(current_event) > 1:
+            birth_events.append(current_event)
+
+        return birth_events
+
     def Determine_multiple_birth(self, famc):
+        '''Returns the set of siblings that are part of any multiple birth'''
         multiple_birth_set = set()
-        child_lst = list()
-        for child in list(famc):
-            child_lst.append(self._individual_dt[child])
-
-            # Compare each sibling against eachother, ensuring that siblings aren't compared with themselves.
-            for i in range (len(child_lst)):
-                for j in range (i+1, len(child_lst)):
-                    # if birthdate not provided, then skip
-                    if type(child_lst[i].birth) == str or type(child_lst[j].birth) == str:
-                        continue
-
-                    # Subtract birthdates. If the difference is one day or less, then both are part of same multiple birth
-                    diff_days = abs((child_lst[i].birth - child_lst[j].birth).days)
-                    if diff_days <= 1:
-                        multiple_birth_set.add(child_lst[i])
-                        multiple_birth_set.add(child_lst[j])
+        for birth_event in self.multiple_birth_groups(famc):
+            multiple_birth_set.update(birth_event)
 
         return multiple_birth_set
 
@@ -921,8 +2981,8 @@ class GedcomFile:
             temp = self.Determine_multiple_birth(fam.children)
             multiple_birth_set.update(temp)
 
-        for child in multiple_birth_set:
-            multiple_births_pt.add_row([str(child.famc), child.id, child.name, child.birth])
+        for child in sorted(multiple_birth_set, key = lambda child: child.id):
+            multiple_births_pt.add_row([format_id_set(child.famc), child.id, child.name, child.birth])
 
         if len(multiple_birth_set) > 0:
             multiple_births_pt.sortby = 'Family ID'
@@ -941,10 +3001,13 @@ class GedcomFile:
 
         orphan_pt: PrettyTable = PrettyTable(field_names = ['Family ID (as child)', 'Individual ID', 'Name']) 
         num_pt_entries = 0
-        for person in self._individual_dt.values():
+        relationships = self.relationship_index()
+
+        for person_id, person in self._individual_dt.items():
+            parents: List[str] = relationships.parents_of(person_id)
 
             # Only orphan if parents are dead. If no parents are listed, skip this individual.
-            if len(person.famc) == 0:
+            if len(parents) == 0:
                 continue
 
             # If we can't determine an age, skip that person. Otherwise, check for age requirement
@@ -955,14 +3018,12 @@ class GedcomFile:
                 # as a child < 18 years old who has no living parents, biological or not.
                 orphan = True
 
-                for family in person.famc:
-                    mother_id = self._family_dt[family].wife_id
-                    father_id = self._family_dt[family].husband_id
-                    if self._individual_dt[mother_id].living or self._individual_dt[father_id].living:
+                for parent_id in parents:
+                    if self._individual_dt[parent_id].living:
                         orphan = False
                 
                 if orphan:
-                    orphan_pt.add_row([person.famc or "None", person.id, person.name])
+                    orphan_pt.add_row([format_id_set(person.famc) if person.famc else "None", person.id, person.name])
                     num_pt_entries += 1
 
         if num_pt_entries > 0:
@@ -973,32 +3034,16 @@ class GedcomFile:
 
     def US24_unique_families_by_spouses(self) -> List[str]:
         '''Identifies multiple families that have the same spouses and marriage date'''
+        return self.report_findings(self.US24_findings())
 
-        list_of_families: List[Family] = self.US24_set_list_of_families()
-        output: List[str] = list()
-
-        while True:
-            if len(list_of_families) == 0: break
-            family_ids_with_matching_spouses_and_marriage_date = list()
-            
-            family_being_compared: Family = list_of_families.pop(0)
-            detail_for_family_being_compared = [family_being_compared.husband_name, family_being_compared.wife_name, family_being_compared.marriage_date]
-            family_ids_with_matching_spouses_and_marriage_date.append(family_being_compared.id)
-
-            for fam in list_of_families:
-                if [fam.husband_name, fam.wife_name, fam.marriage_date] == detail_for_family_being_compared:
-                    family_ids_with_matching_spouses_and_marriage_date.append(fam.id)
-
-            if len(family_ids_with_matching_spouses_and_marriage_date) > 1:
-                anomaly_message: str = self.US24_set_output_message(family_ids_with_matching_spouses_and_marriage_date, detail_for_family_being_compared)
-                print(anomaly_message)
-                output.append(anomaly_message)
+    def US24_findings(self) -> Iterator[Finding]:
+        '''Identifies multiple families that have the same spouses and marriage date'''
 
-            for family in list_of_families:
-                if family.id in family_ids_with_matching_spouses_and_marriage_date:
-                    list_of_families.remove(family)
+        list_of_families: List[Family] = self.US24_set_list_of_families()
 
-        return output
+        for detail_for_families, families in find_duplicate_groups(list_of_families, key = lambda fam: (fam.husband_name, fam.wife_name, fam.marriage_date)):
+            family_ids_with_matching_spouses_and_marriage_date: List[str] = [family.id for family in families]
+            yield self.US24_finding(family_ids_with_matching_spouses_and_marriage_date, list(detail_for_families))
 
     def US24_set_list_of_families(self) -> List[Family]:
         '''Traverses through the _family_dt to extract only the families that have husband name, wife name, and marriage date all poulated, and puts them in a list'''
@@ -1013,72 +3058,54 @@ class GedcomFile:
 
         return list_of_families
 
-    def US24_set_output_message(self, list_of_family_ids: List[str], family_detail: List[str]) -> str:
-        '''Sets up the output message for US24'''
+    def US24_finding(self, list_of_family_ids: List[str], family_detail: List[str]) -> Finding:
+        '''Sets up the finding for US24'''
 
         family_ids: str = ', '.join(list_of_family_ids)
         husband: str = family_detail[0]
         wife: str = family_detail[1]
-        marriage_date: str = family_detail[2]
+        marriage_date: datetime.date = family_detail[2]
 
-        return f'ANOMALY: US24: Families {family_ids}, have the same spouses and marriage date: Husband: {husband}, Wife: {wife}, Marriage Date: {marriage_date}'
+        return Finding('US24', 'ANOMALY', tuple(list_of_family_ids), (marriage_date,),
+                       'ANOMALY: US24: Families {0}, have the same spouses and marriage date: Husband: {1}, Wife: {2}, Marriage Date: {3}', (family_ids, husband, wife, marriage_date))
 
     def US25_unique_first_names_in_families(self) -> None:
         '''Traverses through the _family_dt and checks each family's children to see if multiple children have the same name and birth date'''
-        
-        output: List[str] = list()
-
-        for family_id, children in self.US25_set_list_of_children_in_a_family():
-            family_id: str = family_id
-            list_of_children_in_family: List[Individual] = children
-        
-            while True:
-                if len(list_of_children_in_family) == 0: break
-                child_ids_with_matching_name_and_birth_date: List[str] = list()
-
-                child_being_compared: Individual = list_of_children_in_family.pop(0)
-                detail_for_child_being_compared: List[str] = [child_being_compared.name, child_being_compared.birth]
-                child_ids_with_matching_name_and_birth_date.append(child_being_compared.id)
+        return self.report_findings(self.US25_findings())
 
-                for child in list_of_children_in_family:
-                        if [child.name, child.birth] == detail_for_child_being_compared:
-                            child_ids_with_matching_name_and_birth_date.append(child.id)
-                
-                if len(child_ids_with_matching_name_and_birth_date) > 1:
-                    anomaly_message: str = self.US25_set_output_message(child_ids_with_matching_name_and_birth_date, detail_for_child_being_compared, family_id)
-                    print(anomaly_message)
-                    output.append(anomaly_message)
-                            
-                for child in list_of_children_in_family:
-                    if child.id in child_ids_with_matching_name_and_birth_date:
-                        list_of_children_in_family.remove(child)
+    def US25_findings(self) -> Iterator[Finding]:
+        '''Traverses through the _family_dt and checks each family's children to see if multiple children have the same name and birth date'''
 
-        return output
+        for family_id, children in self.US25_set_list_of_children_in_a_family():
+            for detail_for_children, matching_children in find_duplicate_groups(children, key = lambda child: (child.name, child.birth)):
+                child_ids_with_matching_name_and_birth_date: List[str] = [child.id for child in matching_children]
+                yield self.US25_finding(child_ids_with_matching_name_and_birth_date, list(detail_for_children), family_id)
 
     def US25_set_list_of_children_in_a_family(self) -> Iterator[List[Individual]]:
         '''Traverses through the _family_dt to extract only the families that have multiple children'''
 
         children_in_family: List[Individual] = list()
 
-        for family in self._family_dt.values():
+        for family in self.families_in_scope().values():
             if len(family.children) <= 1:
                 continue
             else:
-                for child_id in family.children:
-                    children_in_family.append(self._individual_dt[child_id])
+                for child_id in sorted(family.children):
+                    if child_id in self._individual_dt:
+                        children_in_family.append(self._individual_dt[child_id])
                 
                 yield family.id, children_in_family
                 children_in_family = list()
 
-    def US25_set_output_message(self, list_of_child_ids: List[str], child_detail: List[str], family_id: str):
-        '''Sets up the output message for US24'''
+    def US25_finding(self, list_of_child_ids: List[str], child_detail: List[str], family_id: str) -> Finding:
+        '''Sets up the finding for US25'''
 
         child_ids: str = ', '.join(list_of_child_ids)
-        family_id: str = family_id
         name: str = child_detail[0]
-        birth_date: str = child_detail[1]
+        birth_date: datetime.date = child_detail[1]
 
-        return f'ANOMALY: US25: Individuals {child_ids} from family {family_id}, have the same name and birth date: Name: {name}, Birth Date: {birth_date}'
+        return Finding('US25', 'ANOMALY', (family_id, *list_of_child_ids), (birth_date,),
+                       'ANOMALY: US25: Individuals {0} from family {1}, have the same name and birth date: Name: {2}, Birth Date: {3}', (child_ids, family_id, name, birth_date))
 
     def date_diff_days_ignore_year(self, date1, date2):
         ''' Returns the difference in days. Ignores year in comparison'''
@@ -1135,8 +3162,10 @@ class GedcomFile:
             if type(family.marriage_date) != datetime.date:
                 # Invalid entry. marriage date never logged, so skip this individual.
                 continue
-            if not self._individual_dt[family.husband_id].living or not self._individual_dt[family.wife_id].living:
-                # One of the spouses are deceased, skip this family
+            husband: Optional[Individual] = self._individual_dt.get(family.husband_id)
+            wife: Optional[Individual] = self._individual_dt.get(family.wife_id)
+            if husband is None or wife is None or not husband.living or not wife.living:
+                # One of the spouses are deceased or have no record, skip this family
                 continue
 
             if family.divorce_date != 'NA':
@@ -1178,203 +3207,584 @@ class GedcomFile:
         '''Goes through each individual record and calls cross_reference_family() to cross reference the families that are identified in the family related tags of the
             individual record: "fams" and "famc". If there is inconsistency between the individual and the family, then an error message is collected and printed. 
         '''
+        return self.report_findings(self.US26_individual_findings())
 
-        output: List[str] = list()
-
-        for individual in self._individual_dt.values():
-            error_messages: List[str] = self.US26_cross_reference_family(individual)
-            
-            if len(error_messages) > 0:
-                for message in error_messages:
-                    print(message)
-                    output.append(message)
+    def US26_individual_findings(self) -> Iterator[Finding]:
+        '''Cross references the family related tags of every individual record'''
 
-        return output
+        for individual in self.individuals_in_scope().values():
+            yield from self.US26_cross_reference_family(individual)
 
-    def US26_cross_reference_family(self, individual: Individual) -> None:
+    def US26_cross_reference_family(self, individual: Individual) -> List[Finding]:
         '''Cross references the families that are identified in the "fams" and "famc" tags of an individual record to make sure there is consistency with both
            the individual and family record'''
 
-        error_messages: List[str] = list()
+        findings: List[Finding] = list()
 
-        for family_id in individual.fams:
-            family_being_referenced: Family = self._family_dt[family_id]
+        for family_id in sorted(individual.fams):
+            family_being_referenced: Optional[Family] = self._family_dt.get(family_id)
 
-            if individual.sex == 'M':
+            if family_being_referenced is None:
+                findings.append(Finding('US26', 'ERROR', (individual.id, family_id), (), 'ERROR: US26: Individual {0}-{1} and Family {2} show spouse inconsistency. {0}-{1} is identified as spouse in {2}, but {2} does not exist',
+                                        (individual.id, individual.name, family_id)))
+
+            elif individual.sex == 'M':
                 if individual.id != family_being_referenced.husband_id:
-                    error_messages.append(self.US26_error_message_for_individual(individual, family_being_referenced, 'husband error'))
+                    findings.append(self.US26_finding_for_individual(individual, family_being_referenced, 'husband error'))
 
             elif individual.sex == 'F':
                 if individual.id != family_being_referenced.wife_id:
-                    error_messages.append(self.US26_error_message_for_individual(individual, family_being_referenced, 'wife error'))
+                    findings.append(self.US26_finding_for_individual(individual, family_being_referenced, 'wife error'))
+
+        for family_id in sorted(individual.famc):
+            family_being_referenced: Optional[Family] = self._family_dt.get(family_id)
+
+            if family_being_referenced is None:
+                findings.append(Finding('US26', 'ERROR', (individual.id, family_id), (), 'ERROR: US26: Individual {0}-{1} and Family {2} show children inconsistency. {0}-{1} is identified as child in {2}, but {2} does not exist',
+                                        (individual.id, individual.name, family_id)))
+
+            elif individual.id not in family_being_referenced.children:
+                findings.append(self.US26_finding_for_individual(individual, family_being_referenced, 'child error'))
 
-        for family_id in individual.famc:
-            family_being_referenced: Family = self._family_dt[family_id]
- 
-            if individual.id not in family_being_referenced.children:
-                error_messages.append(self.US26_error_message_for_individual(individual, family_being_referenced, 'child error'))
+        return findings
 
-        return error_messages
+    def US26_finding_for_individual(self, individual: Individual, family_being_referenced: Family, type_of_error: str) -> Finding:
+        '''Returns the appropriate spouse or child finding when inconsistencies are found in an Individual record'''
 
-    def US26_error_message_for_individual(self, individual: Individual, family_being_referenced: Family, type_of_error: str):
-        '''Returns the appropriate spouse or child error message when inconsistencies are found in an Individual record'''
+        record_ids: Tuple[str, str] = (individual.id, family_being_referenced.id)
+        arguments: Tuple[str, ...] = (individual.id, individual.name, family_being_referenced.id)
 
         if type_of_error == 'husband error':
-            return f'ERROR: US26: Individual {individual.id}-{individual.name} and Family {family_being_referenced.id} show spouse inconsistency. {individual.id}-{individual.name} is identified as husband in {family_being_referenced.id}, but {family_being_referenced.id} identifies husband as {family_being_referenced.husband_id}-{family_being_referenced.husband_name}'
+            return Finding('US26', 'ERROR', record_ids, (), 'ERROR: US26: Individual {0}-{1} and Family {2} show spouse inconsistency. {0}-{1} is identified as husband in {2}, but {2} identifies husband as {3}-{4}',
+                           arguments + (family_being_referenced.husband_id, family_being_referenced.husband_name))
 
         elif type_of_error == 'wife error':
-            return f'ERROR: US26: Individual {individual.id}-{individual.name} and Family {family_being_referenced.id} show spouse inconsistency. {individual.id}-{individual.name} is identified as wife in {family_being_referenced.id}, but {family_being_referenced.id} identifies wife as {family_being_referenced.wife_id}-{family_being_referenced.wife_name}'
+            return Finding('US26', 'ERROR', record_ids, (), 'ERROR: US26: Individual {0}-{1} and Family {2} show spouse inconsistency. {0}-{1} is identified as wife in {2}, but {2} identifies wife as {3}-{4}',
+                           arguments + (family_being_referenced.wife_id, family_being_referenced.wife_name))
 
         elif type_of_error == 'child error':
             if len(family_being_referenced.children) == 0:
-                return f'ERROR: US26: Individual {individual.id}-{individual.name} and Family {family_being_referenced.id} show children inconsistency. {individual.id}-{individual.name} is identified as child in {family_being_referenced.id}, but {family_being_referenced.id} has no children.' 
+                return Finding('US26', 'ERROR', record_ids, (), 'ERROR: US26: Individual {0}-{1} and Family {2} show children inconsistency. {0}-{1} is identified as child in {2}, but {2} has no children.', arguments)
             else:
-                return f'ERROR: US26: Individual {individual.id}-{individual.name} and Family {family_being_referenced.id} show children inconsistency. {individual.id}-{individual.name} is identified as child in {family_being_referenced.id}, but {family_being_referenced.id} identifies children as {", ".join(family_being_referenced.children)}'
+                return Finding('US26', 'ERROR', record_ids, (), 'ERROR: US26: Individual {0}-{1} and Family {2} show children inconsistency. {0}-{1} is identified as child in {2}, but {2} identifies children as {3}',
+                               arguments + (", ".join(sorted(family_being_referenced.children)),))
 
     def US26_corresponding_entries_families(self):
         '''Goes through each family record and calls cross_reference_individual() to cross reference the individuals that are identified as the husband, wife, or child
              in the family. If there is inconsistency between the family and any individual, then an error message is collected and printed. 
         '''
+        return self.report_findings(self.US26_family_findings())
 
-        output: List[str] = list()
-        
-        for family in self._family_dt.values():
-            error_messages: List[str] = self.US26_cross_reference_individual(family)
-
-            if len(error_messages) > 0:
-                for message in error_messages:
-                    print(message)
-                    output.append(message)
+    def US26_family_findings(self) -> Iterator[Finding]:
+        '''Cross references the husband, wife and children of every family record'''
 
-        return output
+        for family in self.families_in_scope().values():
+            yield from self.US26_cross_reference_individual(family)
 
-    def US26_cross_reference_individual(self, family: Family) -> List[str]:
+    def US26_cross_reference_individual(self, family: Family) -> List[Finding]:
         '''Cross references the individuals that are identified in a family as husband, wife, or child to make sure there is consistency with both
            the family and individual record'''
 
-        error_messages: List[str] = list()
+        findings: List[Finding] = list()
 
         if family.husband_id != '':
-            husband_being_referenced: Individual = self._individual_dt[family.husband_id]
+            husband_being_referenced: Optional[Individual] = self._individual_dt.get(family.husband_id)
 
-            if family.id not in husband_being_referenced.fams:
-                error_messages.append(self.US26_error_messages_for_family(family, husband_being_referenced, 'husband error'))
+            if husband_being_referenced is None:
+                findings.append(self.US26_finding_for_missing_individual(family, family.husband_id, 'husband'))
+            elif family.id not in husband_being_referenced.fams:
+                findings.append(self.US26_finding_for_family(family, husband_being_referenced, 'husband error'))
         
         if family.wife_id != '':
-            wife_being_referenced: Individual = self._individual_dt[family.wife_id]
+            wife_being_referenced: Optional[Individual] = self._individual_dt.get(family.wife_id)
+
+            if wife_being_referenced is None:
+                findings.append(self.US26_finding_for_missing_individual(family, family.wife_id, 'wife'))
+            elif family.id not in wife_being_referenced.fams:
+                findings.append(self.US26_finding_for_family(family, wife_being_referenced, 'wife error'))
+
+        for child_id in sorted(family.children):
+            child_being_referenced: Optional[Individual] = self._individual_dt.get(child_id)
+
+            if child_being_referenced is None:
+                findings.append(self.US26_finding_for_missing_individual(family, child_id, 'child'))
+            elif family.id not in child_being_referenced.famc:
+                findings.append(self.US26_finding_for_family(family, child_being_referenced, 'child error'))
 
-            if family.id not in wife_being_referenced.fams:
-                error_messages.append(self.US26_error_messages_for_family(family, wife_being_referenced, 'wife error'))
+        return findings
 
-        for child_id in family.children:
-            child_being_referenced: Individual = self._individual_dt[child_id]
+    def US26_finding_for_missing_individual(self, family: Family, individual_id: str, role: str) -> Finding:
+        '''Returns the finding for a family that identifies an individual (as husband, wife or child) who has no record'''
 
-            if family.id not in child_being_referenced.famc:
-                error_messages.append(self.US26_error_messages_for_family(family, child_being_referenced, 'child error'))
+        return Finding('US26', 'ERROR', (family.id, individual_id), (), 'ERROR: US26: Family {0} and Individual {1} show {2} inconsistency. {0} identifies {1} as {3}, but {1} does not exist',
+                       (family.id, individual_id, 'child' if role == 'child' else 'spouse', role))
 
-        return error_messages
+    def US26_finding_for_family(self, family: Family, individual_being_referenced: Individual, type_of_error: str) -> Finding:
+        '''Returns the appropriate spouse or child finding when inconsistencies are found in a family record'''
 
-    def US26_error_messages_for_family(self, family: Family, individual_being_referenced: Individual, type_of_error: str):
-        '''Returns the appropriate spouse or child error message when inconsistencies are found in a family record'''
+        record_ids: Tuple[str, str] = (family.id, individual_being_referenced.id)
+        arguments: Tuple[str, ...] = (family.id, individual_being_referenced.id, individual_being_referenced.name)
 
         if type_of_error == 'husband error':
             if len(individual_being_referenced.fams) == 0:
-                return f'ERROR: US26: Family {family.id} and Individual {individual_being_referenced.id}-{individual_being_referenced.name} show spouse inconsistency. {family.id} identifies {individual_being_referenced.id}-{individual_being_referenced.name} as husband, but {individual_being_referenced.id}-{individual_being_referenced.name} is not married'
+                return Finding('US26', 'ERROR', record_ids, (), 'ERROR: US26: Family {0} and Individual {1}-{2} show spouse inconsistency. {0} identifies {1}-{2} as husband, but {1}-{2} is not married', arguments)
             else:
-                return f'ERROR: US26: Family {family.id} and Individual {individual_being_referenced.id}-{individual_being_referenced.name} show spouse inconsistency. {family.id} identifies {individual_being_referenced.id}-{individual_being_referenced.name} as husband, but {individual_being_referenced.id}-{individual_being_referenced.name} is husband in {", ".join(individual_being_referenced.fams)}'
+                return Finding('US26', 'ERROR', record_ids, (), 'ERROR: US26: Family {0} and Individual {1}-{2} show spouse inconsistency. {0} identifies {1}-{2} as husband, but {1}-{2} is husband in {3}',
+                               arguments + (", ".join(sorted(individual_being_referenced.fams)),))
 
         if type_of_error == 'wife error':
             if len(individual_being_referenced.fams) == 0:
-                return f'ERROR: US26: Family {family.id} and Individual {individual_being_referenced.id}-{individual_being_referenced.name} show spouse inconsistency. {family.id} identifies {individual_being_referenced.id}-{individual_being_referenced.name} as wife, but {individual_being_referenced.id}-{individual_being_referenced.name} is not married' 
+                return Finding('US26', 'ERROR', record_ids, (), 'ERROR: US26: Family {0} and Individual {1}-{2} show spouse inconsistency. {0} identifies {1}-{2} as wife, but {1}-{2} is not married', arguments)
             else:    
-                return f'ERROR: US26: Family {family.id} and Individual {individual_being_referenced.id}-{individual_being_referenced.name} show spouse inconsistency. {family.id} identifies {individual_being_referenced.id}-{individual_being_referenced.name} as wife, but {individual_being_referenced.id}-{individual_being_referenced.name} is wife in {", ".join(individual_being_referenced.fams)}'
+                return Finding('US26', 'ERROR', record_ids, (), 'ERROR: US26: Family {0} and Individual {1}-{2} show spouse inconsistency. {0} identifies {1}-{2} as wife, but {1}-{2} is wife in {3}',
+                               arguments + (", ".join(sorted(individual_being_referenced.fams)),))
 
         if type_of_error == 'child error':
-            return f'ERROR: US26: Family {family.id} and Individual {individual_being_referenced.id}-{individual_being_referenced.name} show child inconsistency. {family.id} identifies {individual_being_referenced.id}-{individual_being_referenced.name} as child, but {individual_being_referenced.id}-{individual_being_referenced.name} is child in {", ".join(individual_being_referenced.famc)}'
+            return Finding('US26', 'ERROR', record_ids, (), 'ERROR: US26: Family {0} and Individual {1}-{2} show child inconsistency. {0} identifies {1}-{2} as child, but {1}-{2} is child in {3}',
+                           arguments + (", ".join(sorted(individual_being_referenced.famc)),))
 
     def US29_list_deceased_individuals(self) -> Dict[str, str]:
         '''Prints a prettytable that contains all deceased individuals'''
 
-        deceased_individuals: Dict[str, str] = defaultdict(dict) #key = individuals ID : value = {name:individuals name, death date:individual death date}
+        deceased_individuals: Dict[str, str] = dict() #key = individuals ID : value = {name:individuals name, death date:individual death date}
 
-        pretty_table_for_deceased_individuals: PrettyTable = PrettyTable(field_names = ['ID', 'Name', 'Date of Death'])
-
-        for individual_id, individual in self._individual_dt.items():
-            if individual.living == False:
-                deceased_individuals[individual_id]
-                deceased_individuals[individual_id]['name'] = individual.name
-                deceased_individuals[individual_id]['death date'] = individual.death_date
-                pretty_table_for_deceased_individuals.add_row([individual_id, individual.name, individual.death_date])
-        
-        print(f'\nUS29: All Deceased Individuals\n{pretty_table_for_deceased_individuals}')
+        for individual_id, name, death_date in self.US29_print_deceased_individuals():
+            deceased_individuals[individual_id] = {'name' : name, 'death date' : death_date}
 
         return deceased_individuals
 
+    def US29_print_deceased_individuals(self) -> Iterator[List[Any]]:
+        '''Prints a prettytable that contains all deceased individuals, and yields each row as it is added to the table. Only the caller keeps the rows, if it needs them'''
+
+        print('\nUS29: All Deceased Individuals')
+
+        with self.print_table(['ID', 'Name', 'Date of Death']) as pretty_table_for_deceased_individuals:
+            for individual_id, individual in self._individual_dt.items():
+                if individual.living == False:
+                    row: List[Any] = [individual_id, individual.name, individual.death_date]
+                    pretty_table_for_deceased_individuals.add_row(row)
+                    yield row
+
+
+def validate_gedcom(file_name: Optional[str] = None, gedcom_text: Optional[str] = None, stories: Optional[List[Story]] = None, max_generations: Optional[int] = None,
+                    encoding: Optional[str] = None) -> List[Dict[str, Any]]:
+    '''Validates a GEDCOM file, or the text of one, and returns the findings of its error and anomaly stories as dictionaries. Runs in the worker processes of ValidationServer'''
+
+    gedcom: GedcomFile = GedcomFile(max_generations = max_generations, encoding = encoding)
+
+    if file_name is not None:
+        gedcom.parse_file_streaming(file_name)
+    else:
+        gedcom.parse_entries(gedcom.stream_valid_entries(io.StringIO(gedcom_text, newline = None)))
+
+    gedcom.prepare_stories(GedcomFile._stories if stories is None else stories)
+    return [finding.as_dict() for finding in gedcom.collect_findings(stories = stories)]
+
+
+def expand_gedcom_paths(directory_or_pattern: str) -> List[str]:
+    '''Returns the GEDCOM files to validate in batch mode: every .ged file under a directory, or the files matching a glob pattern, sorted'''
+
+    if os.path.isdir(directory_or_pattern):
+        directory_or_pattern = os.path.join(directory_or_pattern, '**', '*.ged')
+
+    return sorted(file_name for file_name in glob.glob(directory_or_pattern, recursive = True) if os.path.isfile(file_name))
+
+
+def read_gedcom_text(file_name: str, encoding: Optional[str] = None) -> str:
+    '''Reads a whole GEDCOM file, the way parse_file_streaming() opens it'''
+
+    file: IO = open(file_name, encoding = encoding)
+
+    with file:
+        return file.read()
+
+
+async def validate_files(file_names: Iterable[str], workers: int = 1, stories: Optional[List[Story]] = None, file: Optional[IO[str]] = None,
+                         max_generations: Optional[int] = None, encoding: Optional[str] = None) -> Dict[str, Any]:
+    '''Validates many GEDCOM files. The files are read on a thread pool and validated on a pool of worker processes, with a few files read ahead of the workers.
+        Writes one JSON object per file, with its path and its findings (or the error that stopped it), in the order the files finish.
+        Returns a summary of the batch: number of files, failed files, errors, anomalies, seconds and files per second
+    '''
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+    in_flight: asyncio.Semaphore = asyncio.Semaphore(workers * 4) #files read or validated at the same time
+    summary: Dict[str, Any] = { 'files' : 0, 'failed' : 0, 'errors' : 0, 'anomalies' : 0 }
+    start: float = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers = workers, mp_context = context) as executor:
+
+        async def validate_file(file_name: str) -> None:
+            '''Reads, validates and reports one file'''
+
+            result: Dict[str, Any] = { 'path' : file_name }
+
+            try:
+                text: str = await loop.run_in_executor(None, read_gedcom_text, file_name, encoding)
+                result['findings'] = await loop.run_in_executor(executor, validate_gedcom, None, text, stories, max_generations)
+            except Exception as error:
+                # Only this file fails, not the batch
+                result['error'] = f'{type(error).__name__}: {error}'
+                summary['failed'] += 1
+            else:
+                for finding in result['findings']:
+                    summary['errors' if finding['severity'] == 'ERROR' else 'anomalies'] += 1
+            finally:
+                in_flight.release()
+
+            summary['files'] += 1
+            print(json.dumps(result), file = file)
+
+        tasks: List[asyncio.Task] = list()
+        for file_name in file_names:
+            # Wait for a free slot before reading the next file, so a large batch is not read into memory all at once
+            await in_flight.acquire()
+            tasks.append(asyncio.create_task(validate_file(file_name)))
+
+        await asyncio.gather(*tasks)
+
+    summary['seconds'] = time.perf_counter() - start
+    summary['files_per_second'] = summary['files'] / summary['seconds'] if summary['seconds'] > 0 else 0.0
+    return summary
+
+
+class ValidationServer(ThreadingHTTPServer):
+    '''class ValidationServer
+        Local HTTP server that validates GEDCOM files on a pool of worker processes, so a batch of files does not pay for starting Python once per file.
+        POST /validate takes a JSON object with either a "path" to a GEDCOM file or its "gedcom" text, or a list of such objects under "files",
+        and optional "stories" and "categories" lists as in --story and --category. At most queue_size files are validated or waiting at any time; beyond that, requests get a 503.
+        Requests larger than max_request_size bytes get a 413 before their body is read.
+        Every file is validated with the max_generations of the server, as in --max-generations, and the files are read with its encoding, as in --encoding
+    '''
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], workers: int = 1, queue_size: int = 64, max_generations: Optional[int] = None, encoding: Optional[str] = None,
+                 max_request_size: int = 64 << 20) -> None:
+        '''Binds the server to a (host, port) address and starts the worker pool'''
+
+        super().__init__(address, ValidationRequestHandler)
+
+        context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+        self.executor: ProcessPoolExecutor = ProcessPoolExecutor(max_workers = workers, mp_context = context)
+        self.queue_size: int = queue_size
+        self.queue_slots: threading.BoundedSemaphore = threading.BoundedSemaphore(queue_size)
+        self.pending: Set[Future] = set() #validations queued or running
+        self.pending_lock: threading.Lock = threading.Lock()
+        self.validated: int = 0 #files validated so far, successfully or not
+        self.max_generations: Optional[int] = max_generations
+        self.encoding: Optional[str] = encoding
+        self.max_request_size: int = max_request_size #bytes
+
+    def server_close(self) -> None:
+        '''Closes the socket and stops the worker pool, cancelling the validations that have not started'''
+
+        super().server_close()
+
+        # Cancelling runs the done callbacks, which take the lock, so the futures are cancelled outside of it
+        with self.pending_lock:
+            pending: List[Future] = list(self.pending)
+        for future in pending:
+            future.cancel()
+        self.executor.shutdown()
+
+    def submit(self, job: Dict[str, Any], stories: Optional[List[Story]]) -> Future:
+        '''Queues the validation of one file. Call only while holding one of the queue slots; it is given back when the validation is done'''
+
+        future: Future = self.executor.submit(validate_gedcom, job.get('path'), job.get('gedcom'), stories, self.max_generations, self.encoding)
+        with self.pending_lock:
+            self.pending.add(future)
+        future.add_done_callback(self.finish)
+        return future
+
+    def finish(self, future: Future) -> None:
+        '''Gives back the queue slot of a validation that is done or cancelled'''
+
+        with self.pending_lock:
+            self.pending.discard(future)
+            if not future.cancelled():
+                self.validated += 1
+        self.queue_slots.release()
+
+
+class ValidationRequestHandler(BaseHTTPRequestHandler):
+    '''class ValidationRequestHandler
+        Handles the JSON requests of a ValidationServer
+    '''
+
+    def do_POST(self) -> None:
+        '''Validates the files of a request and replies with their findings'''
+
+        if self.path != '/validate':
+            self.send_json(404, { 'error' : f'Unknown path {self.path}' })
+            return
+
+        length: str = self.headers.get('Content-Length', '0').strip()
+        if not length.isdigit():
+            self.send_json(400, { 'error' : 'Content-Length must be a number of bytes' })
+            return
+
+        # Turn a large request away before reading it. Its body is not read, so the connection can not be used again.
+        if int(length) > self.server.max_request_size:
+            self.close_connection = True
+            self.send_json(413, { 'error' : f'Requests can be at most {self.server.max_request_size} bytes' })
+            return
+
+        try:
+            request: Any = json.loads(self.rfile.read(int(length)))
+            if type(request) != dict:
+                raise ValueError('The request must be a JSON object')
+
+            jobs: List[Dict[str, Any]] = request['files'] if 'files' in request else [request]
+            if type(jobs) != list or not all(type(job) == dict and (type(job.get('path')) == str or type(job.get('gedcom')) == str) for job in jobs):
+                raise ValueError('Each file needs a "path" or a "gedcom" string')
+
+            for name in ('stories', 'categories'):
+                if request.get(name) is not None and (type(request[name]) != list or not all(type(value) == str for value in request[name])):
+                    raise ValueError(f'"{name}" must be a list of strings')
+
+            stories: Optional[List[Story]] = None
+            if 'stories' in request or 'categories' in request:
+                stories = GedcomFile.select_stories(request.get('stories'), request.get('categories'))
+        except (ValueError, TypeError) as error:
+            self.send_json(400, { 'error' : str(error) })
+            return
+
+        if len(jobs) > self.server.queue_size:
+            self.send_json(413, { 'error' : f'At most {self.server.queue_size} files can be sent at once' })
+            return
+
+        # Take a queue slot for every file, or turn the whole request away if the queue is full
+        taken: int = 0
+        while taken < len(jobs) and self.server.queue_slots.acquire(blocking = False):
+            taken += 1
+
+        if taken < len(jobs):
+            for _ in range(taken):
+                self.server.queue_slots.release()
+            self.send_json(503, { 'error' : 'The validation queue is full, try again later' })
+            return
+
+        futures: List[Future] = [self.server.submit(job, stories) for job in jobs]
+        results: List[Dict[str, Any]] = list()
+
+        for job, future in zip(jobs, futures):
+            result: Dict[str, Any] = { 'path' : job['path'] } if 'path' in job else dict()
+            try:
+                result['findings'] = future.result()
+            except Exception as error:
+                # e.g. a missing file, or a family that refers to a missing individual. Only this file fails, not the server.
+                result['error'] = f'{type(error).__name__}: {error}'
+            results.append(result)
+
+        self.send_json(200, { 'results' : results } if 'files' in request else results[0])
+
+    def send_json(self, status: int, body: Dict[str, Any]) -> None:
+        '''Sends a JSON reply'''
+
+        payload: bytes = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        '''Keeps the request log quiet, as thousands of files may go through the server'''
+        pass
+
 
 def main() -> None:
     '''Runs main program'''
 
-    # If the caller included the gedcom file as a parameter, accept it!
-    # otherwise, prompt the user for it.
-    if len(sys.argv) < 2:
-        file_name: str = input('Enter GEDCOM file name: ')
-    else:
-        file_name = sys.argv[1]
-    
-    gedcom: GedcomFile = GedcomFile()
-    gedcom.read_file(file_name)
-    gedcom.validate_tags_for_output()
-    
-    gedcom.update_validated_list()
-    gedcom.parse_validated_gedcom()
-    gedcom.family_set_spouse_names()
-    
-    gedcom.print_individuals_pretty()
-    gedcom.print_family_pretty()
-
-
-    #Sprint 1
-    gedcom.US34_list_large_age_differences()
-    gedcom.US35_list_recent_births()
-    gedcom.US4_Marriage_before_divorce()
-    gedcom.US21_correct_gender_for_role()
-    gedcom.parse_individuals_based_on_living_and_marital_details() #US30
-    gedcom.list_individuals_living_and_married() #US30
-    gedcom.list_individuals_living_over_thirty_never_married() #US31
-    gedcom.US03_birth_death()
-    gedcom.US06_divorce_before_death()
-
-    #Sprint 2
-    gedcom.US2_birth_before_marriage()
-    gedcom.US5_marriage_before_death()
-    gedcom.US07_Death150()
-    gedcom.US12_Mother_Father_older()
-    gedcom.US28_list_all_siblings_from_oldest_to_youngest()
-    gedcom.US36_list_recent_deaths()
-    gedcom.US37_list_recent_survivors()
-    # Note: US27 included in Individuals Table
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Validates a GEDCOM file')
+    parser.add_argument('file_name', nargs='?', help='GEDCOM file to validate')
+    parser.add_argument('--quiet', action='store_true', help='only report the errors and anomalies, without the tables and lists')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes parsing the file, and of workers running the error and anomaly stories in --quiet mode')
+    parser.add_argument('--threads', action='store_true', help='run the workers on a thread pool instead of a process pool')
+    parser.add_argument('--mmap', action='store_true', help='parse the memory-mapped file, decoding only the values the records use')
+    parser.add_argument('--snapshot', help='snapshot file of the parsed records. Used instead of parsing while the GEDCOM file is unchanged, and rewritten otherwise')
+    parser.add_argument('--incremental', action='store_true', help='with --snapshot, only validate again the records that changed since the snapshot was saved, and report the errors and anomalies as in --quiet mode')
+    parser.add_argument('--watch', action='store_true', help='keep running, and report the errors and anomalies that are new or resolved every time the file is saved')
+    parser.add_argument('--interval', type=float, default=0.2, help='seconds between two checks of the file in --watch mode')
+    parser.add_argument('--serve', action='store_true', help='run a local validation server instead of validating one file, see ValidationServer')
+    parser.add_argument('--host', default='127.0.0.1', help='address the --serve server listens on')
+    parser.add_argument('--port', type=int, default=8555, help='port the --serve server listens on')
+    parser.add_argument('--queue', type=int, default=64, help='number of files the --serve server validates or keeps waiting at most')
+    parser.add_argument('--max-request-size', type=int, default=64 << 20, help='bytes a request to the --serve server can have at most')
+    parser.add_argument('--batch', help='validate every .ged file in this directory, or every file matching this glob pattern, on --workers worker processes. Writes one JSON line per file and a summary')
+    parser.add_argument('--profile', action='store_true', help='measure the wall time, CPU time, peak memory and item counts of every stage and story, and print them to stderr as a table')
+    parser.add_argument('--profile-json', help='measure every stage and story as --profile does, and write the measurements to this JSON file')
+    parser.add_argument('--profile-method', action='append', help='profile every call of the methods of this story (e.g. US23), or of this GedcomFile method, in depth. May be repeated. Run with --workers 1 so the calls are made in this process')
+    parser.add_argument('--profile-dir', default='profiles', help='directory the .pstats files and allocation reports of --profile-method are written to')
+    parser.add_argument('--profile-with', choices=['cprofile', 'tracemalloc', 'both'], default='both', help='profile the --profile-method calls with cProfile, tracemalloc, or both')
+    parser.add_argument('--stream-tables', action='store_true', help='print the People, Families, US28 and US29 listings as their rows are made, in chunks of --table-chunk rows, instead of all at once')
+    parser.add_argument('--table-chunk', type=int, default=1000, help='rows per chunk with --stream-tables. The column widths come from the first chunk, and only grow when a later row is wider')
+    parser.add_argument('--page-tables', action='store_true', help='with --stream-tables, print every chunk as a page with its own header')
+    parser.add_argument('--format', choices=['text', *_record_writers], default='text', help='write the People and Families tables and the findings as JSON Lines, CSV files or columnar arrays (see ColumnarWriter) instead of text')
+    parser.add_argument('--output', default='-', help='file the jsonl --format is written to (stdout by default), or directory the csv and columnar formats are written to')
+    parser.add_argument('--check', action='store_true', help='only run the error stories and print their findings, without any tables or lists. Exits with status 1 if there is any error')
+    parser.add_argument('--max-findings', type=int, help='in --check mode, stop after this many errors')
+    parser.add_argument('--max-generations', type=int, help='make US19 report every couple sharing an ancestor at most this many generations up, and how they are related, instead of first cousins only')
+    parser.add_argument('--encoding', help="text encoding of the GEDCOM files, e.g. latin-1. The locale's encoding by default")
+    parser.add_argument('--story', action='append', help='run only this story, e.g. US03. May be repeated')
+    parser.add_argument('--category', action='append', choices=GedcomFile._story_categories, help='run only the stories in this category. May be repeated')
+    args: argparse.Namespace = parser.parse_args()
+
+    try:
+        stories: List[Story] = GedcomFile.select_stories(args.story, args.category)
+    except ValueError as error:
+        parser.error(str(error))
+
+    try:
+        profiled_methods: List[str] = GedcomFile.profiled_methods(args.profile_method or ())
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.check:
+        # Only the data the error stories need is prepared
+        stories = [story for story in stories if story.category == 'error']
+
+    if args.max_findings is not None and args.max_findings < 1:
+        parser.error('--max-findings must be at least 1')
+
+    if args.max_generations is not None and args.max_generations < 1:
+        parser.error('--max-generations must be at least 1')
+
+    if args.encoding is not None:
+        try:
+            codecs.lookup(args.encoding)
+        except LookupError:
+            parser.error(f'unknown --encoding {args.encoding}')
+
+    if args.format in ('csv', 'columnar') and args.output == '-':
+        parser.error(f'--format {args.format} needs an --output directory')
+
+    if args.incremental and not args.snapshot:
+        parser.error('--incremental needs a --snapshot file')
+
+    profiler: Optional[Profiler] = Profiler() if args.profile or args.profile_json else None
+    profile_stage: Callable[[str], ContextManager[Dict[str, int]]] = profiler.stage if profiler is not None else lambda name: contextlib.nullcontext(dict())
+    exit_status: int = 0
+
+    # Every mode writes its profile, including when it is stopped
+    try:
+        if args.serve:
+            server: ValidationServer = ValidationServer((args.host, args.port), args.workers, args.queue, args.max_generations, args.encoding,
+                                                          args.max_request_size)
+            print(f'Validating GEDCOM files on http://{args.host}:{server.server_address[1]}/validate with {args.workers} workers')
+            sys.stdout.flush()
+
+            with server, profile_stage('serve') as counts:
+                try:
+                    server.serve_forever()
+                except KeyboardInterrupt:
+                    pass
+                counts['files'] = server.validated
+            return
+
+        if args.batch:
+            with profile_stage('batch') as counts:
+                summary: Dict[str, Any] = asyncio.run(validate_files(expand_gedcom_paths(args.batch), args.workers, stories, max_generations = args.max_generations,
+                                                                        encoding = args.encoding))
+                counts.update((name, summary[name]) for name in ('files', 'failed', 'errors', 'anomalies'))
+            print(f"Validated {summary['files']} files ({summary['failed']} failed): {summary['errors']} errors and {summary['anomalies']} anomalies "
+                  f"in {summary['seconds']:.2f}s, {summary['files_per_second']:.1f} files/sec", file = sys.stderr)
+            return
+
+        # If the caller included the gedcom file as a parameter, accept it!
+        # otherwise, prompt the user for it.
+        file_name: str = args.file_name if args.file_name else input('Enter GEDCOM file name: ')
+
+        table_options: Optional[Dict[str, Any]] = { 'chunk_size' : args.table_chunk, 'paged' : args.page_tables } if args.stream_tables else None
+        gedcom: GedcomFile = GedcomFile(profiler, table_options, args.max_generations, args.encoding)
+
+        if profiled_methods:
+            method_profiler: MethodProfiler = MethodProfiler(args.profile_dir, args.profile_with != 'tracemalloc', args.profile_with != 'cprofile')
+            method_profiler.attach(gedcom, profiled_methods)
+
+        if args.incremental:
+            # Compare the file with the records and findings of the last run, whatever changed since
+            with gedcom.profile_stage('load snapshot'):
+                gedcom.load_snapshot(args.snapshot)
+            findings: List[Finding] = gedcom.revalidate_file(file_name, stories)
+            with gedcom.profile_stage('save snapshot'):
+                gedcom.save_snapshot(args.snapshot, file_name)
+            with gedcom.profile_stage('render findings') as counts:
+                counts['findings'] = render_findings(findings)
+            return
+
+        if args.watch:
+            # Start from the last snapshot, if any, and save the model when the watch is stopped
+            if args.snapshot:
+                with gedcom.profile_stage('load snapshot'):
+                    gedcom.load_snapshot(args.snapshot)
 
-    
-    # Sprint 03
-    gedcom.US32_list_multiple_births()
-    gedcom.US33_list_orphans()
-    gedcom.US19_married_first_cousins()
-    gedcom.US22_uni_ids_indi_fam()
-    gedcom.US23_uni_name_birth()
-    gedcom.US24_unique_families_by_spouses()
-    gedcom.US25_unique_first_names_in_families()
-    gedcom.US16_male()
-
-    # Sprint 04
-    gedcom.US01_dates_b4_current()
-    gedcom.US17_no_marraige_2_children()
-    gedcom.US38_print_upcoming_birthdays()
-    gedcom.US39_print_upcoming_anniversaries()
-    gedcom.US14_multiple_births()
-    gedcom.US15_siblings15()
-    gedcom.US26_corresponding_entries_individuals()
-    gedcom.US26_corresponding_entries_families()
-    gedcom.US29_list_deceased_individuals()
+            try:
+                for new_findings, resolved_findings in gedcom.watch_file(file_name, stories, args.interval):
+                    for finding in new_findings:
+                        print(f'+ {finding.render()}')
+                    for finding in resolved_findings:
+                        print(f'- {finding.render()}')
+                    sys.stdout.flush()
+            except KeyboardInterrupt:
+                pass
+
+            if args.snapshot:
+                with gedcom.profile_stage('save snapshot'):
+                    gedcom.save_snapshot(args.snapshot, file_name)
+            return
+
+        # A snapshot of the unchanged file saves parsing it again
+        loaded: bool = False
+        if args.snapshot:
+            with gedcom.profile_stage('load snapshot'):
+                loaded = gedcom.load_snapshot(args.snapshot, file_name)
+
+        if not loaded:
+            with gedcom.profile_stage('parse') as counts:
+                if args.mmap:
+                    gedcom.parse_file_mapped(file_name)
+                else:
+                    gedcom.parse_file_sharded(file_name, args.workers)
+
+            if profiler is not None:
+                # Counted after the stage, so counting does not add to its time
+                counts['lines'] = count_lines(file_name)
+                counts['individuals'] = len(gedcom._individual_dt) + len(gedcom._list_of_duplicate_individual_ids)
+                counts['families'] = len(gedcom._family_dt) + len(gedcom._list_of_duplicate_family_ids)
+
+            if args.snapshot:
+                with gedcom.profile_stage('save snapshot'):
+                    gedcom.save_snapshot(args.snapshot, file_name)
+        gedcom.prepare_stories(stories)
+
+        if args.check:
+            findings: List[Finding] = gedcom.check_findings(stories, args.max_findings)
+            with gedcom.profile_stage('render findings') as counts:
+                counts['findings'] = render_findings(findings)
+            exit_status = 1 if findings else 0
+        elif args.format != 'text':
+            with gedcom.profile_stage(f'export {args.format}') as counts, _record_writers[args.format](args.output) as writer:
+                counts.update(gedcom.export_records(writer, stories, args.workers, args.threads))
+        elif args.quiet:
+            # Validate silently, then render all the findings at once
+            findings: List[Finding] = gedcom.collect_findings(args.workers, args.threads, stories)
+            with gedcom.profile_stage('render findings') as counts:
+                counts['findings'] = render_findings(findings)
+        else:
+            gedcom.run_stories(stories)
+    finally:
+        if args.profile:
+            sys.stdout.flush()
+            print(profiler.summary_table(), file = sys.stderr)
+
+        if args.profile_json:
+            with open(args.profile_json, 'w') as file:
+                json.dump(profiler.as_dict(), file, indent = 2)
+
+    if exit_status:
+        sys.exit(exit_status)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,405 @@
+'''Benchmarks for the GEDCOM parser and validator
+
+Usage: python benchmark.py [--lines N]
+       python benchmark.py --people 1000 10000 100000 [--output results.json] [--baseline baseline.json]
+       python benchmark.py --parse-file file.ged [--repeats N]
+'''
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import argparse
+import contextlib
+import datetime
+import gc
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from SSW555_Group_Project import GedcomFile, decode_gedcom_date, render_findings
+
+_month_names: List[str] = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+
+
+def strptime_date_decoder(date_in_gedcom_format: str) -> datetime.date:
+    '''Decodes a GEDCOM date the way Individual and Family used to: split the string and call strptime() for the month'''
+
+    day, month, year = date_in_gedcom_format.split(" ")
+    day: int = int(day)
+    year: int = int(year)
+    month: int = datetime.datetime.strptime(month, '%b').month
+    return datetime.date(year, month, day)
+
+
+def generate_date_lines(number_of_lines: int, seed: int = 555) -> List[str]:
+    '''Generates DATE arguments spread over 200 years, so dates repeat the way they do in a large family tree'''
+
+    generator: random.Random = random.Random(seed)
+    first_day: int = datetime.date(1820, 1, 1).toordinal()
+    last_day: int = datetime.date(2020, 12, 31).toordinal()
+
+    lines: List[str] = list()
+    for _ in range(number_of_lines):
+        date: datetime.date = datetime.date.fromordinal(generator.randint(first_day, last_day))
+        lines.append(f'{date.day} {date.strftime("%b").upper()} {date.year}')
+    return lines
+
+
+def benchmark_date_decoding(number_of_lines: int) -> None:
+    '''Times the strptime() based date decoding against decode_gedcom_date() on the same DATE arguments'''
+
+    lines: List[str] = generate_date_lines(number_of_lines)
+    decode_gedcom_date.cache_clear()
+
+    start: float = time.perf_counter()
+    expected: List[datetime.date] = [strptime_date_decoder(line) for line in lines]
+    strptime_seconds: float = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual: List[datetime.date] = [decode_gedcom_date(line) for line in lines]
+    decoder_seconds: float = time.perf_counter() - start
+
+    if expected != actual:
+        raise AssertionError('decode_gedcom_date() and strptime() disagree')
+
+    print(f'DATE lines decoded:     {number_of_lines}')
+    print(f'strptime():             {strptime_seconds:.3f}s')
+    print(f'decode_gedcom_date():   {decoder_seconds:.3f}s ({decode_gedcom_date.cache_info().currsize} distinct dates cached)')
+    print(f'Speedup:                {strptime_seconds / decoder_seconds:.1f}x')
+
+
+def gedcom_date(date: datetime.date) -> str:
+    '''Formats a date the way GEDCOM files write it, e.g. 7 MAR 1950'''
+
+    return f'{date.day} {_month_names[date.month - 1]} {date.year}'
+
+
+def random_date(generator: random.Random, year: int) -> datetime.date:
+    '''Returns a random day of a year'''
+
+    return datetime.date(year, generator.randint(1, 12), generator.randint(1, 28))
+
+
+def generate_gedcom(number_of_individuals: int, depth: int = 6, fertility: float = 2.5, divorce_rate: float = 0.1,
+                    anomaly_rate: float = 0.01, seed: int = 555) -> Iterator[str]:
+    '''Generator that yields the lines of a synthetic GEDCOM file with number_of_individuals individuals.
+        Founders marry, have children, and their children marry in turn for up to depth generations, then a new family tree is started.
+        fertility is the average number of children per family, divorce_rate the share of families that divorce, and anomaly_rate the share of individuals
+        and families given an error or anomaly on purpose (death before birth, future dates, divorce before marriage, ...).
+        Only two generations are kept in memory, so files with millions of individuals can be written
+    '''
+
+    generator: random.Random = random.Random(seed)
+    this_year: int = datetime.date.today().year
+    founders_born: int = this_year - 30 * depth - 10 #founders are born about 30 years per generation before the youngest generation
+    remaining: int = number_of_individuals
+    next_individual: int = 0
+    next_family: int = 0
+
+    yield '0 HEAD'
+
+    while remaining > 0:
+        # Start a new family tree with a cohort of founders
+        cohort: int = min(remaining, max(2, number_of_individuals // max(1, int(fertility ** depth))), 1000)
+        generation: List[Dict[str, Any]] = list()
+
+        for _ in range(cohort):
+            generation.append({ 'id' : f'@I{next_individual}@', 'sex' : generator.choice('MF'), 'surname' : f'Name{generator.randrange(5000)}',
+                                'birth' : random_date(generator, founders_born + generator.randint(-10, 10)), 'famc' : None, 'fams' : list() })
+            next_individual += 1
+        remaining -= cohort
+
+        for _ in range(depth):
+            males: List[Dict[str, Any]] = [person for person in generation if person['sex'] == 'M']
+            females: List[Dict[str, Any]] = [person for person in generation if person['sex'] == 'F']
+            generator.shuffle(males)
+            generator.shuffle(females)
+
+            families: List[Dict[str, Any]] = list()
+            children: List[Dict[str, Any]] = list()
+
+            for husband, wife in zip(males, females):
+                if generator.random() > 0.8:
+                    # Stays single
+                    continue
+
+                married: datetime.date = random_date(generator, max(husband['birth'].year, wife['birth'].year) + generator.randint(18, 35))
+                if married.year >= this_year:
+                    # Too young to have married yet
+                    continue
+
+                family: Dict[str, Any] = { 'id' : f'@F{next_family}@', 'husband' : husband, 'wife' : wife, 'children' : list(), 'married' : married }
+                next_family += 1
+                husband['fams'].append(family['id'])
+                wife['fams'].append(family['id'])
+
+                if generator.random() < divorce_rate:
+                    divorced: datetime.date = random_date(generator, married.year + generator.randint(1, 20))
+                    if divorced.year < this_year:
+                        family['divorced'] = divorced
+
+                # Poisson-like number of children around fertility, none of them born in the future
+                number_of_children: int = min(remaining, sum(generator.random() < fertility / 10 for _ in range(10)))
+                births: List[int] = [year for year in (married.year + generator.randint(1, 20) for _ in range(number_of_children)) if year < this_year]
+
+                for year in births:
+                    child: Dict[str, Any] = { 'id' : f'@I{next_individual}@', 'sex' : generator.choice('MF'), 'surname' : husband['surname'],
+                                              'birth' : random_date(generator, year), 'famc' : family['id'], 'fams' : list() }
+                    next_individual += 1
+                    family['children'].append(child)
+                    children.append(child)
+                remaining -= len(births)
+                families.append(family)
+
+            yield from generate_individual_records(generation, generator, anomaly_rate, this_year)
+            yield from generate_family_records(families, generator, anomaly_rate, this_year)
+
+            generation = children
+            if not generation:
+                break
+
+        # The last generation has no families of its own
+        yield from generate_individual_records(generation, generator, anomaly_rate, this_year)
+
+    yield '0 TRLR'
+
+
+def generate_individual_records(people: List[Dict[str, Any]], generator: random.Random, anomaly_rate: float, this_year: int) -> Iterator[str]:
+    '''Yields the INDI records of generated individuals, giving some of them an anomaly'''
+
+    for person in people:
+        birth: datetime.date = person['birth']
+        death: Optional[datetime.date] = None
+        lifespan: int = generator.randint(60, 95)
+
+        if birth.year + lifespan < this_year:
+            death = random_date(generator, birth.year + lifespan)
+
+        if generator.random() < anomaly_rate:
+            anomaly: str = generator.choice(['death before birth', 'future birth', 'too old'])
+            if anomaly == 'death before birth':
+                death = random_date(generator, birth.year - 1)
+            elif anomaly == 'future birth':
+                birth = random_date(generator, this_year + 5)
+            else:
+                birth, death = random_date(generator, this_year - 160), None
+
+        yield f"0 {person['id']} INDI"
+        yield f"1 NAME Given{generator.randrange(2000)} /{person['surname']}/"
+        yield f"1 SEX {person['sex']}"
+        yield '1 BIRT'
+        yield f'2 DATE {gedcom_date(birth)}'
+        if death is not None:
+            yield '1 DEAT Y'
+            yield f'2 DATE {gedcom_date(death)}'
+        if person['famc'] is not None:
+            yield f"1 FAMC {person['famc']}"
+        for family_id in person['fams']:
+            yield f'1 FAMS {family_id}'
+
+
+def generate_family_records(families: List[Dict[str, Any]], generator: random.Random, anomaly_rate: float, this_year: int) -> Iterator[str]:
+    '''Yields the FAM records of generated families, giving some of them an anomaly'''
+
+    for family in families:
+        married: datetime.date = family['married']
+        divorced: Optional[datetime.date] = family.get('divorced')
+
+        if generator.random() < anomaly_rate:
+            anomaly: str = generator.choice(['divorce before marriage', 'marriage before birth', 'future marriage'])
+            if anomaly == 'divorce before marriage':
+                divorced = random_date(generator, married.year - 1)
+            elif anomaly == 'marriage before birth':
+                married = random_date(generator, family['husband']['birth'].year - 1)
+            else:
+                married = random_date(generator, this_year + 5)
+
+        yield f"0 {family['id']} FAM"
+        yield f"1 HUSB {family['husband']['id']}"
+        yield f"1 WIFE {family['wife']['id']}"
+        for child in family['children']:
+            yield f"1 CHIL {child['id']}"
+        yield '1 MARR'
+        yield f'2 DATE {gedcom_date(married)}'
+        if divorced is not None:
+            yield '1 DIV'
+            yield f'2 DATE {gedcom_date(divorced)}'
+
+
+def write_gedcom(file_name: str, lines: Iterator[str]) -> int:
+    '''Writes generated lines to a GEDCOM file. Returns the number of lines written'''
+
+    count: int = 0
+
+    with open(file_name, 'w') as file:
+        for line in lines:
+            file.write(line)
+            file.write('\n')
+            count += 1
+
+    return count
+
+
+def timed(stage: Callable[[], Any]) -> float:
+    '''Runs a stage with its printed output thrown away, and returns how many seconds it took'''
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start: float = time.perf_counter()
+        stage()
+        return time.perf_counter() - start
+
+
+def benchmark_stages(file_name: str) -> Dict[str, float]:
+    '''Times each stage of validating a GEDCOM file the way main() used to: read, validate tags, parse, build the data the stories need,
+        the findings of every error and anomaly story, rendering them, and every report (tables, lists and the printing story methods).
+        Returns the seconds of each stage
+    '''
+
+    gedcom: GedcomFile = GedcomFile()
+    seconds: Dict[str, float] = dict()
+
+    seconds['read'] = timed(lambda: gedcom.read_file(file_name))
+    seconds['validate tags'] = timed(gedcom.validate_tags_for_output)
+    seconds['parse'] = timed(lambda: (gedcom.update_validated_list(), gedcom.parse_validated_gedcom()))
+
+    for dependency, builder in GedcomFile._dependency_builders.items():
+        seconds[f'prepare {dependency}'] = timed(getattr(gedcom, builder))
+
+    findings: List[Any] = list()
+    for story in GedcomFile._stories:
+        if story.findings:
+            seconds[f'{story.id} {story.findings}'] = timed(lambda: findings.extend(getattr(gedcom, story.findings)()))
+
+    seconds['render findings'] = timed(lambda: render_findings(findings))
+
+    for story in GedcomFile._stories:
+        seconds[f'{story.id} {story.method}'] = timed(getattr(gedcom, story.method))
+
+    return seconds
+
+
+def benchmark_parsers(file_name: str, repeats: int = 3) -> Dict[str, Dict[str, float]]:
+    '''Compares the text reader (parse_file_streaming) with the memory-mapped reader (parse_file_mapped) on a GEDCOM file.
+        The parsers take turns, so both see the same machine load. Returns the fastest of the repeated runs of each parser, in seconds,
+        and the peak memory traced while it parses and the garbage collections it triggers, measured in one more run
+    '''
+
+    parsers: Dict[str, str] = { 'streaming' : 'parse_file_streaming', 'mapped' : 'parse_file_mapped' }
+    results: Dict[str, Dict[str, float]] = { parser : { 'seconds' : float('inf') } for parser in parsers }
+
+    for _ in range(repeats):
+        for parser, method in parsers.items():
+            gc.collect()
+            results[parser]['seconds'] = min(results[parser]['seconds'], timed(lambda: getattr(GedcomFile(), method)(file_name)))
+
+    for parser, method in parsers.items():
+        gc.collect()
+        collections: int = sum(generation['collections'] for generation in gc.get_stats())
+        tracemalloc.start()
+        getattr(GedcomFile(), method)(file_name)
+        results[parser]['peak_kb'] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+        results[parser]['collections'] = sum(generation['collections'] for generation in gc.get_stats()) - collections
+
+    return results
+
+
+def print_parsers(results: Dict[str, Dict[str, float]]) -> None:
+    '''Prints the results of benchmark_parsers()'''
+
+    for parser, result in results.items():
+        print(f"    parse {parser:<10} {result['seconds']:.3f}s, peak {result['peak_kb'] / 1024:.1f} MB, {result['collections']} collections")
+
+
+def compare_results(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, minimum_seconds: float = 0.05) -> List[str]:
+    '''Compares benchmark results with earlier ones for the same numbers of individuals.
+        Returns a message for each stage more than tolerance times slower than in the baseline. Stages that took less than minimum_seconds are too noisy to compare
+    '''
+
+    regressions: List[str] = list()
+    baseline_runs: Dict[int, Dict[str, float]] = { run['people'] : run['seconds'] for run in baseline['runs'] }
+
+    for run in results['runs']:
+        for stage, seconds in run['seconds'].items():
+            before: Optional[float] = baseline_runs.get(run['people'], {}).get(stage)
+
+            if before is not None and max(seconds, before) >= minimum_seconds and seconds > before * tolerance:
+                regressions.append(f"{run['people']} people: {stage} took {seconds:.3f}s, was {before:.3f}s")
+
+    return regressions
+
+
+def benchmark_sizes(sizes: List[int], depth: int, fertility: float, divorce_rate: float, anomaly_rate: float, seed: int) -> Dict[str, Any]:
+    '''Generates a GEDCOM file for each number of individuals, times its stages and prints the slowest ones. Returns the results in a form that can be saved as JSON'''
+
+    results: Dict[str, Any] = { 'created' : datetime.datetime.now().isoformat(timespec = 'seconds'), 'python' : platform.python_version(), 'platform' : platform.platform(),
+                                'settings' : { 'depth' : depth, 'fertility' : fertility, 'divorce_rate' : divorce_rate, 'anomaly_rate' : anomaly_rate, 'seed' : seed },
+                                'runs' : list() }
+
+    with tempfile.TemporaryDirectory() as directory:
+        for people in sizes:
+            file_name: str = os.path.join(directory, f'synthetic_{people}.ged')
+            lines: int = write_gedcom(file_name, generate_gedcom(people, depth, fertility, divorce_rate, anomaly_rate, seed))
+            seconds: Dict[str, float] = benchmark_stages(file_name)
+            parsers: Dict[str, Dict[str, float]] = benchmark_parsers(file_name)
+            os.remove(file_name)
+
+            total_seconds: float = sum(seconds.values())
+
+            # The parsers are compared with the baseline like any other stage, but are not part of the total
+            seconds.update((f'parse {parser}', result['seconds']) for parser, result in parsers.items())
+            results['runs'].append({ 'people' : people, 'lines' : lines, 'total_seconds' : total_seconds, 'seconds' : seconds, 'parsers' : parsers })
+
+            print(f'{people} people, {lines} lines: {total_seconds:.2f}s')
+            for stage, stage_seconds in sorted(seconds.items(), key = lambda item: item[1], reverse = True)[:5]:
+                print(f'    {stage:<60} {stage_seconds:.3f}s')
+            print_parsers(parsers)
+
+    return results
+
+
+def main() -> None:
+    '''Runs the benchmarks'''
+
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='GEDCOM parser benchmarks')
+    parser.add_argument('--lines', type=int, default=1000000, help='number of DATE lines to decode')
+    parser.add_argument('--people', type=int, nargs='+', help='time every stage on synthetic GEDCOM files with these numbers of individuals, e.g. 1000 10000 100000')
+    parser.add_argument('--depth', type=int, default=6, help='generations in each synthetic family tree')
+    parser.add_argument('--fertility', type=float, default=2.5, help='average number of children per synthetic family')
+    parser.add_argument('--divorce-rate', type=float, default=0.1, help='share of synthetic families that divorce')
+    parser.add_argument('--anomaly-rate', type=float, default=0.01, help='share of synthetic individuals and families given an error or anomaly')
+    parser.add_argument('--seed', type=int, default=555, help='seed of the synthetic GEDCOM generator')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON file the --people results are written to')
+    parser.add_argument('--baseline', help='JSON results of an earlier run. Exits with status 1 if a stage got slower')
+    parser.add_argument('--tolerance', type=float, default=1.5, help='how many times slower than the baseline a stage may get')
+    parser.add_argument('--parse-file', help='compare the text and the memory-mapped parsers on this GEDCOM file')
+    parser.add_argument('--repeats', type=int, default=3, help='runs of each parser with --parse-file. The fastest one counts')
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.parse_file:
+        print(f'{args.parse_file}:')
+        print_parsers(benchmark_parsers(args.parse_file, args.repeats))
+        return
+
+    if not args.people:
+        benchmark_date_decoding(args.lines)
+        return
+
+    results: Dict[str, Any] = benchmark_sizes(args.people, args.depth, args.fertility, args.divorce_rate, args.anomaly_rate, args.seed)
+
+    with open(args.output, 'w') as file:
+        json.dump(results, file, indent = 2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions: List[str] = compare_results(results, json.load(file), args.tolerance)
+
+        for regression in regressions:
+            print(f'REGRESSION: {regression}')
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,31 @@
 import unittest
+import asyncio
+import contextlib
+import csv
 import datetime
+import gc
+import glob
+import http.client
+import io
+import json
+import mmap
+import os
+import pstats
+import subprocess
 import sys
+import tempfile
+import threading
+import urllib.error
+import urllib.request
 from typing import Iterator, Tuple, IO, List, Dict, Set
-from SSW555_Group_Project import GedcomFile, Individual, Family
+from SSW555_Group_Project import GedcomFile, Individual, Family, decode_gedcom_date, group_by_key, find_duplicate_groups, render_findings, find_record_boundaries, matching_length, RecordLinks, ValidationServer, expand_gedcom_paths, validate_files, Profiler, MethodProfiler, StreamingTable, JsonLinesWriter, CsvWriter, ColumnarWriter, read_columnar_table
+from benchmark import generate_gedcom, write_gedcom
 from prettytable import PrettyTable
 
 class main_testing(unittest.TestCase):
     maxDiff = None
 
     def setUp(self):
-        GedcomFile._individual_dt.clear()
-        GedcomFile._family_dt.clear()
-        GedcomFile._individuals_living_and_married.clear()
-        GedcomFile._individuals_living_over_thirty_and_never_married.clear()
         self.gedcom = GedcomFile()
         self.today = datetime.datetime.today()
 
@@ -29,22 +42,22 @@ class main_testing(unittest.TestCase):
                 person.sex = "M"
             else:
                 person.sex = "F"
-            GedcomFile._individual_dt[person.id] = person
+            self.gedcom._individual_dt[person.id] = person
 
         
-        GedcomFile._individual_dt["@I0@"].birth = datetime.date(1900,12,12)
-        GedcomFile._individual_dt["@I1@"].birth = datetime.date(1900,11,11)
-        GedcomFile._individual_dt["@I2@"].birth = datetime.date(1910,10,10)
-        GedcomFile._individual_dt["@I3@"].birth = datetime.date(1910,9,9)
-        GedcomFile._individual_dt["@I4@"].birth = datetime.date(1920,8,8)
-        GedcomFile._individual_dt["@I5@"].birth = datetime.date(1920,7,7)
-        GedcomFile._individual_dt["@I6@"].birth = datetime.date(1930,6,6)
-        GedcomFile._individual_dt["@I7@"].birth = datetime.date(1930,6,6)
-        GedcomFile._individual_dt["@I8@"].birth = datetime.date(1940,5,5)
-        GedcomFile._individual_dt["@I9@"].birth = datetime.date(1940,5,5)
-        GedcomFile._individual_dt["@I10@"].birth = datetime.date(1950,6,6)
-        GedcomFile._individual_dt["@I11@"].birth = datetime.date(1950,12,31)
-        for individual in GedcomFile._individual_dt.values():
+        self.gedcom._individual_dt["@I0@"].birth = datetime.date(1900,12,12)
+        self.gedcom._individual_dt["@I1@"].birth = datetime.date(1900,11,11)
+        self.gedcom._individual_dt["@I2@"].birth = datetime.date(1910,10,10)
+        self.gedcom._individual_dt["@I3@"].birth = datetime.date(1910,9,9)
+        self.gedcom._individual_dt["@I4@"].birth = datetime.date(1920,8,8)
+        self.gedcom._individual_dt["@I5@"].birth = datetime.date(1920,7,7)
+        self.gedcom._individual_dt["@I6@"].birth = datetime.date(1930,6,6)
+        self.gedcom._individual_dt["@I7@"].birth = datetime.date(1930,6,6)
+        self.gedcom._individual_dt["@I8@"].birth = datetime.date(1940,5,5)
+        self.gedcom._individual_dt["@I9@"].birth = datetime.date(1940,5,5)
+        self.gedcom._individual_dt["@I10@"].birth = datetime.date(1950,6,6)
+        self.gedcom._individual_dt["@I11@"].birth = datetime.date(1950,12,31)
+        for individual in self.gedcom._individual_dt.values():
             individual.setAge()
 
         # Create 6 families and assign IDs
@@ -52,63 +65,63 @@ class main_testing(unittest.TestCase):
         for i in range (0,6):
             family = Family()
             family.id = "@F_test" + str(i)
-            GedcomFile._family_dt[family.id] = family
+            self.gedcom._family_dt[family.id] = family
 
         # Pair up individuals into husbands and wives.
-        GedcomFile._family_dt["@F_test0"].husband_id = "@I0@"
-        GedcomFile._family_dt["@F_test0"].husband_name = GedcomFile._individual_dt["@I0@"].name
-        GedcomFile._family_dt["@F_test0"].wife_id = "@I1@"
-        GedcomFile._family_dt["@F_test0"].wife_name = GedcomFile._individual_dt["@I1@"].name
-        GedcomFile._family_dt["@F_test0"].marriage_date = datetime.date(1930,1,1)
-        GedcomFile._individual_dt["@I0@"].fams = set(["@F_test0"])
-        GedcomFile._individual_dt["@I1@"].fams = set(["@F_test0"])  
-
-        GedcomFile._family_dt["@F_test1"].husband_id = "@I2@"
-        GedcomFile._family_dt["@F_test1"].husband_name = GedcomFile._individual_dt["@I2@"].name
-        GedcomFile._family_dt["@F_test1"].wife_id = "@I3@"
-        GedcomFile._family_dt["@F_test1"].wife_name = GedcomFile._individual_dt["@I3@"].name
-        GedcomFile._family_dt["@F_test1"].marriage_date = datetime.date(1940,2,2)
-        GedcomFile._individual_dt["@I2@"].fams = set(["@F_test1"])
-        GedcomFile._individual_dt["@I3@"].fams = set(["@F_test1"])  
-
-        GedcomFile._family_dt["@F_test2"].husband_id = "@I4@"
-        GedcomFile._family_dt["@F_test2"].husband_name = GedcomFile._individual_dt["@I4@"].name
-        GedcomFile._family_dt["@F_test2"].wife_id = "@I5@"
-        GedcomFile._family_dt["@F_test2"].wife_name = GedcomFile._individual_dt["@I5@"].name
-        GedcomFile._family_dt["@F_test2"].marriage_date = datetime.date(1950,3,3)
-        GedcomFile._individual_dt["@I4@"].fams = set(["@F_test2"])
-        GedcomFile._individual_dt["@I5@"].fams = set(["@F_test2"])   
-
-        GedcomFile._family_dt["@F_test3"].husband_id = "@I6@"
-        GedcomFile._family_dt["@F_test3"].husband_name = GedcomFile._individual_dt["@I6@"].name
-        GedcomFile._family_dt["@F_test3"].wife_id = "@I7@"
-        GedcomFile._family_dt["@F_test3"].wife_name = GedcomFile._individual_dt["@I7@"].name
-        GedcomFile._family_dt["@F_test3"].marriage_date = datetime.date(1960,4,4)
-        GedcomFile._individual_dt["@I6@"].fams = set(["@F_test3"])
-        GedcomFile._individual_dt["@I7@"].fams = set(["@F_test3"])   
-
-        GedcomFile._family_dt["@F_test4"].husband_id = "@I8@"
-        GedcomFile._family_dt["@F_test4"].husband_name = GedcomFile._individual_dt["@I8@"].name
-        GedcomFile._family_dt["@F_test4"].wife_id = "@I9@"
-        GedcomFile._family_dt["@F_test4"].wife_name = GedcomFile._individual_dt["@I9@"].name
-        GedcomFile._family_dt["@F_test4"].marriage_date = datetime.date(1970,5,5)
-        GedcomFile._individual_dt["@I8@"].fams = set(["@F_test4"])
-        GedcomFile._individual_dt["@I9@"].fams = set(["@F_test4"])   
-
-        GedcomFile._family_dt["@F_test5"].husband_id = "@I10@"
-        GedcomFile._family_dt["@F_test5"].husband_name = GedcomFile._individual_dt["@I10@"].name
-        GedcomFile._family_dt["@F_test5"].wife_id = "@I11@"
-        GedcomFile._family_dt["@F_test5"].wife_name = GedcomFile._individual_dt["@I11@"].name
-        GedcomFile._family_dt["@F_test5"].marriage_date = datetime.date(1980,6,6)
-        GedcomFile._individual_dt["@I10@"].fams = set(["@F_test5"])
-        GedcomFile._individual_dt["@I11@"].fams = set(["@F_test5"])   
+        self.gedcom._family_dt["@F_test0"].husband_id = "@I0@"
+        self.gedcom._family_dt["@F_test0"].husband_name = self.gedcom._individual_dt["@I0@"].name
+        self.gedcom._family_dt["@F_test0"].wife_id = "@I1@"
+        self.gedcom._family_dt["@F_test0"].wife_name = self.gedcom._individual_dt["@I1@"].name
+        self.gedcom._family_dt["@F_test0"].marriage_date = datetime.date(1930,1,1)
+        self.gedcom._individual_dt["@I0@"].fams = set(["@F_test0"])
+        self.gedcom._individual_dt["@I1@"].fams = set(["@F_test0"])  
+
+        self.gedcom._family_dt["@F_test1"].husband_id = "@I2@"
+        self.gedcom._family_dt["@F_test1"].husband_name = self.gedcom._individual_dt["@I2@"].name
+        self.gedcom._family_dt["@F_test1"].wife_id = "@I3@"
+        self.gedcom._family_dt["@F_test1"].wife_name = self.gedcom._individual_dt["@I3@"].name
+        self.gedcom._family_dt["@F_test1"].marriage_date = datetime.date(1940,2,2)
+        self.gedcom._individual_dt["@I2@"].fams = set(["@F_test1"])
+        self.gedcom._individual_dt["@I3@"].fams = set(["@F_test1"])  
+
+        self.gedcom._family_dt["@F_test2"].husband_id = "@I4@"
+        self.gedcom._family_dt["@F_test2"].husband_name = self.gedcom._individual_dt["@I4@"].name
+        self.gedcom._family_dt["@F_test2"].wife_id = "@I5@"
+        self.gedcom._family_dt["@F_test2"].wife_name = self.gedcom._individual_dt["@I5@"].name
+        self.gedcom._family_dt["@F_test2"].marriage_date = datetime.date(1950,3,3)
+        self.gedcom._individual_dt["@I4@"].fams = set(["@F_test2"])
+        self.gedcom._individual_dt["@I5@"].fams = set(["@F_test2"])   
+
+        self.gedcom._family_dt["@F_test3"].husband_id = "@I6@"
+        self.gedcom._family_dt["@F_test3"].husband_name = self.gedcom._individual_dt["@I6@"].name
+        self.gedcom._family_dt["@F_test3"].wife_id = "@I7@"
+        self.gedcom._family_dt["@F_test3"].wife_name = self.gedcom._individual_dt["@I7@"].name
+        self.gedcom._family_dt["@F_test3"].marriage_date = datetime.date(1960,4,4)
+        self.gedcom._individual_dt["@I6@"].fams = set(["@F_test3"])
+        self.gedcom._individual_dt["@I7@"].fams = set(["@F_test3"])   
+
+        self.gedcom._family_dt["@F_test4"].husband_id = "@I8@"
+        self.gedcom._family_dt["@F_test4"].husband_name = self.gedcom._individual_dt["@I8@"].name
+        self.gedcom._family_dt["@F_test4"].wife_id = "@I9@"
+        self.gedcom._family_dt["@F_test4"].wife_name = self.gedcom._individual_dt["@I9@"].name
+        self.gedcom._family_dt["@F_test4"].marriage_date = datetime.date(1970,5,5)
+        self.gedcom._individual_dt["@I8@"].fams = set(["@F_test4"])
+        self.gedcom._individual_dt["@I9@"].fams = set(["@F_test4"])   
+
+        self.gedcom._family_dt["@F_test5"].husband_id = "@I10@"
+        self.gedcom._family_dt["@F_test5"].husband_name = self.gedcom._individual_dt["@I10@"].name
+        self.gedcom._family_dt["@F_test5"].wife_id = "@I11@"
+        self.gedcom._family_dt["@F_test5"].wife_name = self.gedcom._individual_dt["@I11@"].name
+        self.gedcom._family_dt["@F_test5"].marriage_date = datetime.date(1980,6,6)
+        self.gedcom._individual_dt["@I10@"].fams = set(["@F_test5"])
+        self.gedcom._individual_dt["@I11@"].fams = set(["@F_test5"])   
 
 
     def test_US35_30days(self):
-        GedcomFile._individual_dt["@I0@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=30))
-        name = GedcomFile._individual_dt["@I0@"].name
-        id = GedcomFile._individual_dt["@I0@"].id
-        birth = GedcomFile._individual_dt["@I0@"].birth
+        self.gedcom._individual_dt["@I0@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=30))
+        name = self.gedcom._individual_dt["@I0@"].name
+        id = self.gedcom._individual_dt["@I0@"].id
+        birth = self.gedcom._individual_dt["@I0@"].birth
 
         expected = f"ANOMALY: US35: Name: {name}, Individual: ID {id}, born 30 days ago! Birthday: {birth}\n" 
         
@@ -118,10 +131,10 @@ class main_testing(unittest.TestCase):
 
 
     def test_US35_0days(self):
-        GedcomFile._individual_dt["@I5@"].birth =  datetime.date(self.today.year, self.today.month, self.today.day)       
-        name = GedcomFile._individual_dt["@I5@"].name
-        id = GedcomFile._individual_dt["@I5@"].id
-        birth = GedcomFile._individual_dt["@I5@"].birth
+        self.gedcom._individual_dt["@I5@"].birth =  datetime.date(self.today.year, self.today.month, self.today.day)       
+        name = self.gedcom._individual_dt["@I5@"].name
+        id = self.gedcom._individual_dt["@I5@"].id
+        birth = self.gedcom._individual_dt["@I5@"].birth
 
         expected = f"ANOMALY: US35: Name: {name}, Individual: ID {id}, born 0 days ago! Birthday: {birth}\n"
 
@@ -131,14 +144,14 @@ class main_testing(unittest.TestCase):
 
 
     def test_US35_31days(self):
-        GedcomFile._individual_dt["@I11@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=31))
+        self.gedcom._individual_dt["@I11@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=31))
         expected = ""
         actual = GedcomFile.US35_list_recent_births(self.gedcom)
         self.assertEqual(expected, actual)
 
 
     def test_US35_neg1days(self):
-        GedcomFile._individual_dt["@I7@"].birth = datetime.datetime.date(self.today + datetime.timedelta(days=1))
+        self.gedcom._individual_dt["@I7@"].birth = datetime.datetime.date(self.today + datetime.timedelta(days=1))
         expected = ""
         actual = GedcomFile.US35_list_recent_births(self.gedcom)
         self.assertEqual(expected, actual)
@@ -148,13 +161,13 @@ class main_testing(unittest.TestCase):
     def test_US34_spouseExactly2xAge(self):
         husband_age = 18
         wife_age = husband_age * 2
-        GedcomFile._individual_dt["@I0@"].age = husband_age
-        GedcomFile._individual_dt["@I1@"].age = wife_age
+        self.gedcom._individual_dt["@I0@"].age = husband_age
+        self.gedcom._individual_dt["@I1@"].age = wife_age
         
         wife_age = 35
         husband_age = wife_age * 2
-        GedcomFile._individual_dt["@I2@"].age = husband_age
-        GedcomFile._individual_dt["@I3@"].age = wife_age
+        self.gedcom._individual_dt["@I2@"].age = husband_age
+        self.gedcom._individual_dt["@I3@"].age = wife_age
 
         actual = GedcomFile.US34_list_large_age_differences(self.gedcom)
 
@@ -166,22 +179,22 @@ class main_testing(unittest.TestCase):
     def test_US34_spouseGreater2xAge(self):
         husband_age = 18
         wife_age = (husband_age * 2) + 1
-        GedcomFile._individual_dt["@I0@"].age = husband_age
-        GedcomFile._individual_dt["@I1@"].age = wife_age
-        husband_name = GedcomFile._individual_dt["@I0@"].name
-        wife_name = GedcomFile._individual_dt["@I1@"].name
-        family_id = next(iter(GedcomFile._individual_dt["@I0@"].fams)) # We only expect 1 family
+        self.gedcom._individual_dt["@I0@"].age = husband_age
+        self.gedcom._individual_dt["@I1@"].age = wife_age
+        husband_name = self.gedcom._individual_dt["@I0@"].name
+        wife_name = self.gedcom._individual_dt["@I1@"].name
+        family_id = next(iter(self.gedcom._individual_dt["@I0@"].fams)) # We only expect 1 family
         
         expected_1 = "ANOMALY: US34: FAMILY: %s Name: %s, id: %s, age: %d is more than 2x in age as spouse: %s, id: %s, age: %d\n" \
             %(family_id, wife_name, "@I1@", wife_age, husband_name,  "@I0@", husband_age )
 
         wife_age = 35
         husband_age = (wife_age * 2) + 1
-        GedcomFile._individual_dt["@I2@"].age = husband_age
-        GedcomFile._individual_dt["@I3@"].age = wife_age
-        husband_name = GedcomFile._individual_dt["@I2@"].name
-        wife_name = GedcomFile._individual_dt["@I3@"].name
-        family_id = next(iter(GedcomFile._individual_dt["@I2@"].fams)) # We only expect 1 family
+        self.gedcom._individual_dt["@I2@"].age = husband_age
+        self.gedcom._individual_dt["@I3@"].age = wife_age
+        husband_name = self.gedcom._individual_dt["@I2@"].name
+        wife_name = self.gedcom._individual_dt["@I3@"].name
+        family_id = next(iter(self.gedcom._individual_dt["@I2@"].fams)) # We only expect 1 family
 
         expected_2 = "ANOMALY: US34: FAMILY: %s Name: %s, id: %s, age: %d is more than 2x in age as spouse: %s, id: %s, age: %d\n" \
             %(family_id, husband_name, "@I2@", husband_age, wife_name,  "@I3@", wife_age ) 
@@ -196,13 +209,13 @@ class main_testing(unittest.TestCase):
     def test_US34_spouseNegAge(self):
         husband_age = -18
         wife_age = -8
-        GedcomFile._individual_dt["@I0@"].age = husband_age
-        GedcomFile._individual_dt["@I1@"].age = wife_age
+        self.gedcom._individual_dt["@I0@"].age = husband_age
+        self.gedcom._individual_dt["@I1@"].age = wife_age
 
         wife_age = -35
         husband_age = -17
-        GedcomFile._individual_dt["@I2@"].age = husband_age
-        GedcomFile._individual_dt["@I3@"].age = wife_age
+        self.gedcom._individual_dt["@I2@"].age = husband_age
+        self.gedcom._individual_dt["@I3@"].age = wife_age
 
         expected = ""
         actual = GedcomFile.US34_list_large_age_differences(self.gedcom)
@@ -215,17 +228,17 @@ class main_testing(unittest.TestCase):
         '''
         # The initial unittest setup declares all 12 individuals to be living and married. Therefore, we are going to
         # override a few as deceased, and a few as unmarried.
-        GedcomFile._individual_dt["@I0@"].living = False
-        GedcomFile._individual_dt["@I8@"].living = False
-        GedcomFile._individual_dt["@I3@"].fams = set()
-        GedcomFile._individual_dt["@I11@"].fams = set()
+        self.gedcom._individual_dt["@I0@"].living = False
+        self.gedcom._individual_dt["@I8@"].living = False
+        self.gedcom._individual_dt["@I3@"].fams = set()
+        self.gedcom._individual_dt["@I11@"].fams = set()
 
         GedcomFile.parse_individuals_based_on_living_and_marital_details(self.gedcom)
         
-        result: Dict[str, str] = GedcomFile._individuals_living_and_married
+        result: Dict[str, str] = self.gedcom._individuals_living_and_married
 
         expected = dict()
-        for individual in GedcomFile._individual_dt.values():
+        for individual in self.gedcom._individual_dt.values():
             if individual.id in "@I0@ @I8@ @I3@ @I11@":
                 continue
             else:
@@ -235,16 +248,16 @@ class main_testing(unittest.TestCase):
 
     def test_US04_Marriage_before_divorce(self):
         # Family 0: Divorce before marriage by 1 day
-        GedcomFile._family_dt["@F_test0"].marriage_date = datetime.date(1985,11,11)
-        GedcomFile._family_dt["@F_test0"].divorce_date = datetime.date(1985,11,10)
+        self.gedcom._family_dt["@F_test0"].marriage_date = datetime.date(1985,11,11)
+        self.gedcom._family_dt["@F_test0"].divorce_date = datetime.date(1985,11,10)
 
         # Family 2: Normal (Divorce after Marriage by 1 day). No Error Expected
-        GedcomFile._family_dt["@F_test1"].marriage_date = datetime.date(1985,11,10)
-        GedcomFile._family_dt["@F_test1"].divorce_date = datetime.date(1985,12,10)     
+        self.gedcom._family_dt["@F_test1"].marriage_date = datetime.date(1985,11,10)
+        self.gedcom._family_dt["@F_test1"].divorce_date = datetime.date(1985,12,10)     
    
         # Family 5: Normal (Divorce after Marriage by 60 years). No Error Expected
-        GedcomFile._family_dt["@F_test2"].marriage_date = datetime.date(1940,11,10)
-        GedcomFile._family_dt["@F_test2"].divorce_date = datetime.date(2000,11,10)   
+        self.gedcom._family_dt["@F_test2"].marriage_date = datetime.date(1940,11,10)
+        self.gedcom._family_dt["@F_test2"].divorce_date = datetime.date(2000,11,10)   
 
 
         result = self.gedcom.US4_Marriage_before_divorce()
@@ -256,26 +269,26 @@ class main_testing(unittest.TestCase):
 
     def test_US21_correct_gender_for_role(self):
         # Family 0: Wrong Husband Sex
-        husband_id = GedcomFile._family_dt["@F_test0"].husband_id
-        GedcomFile._individual_dt[husband_id].sex = "F"
+        husband_id = self.gedcom._family_dt["@F_test0"].husband_id
+        self.gedcom._individual_dt[husband_id].sex = "F"
 
         # Family 1: Wrong Wife Sex
-        wife_id = GedcomFile._family_dt["@F_test1"].wife_id
-        GedcomFile._individual_dt[wife_id].sex = "M"
+        wife_id = self.gedcom._family_dt["@F_test1"].wife_id
+        self.gedcom._individual_dt[wife_id].sex = "M"
 
         # Family 2: Invalid Wife Sex
-        wife_id = GedcomFile._family_dt["@F_test2"].wife_id
-        GedcomFile._individual_dt[wife_id].sex = "BAD VALUE"
+        wife_id = self.gedcom._family_dt["@F_test2"].wife_id
+        self.gedcom._individual_dt[wife_id].sex = "BAD VALUE"
 
         # Family 3: Invalid Husband Sex
-        husband_id = GedcomFile._family_dt["@F_test3"].husband_id
-        GedcomFile._individual_dt[husband_id].sex = ""
+        husband_id = self.gedcom._family_dt["@F_test3"].husband_id
+        self.gedcom._individual_dt[husband_id].sex = ""
 
         # Family 4: Uninitialized Husband ID (No error expected)
-        GedcomFile._family_dt["@F_test4"].husband_id = ""
+        self.gedcom._family_dt["@F_test4"].husband_id = ""
 
         # Family 5: Uninitialized Wife ID (No Error expected)
-        GedcomFile._family_dt["@F_test4"].wife_id = ""        
+        self.gedcom._family_dt["@F_test4"].wife_id = ""        
 
         result = self.gedcom.US21_correct_gender_for_role()
         expect = [
@@ -294,24 +307,24 @@ class main_testing(unittest.TestCase):
         # The initial unittest setup declares all 12 individuals to be living and married. Therefore, we are going to
         # override a few as not married and over 30.
         # Force @I8@ and @I3@ to both be over 30 and never married. 
-        GedcomFile._individual_dt["@I8@"].age = 31
-        GedcomFile._individual_dt["@I8@"].fams = set() # Not married
+        self.gedcom._individual_dt["@I8@"].age = 31
+        self.gedcom._individual_dt["@I8@"].fams = set() # Not married
 
-        GedcomFile._individual_dt["@I3@"].age = 50
-        GedcomFile._individual_dt["@I3@"].fams = set() # Not married
+        self.gedcom._individual_dt["@I3@"].age = 50
+        self.gedcom._individual_dt["@I3@"].fams = set() # Not married
 
-        GedcomFile._individual_dt["@I11@"].age = 29  # Married in initial setup
+        self.gedcom._individual_dt["@I11@"].age = 29  # Married in initial setup
 
-        GedcomFile._individual_dt["@I0@"].age = 30 
-        GedcomFile._individual_dt["@I0@"].fams = set() # Not married
+        self.gedcom._individual_dt["@I0@"].age = 30 
+        self.gedcom._individual_dt["@I0@"].fams = set() # Not married
 
         GedcomFile.parse_individuals_based_on_living_and_marital_details(self.gedcom)
         
-        result: Dict[str, str] = GedcomFile._individuals_living_over_thirty_and_never_married
+        result: Dict[str, str] = self.gedcom._individuals_living_over_thirty_and_never_married
 
         expected = dict()
-        expected["@I8@"] = GedcomFile._individual_dt["@I8@"].name
-        expected["@I3@"] = GedcomFile._individual_dt["@I3@"].name       
+        expected["@I8@"] = self.gedcom._individual_dt["@I8@"].name
+        expected["@I3@"] = self.gedcom._individual_dt["@I3@"].name       
 
         self.assertEqual(result, expected)
 
@@ -320,23 +333,23 @@ class main_testing(unittest.TestCase):
     def test_US06(self):
 
         # Define case where the error won't happen (Death 1 day after divorce)
-        w_id = GedcomFile._family_dt["@F_test1"].wife_id
-        GedcomFile._individual_dt[w_id].death_date = datetime.date(1985,11,11)
-        GedcomFile._family_dt["@F_test1"].divorce_date = datetime.date(1985,11,10)
+        w_id = self.gedcom._family_dt["@F_test1"].wife_id
+        self.gedcom._individual_dt[w_id].death_date = datetime.date(1985,11,11)
+        self.gedcom._family_dt["@F_test1"].divorce_date = datetime.date(1985,11,10)
 
         # Define case where error won't happen (Death 1 year after divorce)
-        h_id = GedcomFile._family_dt["@F_test2"].husband_id
-        GedcomFile._individual_dt[h_id].death_date = datetime.date(2005,9,1)
-        GedcomFile._family_dt["@F_test2"].divorce_date = datetime.date(2004,9,1)
+        h_id = self.gedcom._family_dt["@F_test2"].husband_id
+        self.gedcom._individual_dt[h_id].death_date = datetime.date(2005,9,1)
+        self.gedcom._family_dt["@F_test2"].divorce_date = datetime.date(2004,9,1)
 
         # Define a case where the error will happen (Death 1 day before divorce)
-        h_id = GedcomFile._family_dt["@F_test0"].husband_id
-        w_id = GedcomFile._family_dt["@F_test0"].wife_id
-        h_name = GedcomFile._family_dt["@F_test0"].husband_name
-        w_name = GedcomFile._family_dt["@F_test0"].wife_name
+        h_id = self.gedcom._family_dt["@F_test0"].husband_id
+        w_id = self.gedcom._family_dt["@F_test0"].wife_id
+        h_name = self.gedcom._family_dt["@F_test0"].husband_name
+        w_name = self.gedcom._family_dt["@F_test0"].wife_name
 
-        GedcomFile._individual_dt[w_id].death_date = datetime.date(1985,11,9)
-        GedcomFile._family_dt["@F_test0"].divorce_date = datetime.date(1985,11,10)
+        self.gedcom._individual_dt[w_id].death_date = datetime.date(1985,11,9)
+        self.gedcom._family_dt["@F_test0"].divorce_date = datetime.date(1985,11,10)
         
         result = GedcomFile.US06_divorce_before_death(self.gedcom)
 
@@ -347,9 +360,9 @@ class main_testing(unittest.TestCase):
         
         
     def test_US03(self):
-        GedcomFile._individual_dt["@I11@"].death_date = datetime.date(2000,4,13)
-        GedcomFile._individual_dt["@I11@"].birth = datetime.date(2000,4,14)
-        name = GedcomFile._individual_dt["@I11@"].name
+        self.gedcom._individual_dt["@I11@"].death_date = datetime.date(2000,4,13)
+        self.gedcom._individual_dt["@I11@"].birth = datetime.date(2000,4,14)
+        name = self.gedcom._individual_dt["@I11@"].name
         result = GedcomFile.US03_birth_death(self.gedcom)
 
         expect = [ 
@@ -360,24 +373,24 @@ class main_testing(unittest.TestCase):
 
     def test_US07(self):
         #Exactly 150 Years old and Alive (Error Expected)
-        GedcomFile._individual_dt["@I11@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*150))
-        GedcomFile._individual_dt["@I11@"].death_date = 'NA'
-        GedcomFile._individual_dt["@I11@"].living = True
-        GedcomFile._individual_dt["@I11@"].setAge()
-        name_11 = GedcomFile._individual_dt["@I11@"].name
+        self.gedcom._individual_dt["@I11@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*150))
+        self.gedcom._individual_dt["@I11@"].death_date = 'NA'
+        self.gedcom._individual_dt["@I11@"].living = True
+        self.gedcom._individual_dt["@I11@"].setAge()
+        name_11 = self.gedcom._individual_dt["@I11@"].name
 
         #150 Years old + 1 day and Alive (Error Expected)
-        GedcomFile._individual_dt["@I10@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*150 + 1))
-        GedcomFile._individual_dt["@I10@"].death_date = 'NA'
-        GedcomFile._individual_dt["@I10@"].living = True
-        GedcomFile._individual_dt["@I10@"].setAge()
-        name_10 = GedcomFile._individual_dt["@I10@"].name
+        self.gedcom._individual_dt["@I10@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*150 + 1))
+        self.gedcom._individual_dt["@I10@"].death_date = 'NA'
+        self.gedcom._individual_dt["@I10@"].living = True
+        self.gedcom._individual_dt["@I10@"].setAge()
+        name_10 = self.gedcom._individual_dt["@I10@"].name
 
         # 150 Years old minus 1 Day and Alive (No error expected)
-        GedcomFile._individual_dt["@I9@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*150 - 1))
-        GedcomFile._individual_dt["@I9@"].death_date = 'NA'
-        GedcomFile._individual_dt["@I9@"].living = True
-        GedcomFile._individual_dt["@I9@"].setAge()
+        self.gedcom._individual_dt["@I9@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*150 - 1))
+        self.gedcom._individual_dt["@I9@"].death_date = 'NA'
+        self.gedcom._individual_dt["@I9@"].living = True
+        self.gedcom._individual_dt["@I9@"].setAge()
 
         result = GedcomFile.US07_Death150(self.gedcom)
         expect = [
@@ -390,27 +403,27 @@ class main_testing(unittest.TestCase):
     def test_US12(self):
 
         # Mother is exactly 60 years older than child (error expected)
-        GedcomFile._family_dt["@F_test0"].husband_id = "@I0@"
-        GedcomFile._family_dt["@F_test0"].wife_id =    "@I1@"
-        GedcomFile._family_dt["@F_test0"].children = set(["@I2@"])
+        self.gedcom._family_dt["@F_test0"].husband_id = "@I0@"
+        self.gedcom._family_dt["@F_test0"].wife_id =    "@I1@"
+        self.gedcom._family_dt["@F_test0"].children = set(["@I2@"])
 
-        GedcomFile._individual_dt["@I0@"].birth = datetime.date(1940,4,19)
-        GedcomFile._individual_dt["@I0@"].setAge()
-        GedcomFile._individual_dt["@I1@"].birth = datetime.date(1940,4,19)
-        GedcomFile._individual_dt["@I1@"].setAge()
-        GedcomFile._individual_dt["@I2@"].birth = datetime.date(2000,4,19)
-        GedcomFile._individual_dt["@I2@"].setAge()
+        self.gedcom._individual_dt["@I0@"].birth = datetime.date(1940,4,19)
+        self.gedcom._individual_dt["@I0@"].setAge()
+        self.gedcom._individual_dt["@I1@"].birth = datetime.date(1940,4,19)
+        self.gedcom._individual_dt["@I1@"].setAge()
+        self.gedcom._individual_dt["@I2@"].birth = datetime.date(2000,4,19)
+        self.gedcom._individual_dt["@I2@"].setAge()
 
         result = GedcomFile.US12_Mother_Father_older(self.gedcom)
         self.assertEqual({'@F_test0'}, result)
 
         # Mother is (59) older than child (no error expected)
-        GedcomFile._individual_dt["@I0@"].birth = datetime.date(1940,4,19)
-        GedcomFile._individual_dt["@I0@"].setAge()
-        GedcomFile._individual_dt["@I1@"].birth = datetime.date(1941,4,19)
-        GedcomFile._individual_dt["@I1@"].setAge()
-        GedcomFile._individual_dt["@I2@"].birth = datetime.date(2000,4,19)
-        GedcomFile._individual_dt["@I2@"].setAge()
+        self.gedcom._individual_dt["@I0@"].birth = datetime.date(1940,4,19)
+        self.gedcom._individual_dt["@I0@"].setAge()
+        self.gedcom._individual_dt["@I1@"].birth = datetime.date(1941,4,19)
+        self.gedcom._individual_dt["@I1@"].setAge()
+        self.gedcom._individual_dt["@I2@"].birth = datetime.date(2000,4,19)
+        self.gedcom._individual_dt["@I2@"].setAge()
 
 
         result = GedcomFile.US12_Mother_Father_older(self.gedcom)
@@ -418,24 +431,24 @@ class main_testing(unittest.TestCase):
 
 
         # Father is exactly 80 years older than child (error expected)
-        GedcomFile._individual_dt["@I0@"].birth = datetime.date(1920,4,19)
-        GedcomFile._individual_dt["@I0@"].setAge()
-        GedcomFile._individual_dt["@I1@"].birth = datetime.date(1941,4,19)
-        GedcomFile._individual_dt["@I1@"].setAge()
-        GedcomFile._individual_dt["@I2@"].birth = datetime.date(2000,4,19)
-        GedcomFile._individual_dt["@I2@"].setAge()
+        self.gedcom._individual_dt["@I0@"].birth = datetime.date(1920,4,19)
+        self.gedcom._individual_dt["@I0@"].setAge()
+        self.gedcom._individual_dt["@I1@"].birth = datetime.date(1941,4,19)
+        self.gedcom._individual_dt["@I1@"].setAge()
+        self.gedcom._individual_dt["@I2@"].birth = datetime.date(2000,4,19)
+        self.gedcom._individual_dt["@I2@"].setAge()
 
         result = GedcomFile.US12_Mother_Father_older(self.gedcom)
         self.assertEqual({'@F_test0'}, result)
 
 
         # Father is (79) older than child (no error expected)
-        GedcomFile._individual_dt["@I0@"].birth = datetime.date(1921,4,19)
-        GedcomFile._individual_dt["@I0@"].setAge()
-        GedcomFile._individual_dt["@I1@"].birth = datetime.date(1941,4,19)
-        GedcomFile._individual_dt["@I1@"].setAge()
-        GedcomFile._individual_dt["@I2@"].birth = datetime.date(2000,4,19)
-        GedcomFile._individual_dt["@I2@"].setAge()
+        self.gedcom._individual_dt["@I0@"].birth = datetime.date(1921,4,19)
+        self.gedcom._individual_dt["@I0@"].setAge()
+        self.gedcom._individual_dt["@I1@"].birth = datetime.date(1941,4,19)
+        self.gedcom._individual_dt["@I1@"].setAge()
+        self.gedcom._individual_dt["@I2@"].birth = datetime.date(2000,4,19)
+        self.gedcom._individual_dt["@I2@"].setAge()
 
 
         result = GedcomFile.US12_Mother_Father_older(self.gedcom)
@@ -444,22 +457,22 @@ class main_testing(unittest.TestCase):
     def test_US16(self):
         
         # Family1 same name
-        GedcomFile._family_dt["@F_test0"].husband_id = "@I0@"
-        GedcomFile._family_dt["@F_test0"].wife_id =    "@I1@"
-        GedcomFile._family_dt["@F_test0"].children = set(["@I2@"])
+        self.gedcom._family_dt["@F_test0"].husband_id = "@I0@"
+        self.gedcom._family_dt["@F_test0"].wife_id =    "@I1@"
+        self.gedcom._family_dt["@F_test0"].children = set(["@I2@"])
 
-        GedcomFile._individual_dt["@I0@"].name = 'aran /kel/ '
-        GedcomFile._individual_dt["@I1@"].name = 'molly /kel/ '
-        GedcomFile._individual_dt["@I2@"].name = 'jo /kel/ '
+        self.gedcom._individual_dt["@I0@"].name = 'aran /kel/ '
+        self.gedcom._individual_dt["@I1@"].name = 'molly /kel/ '
+        self.gedcom._individual_dt["@I2@"].name = 'jo /kel/ '
 
         # Family2 differennt name
-        GedcomFile._family_dt["@F_test1"].husband_id = "@I4@"
-        GedcomFile._family_dt["@F_test1"].wife_id =    "@I5@"
-        GedcomFile._family_dt["@F_test1"].children = set(["@I6@"])
+        self.gedcom._family_dt["@F_test1"].husband_id = "@I4@"
+        self.gedcom._family_dt["@F_test1"].wife_id =    "@I5@"
+        self.gedcom._family_dt["@F_test1"].children = set(["@I6@"])
 
-        GedcomFile._individual_dt["@I4@"].name = 'yash /smith/ '
-        GedcomFile._individual_dt["@I5@"].name = 'ind /smith/ '
-        GedcomFile._individual_dt["@I6@"].name = 'shree /pal/ '
+        self.gedcom._individual_dt["@I4@"].name = 'yash /smith/ '
+        self.gedcom._individual_dt["@I5@"].name = 'ind /smith/ '
+        self.gedcom._individual_dt["@I6@"].name = 'shree /pal/ '
 
         result = GedcomFile.US16_male(self.gedcom)
         self.assertEqual(["@F_test1"], result)
@@ -467,74 +480,74 @@ class main_testing(unittest.TestCase):
     def test_US19(self):
 
         #GrandParents
-        GedcomFile._family_dt["@F_test0"].husband_id = "@I0@"
-        GedcomFile._family_dt["@F_test0"].wife_id =    "@I1@"
-        GedcomFile._family_dt["@F_test0"].children = set({"@I2@","@I5@"})
-        GedcomFile._individual_dt["@I0@"].fams = set(["@F_test0"])
-        GedcomFile._individual_dt["@I1@"].fams = set(["@F_test0"])
+        self.gedcom._family_dt["@F_test0"].husband_id = "@I0@"
+        self.gedcom._family_dt["@F_test0"].wife_id =    "@I1@"
+        self.gedcom._family_dt["@F_test0"].children = set({"@I2@","@I5@"})
+        self.gedcom._individual_dt["@I0@"].fams = set(["@F_test0"])
+        self.gedcom._individual_dt["@I1@"].fams = set(["@F_test0"])
         
 
         #Boys Parents
-        GedcomFile._family_dt["@F_test1"].husband_id = "@I2@"
-        GedcomFile._family_dt["@F_test1"].wife_id =    "@I3@"
-        GedcomFile._family_dt["@F_test1"].children = set({"@I10@"})
-        GedcomFile._individual_dt["@I2@"].fams = set(["@F_test1"])
-        GedcomFile._individual_dt["@I3@"].fams = set(["@F_test1"])
-        GedcomFile._individual_dt["@I2@"].famc = set(["@F_test0"])
+        self.gedcom._family_dt["@F_test1"].husband_id = "@I2@"
+        self.gedcom._family_dt["@F_test1"].wife_id =    "@I3@"
+        self.gedcom._family_dt["@F_test1"].children = set({"@I10@"})
+        self.gedcom._individual_dt["@I2@"].fams = set(["@F_test1"])
+        self.gedcom._individual_dt["@I3@"].fams = set(["@F_test1"])
+        self.gedcom._individual_dt["@I2@"].famc = set(["@F_test0"])
 
         #Girls Parents
-        GedcomFile._family_dt["@F_test2"].husband_id = "@I4@"
-        GedcomFile._family_dt["@F_test2"].wife_id =    "@I5@"
-        GedcomFile._family_dt["@F_test2"].children = set({"@I11@"})
-        GedcomFile._individual_dt["@I4@"].fams = set(["@F_test2"])
-        GedcomFile._individual_dt["@I5@"].fams = set(["@F_test2"])
-        GedcomFile._individual_dt["@I5@"].famc = set(["@F_test0"])
+        self.gedcom._family_dt["@F_test2"].husband_id = "@I4@"
+        self.gedcom._family_dt["@F_test2"].wife_id =    "@I5@"
+        self.gedcom._family_dt["@F_test2"].children = set({"@I11@"})
+        self.gedcom._individual_dt["@I4@"].fams = set(["@F_test2"])
+        self.gedcom._individual_dt["@I5@"].fams = set(["@F_test2"])
+        self.gedcom._individual_dt["@I5@"].famc = set(["@F_test0"])
 
         #fam3
-        GedcomFile._family_dt["@F_test5"].husband_id = "@I10@"
-        GedcomFile._family_dt["@F_test5"].wife_id =    "@I11@"
-        GedcomFile._individual_dt["@I10@"].fams = set(["@F_test5"])
-        GedcomFile._individual_dt["@I11@"].fams = set(["@F_test5"])
-        GedcomFile._individual_dt["@I10@"].famc = set(["@F_test1"])
-        GedcomFile._individual_dt["@I11@"].famc = set(["@F_test2"])
+        self.gedcom._family_dt["@F_test5"].husband_id = "@I10@"
+        self.gedcom._family_dt["@F_test5"].wife_id =    "@I11@"
+        self.gedcom._individual_dt["@I10@"].fams = set(["@F_test5"])
+        self.gedcom._individual_dt["@I11@"].fams = set(["@F_test5"])
+        self.gedcom._individual_dt["@I10@"].famc = set(["@F_test1"])
+        self.gedcom._individual_dt["@I11@"].famc = set(["@F_test2"])
 
         result = GedcomFile.US19_married_first_cousins(self.gedcom)
         self.assertEqual(["@F_test5"],result)
 
     def test_US14(self):
-        GedcomFile._family_dt["@F_test0"].husband_id = "@I0@"
-        GedcomFile._family_dt["@F_test0"].wife_id =    "@I1@"
-        GedcomFile._family_dt["@F_test0"].children = set({"@I2@","@I3@","@I4@","@I5@","@I6@","@I7@","@I8@"})
-
-        GedcomFile._individual_dt["@I0@"].fams = set(["@F_test0"])
-        GedcomFile._individual_dt["@I1@"].fams = set(["@F_test0"])
-        GedcomFile._individual_dt["@I2@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I3@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I4@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I5@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I6@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I7@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I8@"].famc = set(["@F_test0"])
-
-
-        GedcomFile._individual_dt["@I0@"].birth = datetime.date(1960,5,19)
-        GedcomFile._individual_dt["@I0@"].setAge()
-        GedcomFile._individual_dt["@I1@"].birth = datetime.date(1961,6,19)
-        GedcomFile._individual_dt["@I1@"].setAge()
-        GedcomFile._individual_dt["@I2@"].birth = datetime.date(2000,4,29)
-        GedcomFile._individual_dt["@I2@"].setAge()
-        GedcomFile._individual_dt["@I3@"].birth = datetime.date(2000,4,29)
-        GedcomFile._individual_dt["@I3@"].setAge()
-        GedcomFile._individual_dt["@I4@"].birth = datetime.date(2000,4,29)
-        GedcomFile._individual_dt["@I4@"].setAge()
-        GedcomFile._individual_dt["@I5@"].birth = datetime.date(2000,4,29)
-        GedcomFile._individual_dt["@I5@"].setAge()
-        GedcomFile._individual_dt["@I6@"].birth = datetime.date(2000,4,29)
-        GedcomFile._individual_dt["@I6@"].setAge()
-        GedcomFile._individual_dt["@I7@"].birth = datetime.date(2000,4,29)
-        GedcomFile._individual_dt["@I7@"].setAge()
-        GedcomFile._individual_dt["@I8@"].birth = datetime.date(2000,4,29)
-        GedcomFile._individual_dt["@I8@"].setAge()
+        self.gedcom._family_dt["@F_test0"].husband_id = "@I0@"
+        self.gedcom._family_dt["@F_test0"].wife_id =    "@I1@"
+        self.gedcom._family_dt["@F_test0"].children = set({"@I2@","@I3@","@I4@","@I5@","@I6@","@I7@","@I8@"})
+
+        self.gedcom._individual_dt["@I0@"].fams = set(["@F_test0"])
+        self.gedcom._individual_dt["@I1@"].fams = set(["@F_test0"])
+        self.gedcom._individual_dt["@I2@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I3@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I4@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I5@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I6@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I7@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I8@"].famc = set(["@F_test0"])
+
+
+        self.gedcom._individual_dt["@I0@"].birth = datetime.date(1960,5,19)
+        self.gedcom._individual_dt["@I0@"].setAge()
+        self.gedcom._individual_dt["@I1@"].birth = datetime.date(1961,6,19)
+        self.gedcom._individual_dt["@I1@"].setAge()
+        self.gedcom._individual_dt["@I2@"].birth = datetime.date(2000,4,29)
+        self.gedcom._individual_dt["@I2@"].setAge()
+        self.gedcom._individual_dt["@I3@"].birth = datetime.date(2000,4,29)
+        self.gedcom._individual_dt["@I3@"].setAge()
+        self.gedcom._individual_dt["@I4@"].birth = datetime.date(2000,4,29)
+        self.gedcom._individual_dt["@I4@"].setAge()
+        self.gedcom._individual_dt["@I5@"].birth = datetime.date(2000,4,29)
+        self.gedcom._individual_dt["@I5@"].setAge()
+        self.gedcom._individual_dt["@I6@"].birth = datetime.date(2000,4,29)
+        self.gedcom._individual_dt["@I6@"].setAge()
+        self.gedcom._individual_dt["@I7@"].birth = datetime.date(2000,4,29)
+        self.gedcom._individual_dt["@I7@"].setAge()
+        self.gedcom._individual_dt["@I8@"].birth = datetime.date(2000,4,29)
+        self.gedcom._individual_dt["@I8@"].setAge()
 
         result = GedcomFile.US14_multiple_births(self.gedcom)
         self.assertEqual(['@F_test0'], result)
@@ -542,9 +555,9 @@ class main_testing(unittest.TestCase):
     def test_US15(self):
         '''Testing use case 15'''
 
-        GedcomFile._family_dt["@F_test0"].husband_id = "@I0@"
-        GedcomFile._family_dt["@F_test0"].wife_id =    "@I1@"
-        GedcomFile._family_dt["@F_test0"].children = set(["@I2@","@I3@","@I4@","@I5@","@I6@","@I7@","@I8@","@I9@","@I10@","@I11@","@I12@","@I13@","@I14@","@I15@","@I16@","@I17@"])
+        self.gedcom._family_dt["@F_test0"].husband_id = "@I0@"
+        self.gedcom._family_dt["@F_test0"].wife_id =    "@I1@"
+        self.gedcom._family_dt["@F_test0"].children = set(["@I2@","@I3@","@I4@","@I5@","@I6@","@I7@","@I8@","@I9@","@I10@","@I11@","@I12@","@I13@","@I14@","@I15@","@I16@","@I17@"])
 
 
         # Add more individuals and assign IDs and names.
@@ -557,26 +570,26 @@ class main_testing(unittest.TestCase):
             person.name = "Test " + "Subject"+ str(i)
             person.living = True
             person.sex = "M"
-            GedcomFile._individual_dt[person.id] = person
+            self.gedcom._individual_dt[person.id] = person
         
-        GedcomFile._individual_dt["@I0@"].fams = set(["@F_test0"])
-        GedcomFile._individual_dt["@I1@"].fams = set(["@F_test0"])
-        GedcomFile._individual_dt["@I2@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I3@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I4@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I5@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I6@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I7@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I8@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I9@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I10@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I11@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I12@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I13@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I14@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I15@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I16@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I17@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I0@"].fams = set(["@F_test0"])
+        self.gedcom._individual_dt["@I1@"].fams = set(["@F_test0"])
+        self.gedcom._individual_dt["@I2@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I3@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I4@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I5@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I6@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I7@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I8@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I9@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I10@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I11@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I12@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I13@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I14@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I15@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I16@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I17@"].famc = set(["@F_test0"])
 
         result = GedcomFile.US15_siblings15(self.gedcom)
         self.assertEqual(['@F_test0'], result)
@@ -587,23 +600,23 @@ class main_testing(unittest.TestCase):
 
     def test_US36_recently_deceased(self):
         # Initialize Inputs 
-        GedcomFile._individual_dt["@I0@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=29))
-        GedcomFile._individual_dt["@I1@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=30))
-        GedcomFile._individual_dt["@I2@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=31))
-        GedcomFile._individual_dt["@I3@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=0))
-        GedcomFile._individual_dt["@I4@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=365*40))
-        GedcomFile._individual_dt["@I5@"].death_date =  datetime.datetime.date(self.today + datetime.timedelta(days=1))
-        GedcomFile._individual_dt["@I6@"].death_date =  datetime.datetime.date(self.today + datetime.timedelta(days=365*40))
-        GedcomFile._individual_dt["@I7@"].death_date =  ""
-        GedcomFile._individual_dt["@I8@"].death_date =  "NA"
-        GedcomFile._individual_dt["@I9@"].death_date =  "28 JAN 1940"
+        self.gedcom._individual_dt["@I0@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=29))
+        self.gedcom._individual_dt["@I1@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=30))
+        self.gedcom._individual_dt["@I2@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=31))
+        self.gedcom._individual_dt["@I3@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=0))
+        self.gedcom._individual_dt["@I4@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=365*40))
+        self.gedcom._individual_dt["@I5@"].death_date =  datetime.datetime.date(self.today + datetime.timedelta(days=1))
+        self.gedcom._individual_dt["@I6@"].death_date =  datetime.datetime.date(self.today + datetime.timedelta(days=365*40))
+        self.gedcom._individual_dt["@I7@"].death_date =  ""
+        self.gedcom._individual_dt["@I8@"].death_date =  "NA"
+        self.gedcom._individual_dt["@I9@"].death_date =  "28 JAN 1940"
 
         #Initialize expected results. 
         # We expect only the death dates that fall within the past 30 days. Therefore, @I0@, @I1@, and @I3@
         expected_results = list()
-        expected_results.append(["@I0@", GedcomFile._individual_dt["@I0@"].name, GedcomFile._individual_dt["@I0@"].death_date])
-        expected_results.append(["@I1@", GedcomFile._individual_dt["@I1@"].name, GedcomFile._individual_dt["@I1@"].death_date])
-        expected_results.append(["@I3@", GedcomFile._individual_dt["@I3@"].name, GedcomFile._individual_dt["@I3@"].death_date])
+        expected_results.append(["@I0@", self.gedcom._individual_dt["@I0@"].name, self.gedcom._individual_dt["@I0@"].death_date])
+        expected_results.append(["@I1@", self.gedcom._individual_dt["@I1@"].name, self.gedcom._individual_dt["@I1@"].death_date])
+        expected_results.append(["@I3@", self.gedcom._individual_dt["@I3@"].name, self.gedcom._individual_dt["@I3@"].death_date])
 
         #Invoke method under test 
         actual = self.gedcom.find_deceased_within30days()
@@ -631,25 +644,25 @@ class main_testing(unittest.TestCase):
         #
         # Therefore Descendants of @I0@ are Children (@I2@), grand children (@I4@), and great-grand-children (@I6@, @I8@, @I10@) 
         #
-        GedcomFile._family_dt["@F_test0"].husband_id = "@I0@"
-        GedcomFile._family_dt["@F_test0"].wife_id =    "@I1@"
-        GedcomFile._family_dt["@F_test0"].children = set({"@I2@"})
+        self.gedcom._family_dt["@F_test0"].husband_id = "@I0@"
+        self.gedcom._family_dt["@F_test0"].wife_id =    "@I1@"
+        self.gedcom._family_dt["@F_test0"].children = set({"@I2@"})
 
-        GedcomFile._family_dt["@F_test1"].husband_id = "@I2@"
-        GedcomFile._family_dt["@F_test1"].wife_id =    "@I3@"
-        GedcomFile._family_dt["@F_test1"].children = set({"@I4@"})
+        self.gedcom._family_dt["@F_test1"].husband_id = "@I2@"
+        self.gedcom._family_dt["@F_test1"].wife_id =    "@I3@"
+        self.gedcom._family_dt["@F_test1"].children = set({"@I4@"})
 
-        GedcomFile._family_dt["@F_test2"].husband_id = "@I4@"
-        GedcomFile._family_dt["@F_test2"].wife_id =    "@I5@"
-        GedcomFile._family_dt["@F_test2"].children = set({"@I6@", "@I8@", "@I10@"})
+        self.gedcom._family_dt["@F_test2"].husband_id = "@I4@"
+        self.gedcom._family_dt["@F_test2"].wife_id =    "@I5@"
+        self.gedcom._family_dt["@F_test2"].children = set({"@I6@", "@I8@", "@I10@"})
 
-        GedcomFile._individual_dt["@I0@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=29))
-        GedcomFile._individual_dt["@I0@"].living = False
-        GedcomFile._individual_dt["@I10@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=31))
-        GedcomFile._individual_dt["@I10@"].living = False
+        self.gedcom._individual_dt["@I0@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=29))
+        self.gedcom._individual_dt["@I0@"].living = False
+        self.gedcom._individual_dt["@I10@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=31))
+        self.gedcom._individual_dt["@I10@"].living = False
 
         if divorced:
-            GedcomFile._family_dt["@F_test0"].divorce_date = GedcomFile._individual_dt["@I0@"].death_date - datetime.timedelta(days=500)
+            self.gedcom._family_dt["@F_test0"].divorce_date = self.gedcom._individual_dt["@I0@"].death_date - datetime.timedelta(days=500)
 
         #Initialize expected results. 
         # Define ALL Descendants.
@@ -669,28 +682,28 @@ class main_testing(unittest.TestCase):
         # Start by adding the spouse:
         if divorced:
             expected_pt.add_row([
-                                    GedcomFile._individual_dt["@I0@"].id,
-                                    GedcomFile._individual_dt["@I0@"].name,
-                                    GedcomFile._individual_dt["@I1@"].id,
-                                    GedcomFile._individual_dt["@I1@"].name,
+                                    self.gedcom._individual_dt["@I0@"].id,
+                                    self.gedcom._individual_dt["@I0@"].name,
+                                    self.gedcom._individual_dt["@I1@"].id,
+                                    self.gedcom._individual_dt["@I1@"].name,
                                     "Ex-Spouse"
                             ])
         else:
             expected_pt.add_row([
-                                    GedcomFile._individual_dt["@I0@"].id,
-                                    GedcomFile._individual_dt["@I0@"].name,
-                                    GedcomFile._individual_dt["@I1@"].id,
-                                    GedcomFile._individual_dt["@I1@"].name,
+                                    self.gedcom._individual_dt["@I0@"].id,
+                                    self.gedcom._individual_dt["@I0@"].name,
+                                    self.gedcom._individual_dt["@I1@"].id,
+                                    self.gedcom._individual_dt["@I1@"].name,
                                     "Spouse"
                             ])
         for entry in expected_descendants:
             if entry == "@I10@":
                 continue
             expected_pt.add_row([
-                                 GedcomFile._individual_dt["@I0@"].id,
-                                 GedcomFile._individual_dt["@I0@"].name,
-                                 GedcomFile._individual_dt[entry].id,
-                                 GedcomFile._individual_dt[entry].name,
+                                 self.gedcom._individual_dt["@I0@"].id,
+                                 self.gedcom._individual_dt["@I0@"].name,
+                                 self.gedcom._individual_dt[entry].id,
+                                 self.gedcom._individual_dt[entry].name,
                                  "Descendant"
                                 ])
         expected_pt.sortby = "Recently Deceased ID"
@@ -719,24 +732,24 @@ class main_testing(unittest.TestCase):
         #
         # Therefore Descendants of @I0@ are Children (@I2@), grand children (@I4@), and great-grand-children (@I6@, @I8@, @I10@) 
         #
-        GedcomFile._family_dt["@F_test0"].husband_id = "@I0@"
-        GedcomFile._family_dt["@F_test0"].wife_id =    "@I1@"
-        GedcomFile._family_dt["@F_test0"].children = set(["@I2@"])
+        self.gedcom._family_dt["@F_test0"].husband_id = "@I0@"
+        self.gedcom._family_dt["@F_test0"].wife_id =    "@I1@"
+        self.gedcom._family_dt["@F_test0"].children = set(["@I2@"])
 
-        GedcomFile._family_dt["@F_test1"].husband_id = "@I2@"
-        GedcomFile._family_dt["@F_test1"].wife_id =    "@I3@"
-        GedcomFile._family_dt["@F_test1"].children = set(["@I4@"])
+        self.gedcom._family_dt["@F_test1"].husband_id = "@I2@"
+        self.gedcom._family_dt["@F_test1"].wife_id =    "@I3@"
+        self.gedcom._family_dt["@F_test1"].children = set(["@I4@"])
 
-        GedcomFile._family_dt["@F_test2"].husband_id = "@I4@"
-        GedcomFile._family_dt["@F_test2"].wife_id =    "@I5@"
-        GedcomFile._family_dt["@F_test2"].children = set(["@I6@", "@I8@", "@I10@"])
+        self.gedcom._family_dt["@F_test2"].husband_id = "@I4@"
+        self.gedcom._family_dt["@F_test2"].wife_id =    "@I5@"
+        self.gedcom._family_dt["@F_test2"].children = set(["@I6@", "@I8@", "@I10@"])
 
-        GedcomFile._individual_dt["@I0@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=29))
-        GedcomFile._individual_dt["@I0@"].living = False
-        GedcomFile._individual_dt["@I3@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=1))
-        GedcomFile._individual_dt["@I3@"].living = False
-        GedcomFile._individual_dt["@I10@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=31))
-        GedcomFile._individual_dt["@I10@"].living = False
+        self.gedcom._individual_dt["@I0@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=29))
+        self.gedcom._individual_dt["@I0@"].living = False
+        self.gedcom._individual_dt["@I3@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=1))
+        self.gedcom._individual_dt["@I3@"].living = False
+        self.gedcom._individual_dt["@I10@"].death_date =  datetime.datetime.date(self.today - datetime.timedelta(days=31))
+        self.gedcom._individual_dt["@I10@"].living = False
 
         # Test the descendants method for the 1st family who had a recent death.
         expected_descendants_1 = ["@I2@", "@I4@", "@I6@", "@I8@", "@I10@"]
@@ -765,40 +778,40 @@ class main_testing(unittest.TestCase):
 
         # Handle first family. Start by adding the spouse:
         expected_pt.add_row([
-                                GedcomFile._individual_dt["@I0@"].id,
-                                GedcomFile._individual_dt["@I0@"].name,
-                                GedcomFile._individual_dt["@I1@"].id,
-                                GedcomFile._individual_dt["@I1@"].name,
+                                self.gedcom._individual_dt["@I0@"].id,
+                                self.gedcom._individual_dt["@I0@"].name,
+                                self.gedcom._individual_dt["@I1@"].id,
+                                self.gedcom._individual_dt["@I1@"].name,
                                 "Spouse"
                             ])
         for entry in expected_descendants_1:
             if entry == "@I10@":
                 continue
             expected_pt.add_row([
-                                 GedcomFile._individual_dt["@I0@"].id,
-                                 GedcomFile._individual_dt["@I0@"].name,
-                                 GedcomFile._individual_dt[entry].id,
-                                 GedcomFile._individual_dt[entry].name,
+                                 self.gedcom._individual_dt["@I0@"].id,
+                                 self.gedcom._individual_dt["@I0@"].name,
+                                 self.gedcom._individual_dt[entry].id,
+                                 self.gedcom._individual_dt[entry].name,
                                  "Descendant"
                                 ])
 
         
         # Handle second family. Start by adding the spouse
         expected_pt.add_row([
-                                GedcomFile._individual_dt["@I3@"].id,
-                                GedcomFile._individual_dt["@I3@"].name,
-                                GedcomFile._individual_dt["@I2@"].id,
-                                GedcomFile._individual_dt["@I2@"].name,
+                                self.gedcom._individual_dt["@I3@"].id,
+                                self.gedcom._individual_dt["@I3@"].name,
+                                self.gedcom._individual_dt["@I2@"].id,
+                                self.gedcom._individual_dt["@I2@"].name,
                                 "Spouse"
                             ])
         for entry in expected_descendants_2:
             if entry == "@I10@":
                 continue
             expected_pt.add_row([
-                                 GedcomFile._individual_dt["@I3@"].id,
-                                 GedcomFile._individual_dt["@I3@"].name,
-                                 GedcomFile._individual_dt[entry].id,
-                                 GedcomFile._individual_dt[entry].name,
+                                 self.gedcom._individual_dt["@I3@"].id,
+                                 self.gedcom._individual_dt["@I3@"].name,
+                                 self.gedcom._individual_dt[entry].id,
+                                 self.gedcom._individual_dt[entry].name,
                                  "Descendant"
                                 ])
 
@@ -810,34 +823,34 @@ class main_testing(unittest.TestCase):
 
 
     def test_US01_dates_b4_current(self):
-        GedcomFile._family_dt["@F_test0"].marriage_date = datetime.datetime.date(self.today + datetime.timedelta(days=1))
-        GedcomFile._family_dt["@F_test1"].divorce_date = datetime.datetime.date(self.today + datetime.timedelta(days=365))
-        GedcomFile._individual_dt["@I5@"].name = "Safa /Alofi/"
-        GedcomFile._individual_dt["@I5@"].birth = datetime.datetime.date(self.today + datetime.timedelta(days=30))
-        GedcomFile._individual_dt["@I6@"].name = "Rana /Alofi/"
-        GedcomFile._individual_dt["@I6@"].death_date =  datetime.datetime.date(self.today + datetime.timedelta(days=365*100))
-        GedcomFile._individual_dt["@I7@"].name = "Mike /Jones/"
-        GedcomFile._individual_dt["@I7@"].birth = datetime.datetime.date(self.today + datetime.timedelta(days=0))
+        self.gedcom._family_dt["@F_test0"].marriage_date = datetime.datetime.date(self.today + datetime.timedelta(days=1))
+        self.gedcom._family_dt["@F_test1"].divorce_date = datetime.datetime.date(self.today + datetime.timedelta(days=365))
+        self.gedcom._individual_dt["@I5@"].name = "Safa /Alofi/"
+        self.gedcom._individual_dt["@I5@"].birth = datetime.datetime.date(self.today + datetime.timedelta(days=30))
+        self.gedcom._individual_dt["@I6@"].name = "Rana /Alofi/"
+        self.gedcom._individual_dt["@I6@"].death_date =  datetime.datetime.date(self.today + datetime.timedelta(days=365*100))
+        self.gedcom._individual_dt["@I7@"].name = "Mike /Jones/"
+        self.gedcom._individual_dt["@I7@"].birth = datetime.datetime.date(self.today + datetime.timedelta(days=0))
         result = GedcomFile.US01_dates_b4_current(self.gedcom)
-        expect = [f"Error US01 Family'ID:@F_test0 has marriage dates on {GedcomFile._family_dt['@F_test0'].marriage_date} after current date", 
-                  f"Error US01 Family'ID:@F_test1 has divorce date on {GedcomFile._family_dt['@F_test1'].divorce_date} after current date", 
-                  f"Error US01 Individual'ID:@I5@ has birth date on {GedcomFile._individual_dt['@I5@'].birth} after current date", 
-                  f"Error US01 Individual'ID:@I6@ has death date on {GedcomFile._individual_dt['@I6@'].death_date} after current date"]
+        expect = [f"Error US01 Family'ID:@F_test0 has marriage dates on {self.gedcom._family_dt['@F_test0'].marriage_date} after current date", 
+                  f"Error US01 Family'ID:@F_test1 has divorce date on {self.gedcom._family_dt['@F_test1'].divorce_date} after current date", 
+                  f"Error US01 Individual'ID:@I5@ has birth date on {self.gedcom._individual_dt['@I5@'].birth} after current date", 
+                  f"Error US01 Individual'ID:@I6@ has death date on {self.gedcom._individual_dt['@I6@'].death_date} after current date"]
         self.assertEqual(expect, result)
     
     def test_US17_no_marraige_2_children(self):
-        GedcomFile._family_dt["@F_test0"].id = "@F_test0@"
-        GedcomFile._family_dt["@F_test0"].husband_name = "Rami /Alofi/"
-        GedcomFile._family_dt["@F_test0"].husband_id = "@I2@"
-        GedcomFile._family_dt["@F_test0"].wife_name = "Lana /Alofi/"
-        GedcomFile._family_dt["@F_test0"].wife_id= "@I5@"
-        GedcomFile._family_dt["@F_test0"].children = "@I5@"
-        GedcomFile._family_dt["@F_test1"].id = "@F_test1@"
-        GedcomFile._family_dt["@F_test1"].husband_name = "Saad /Alofi/"
-        GedcomFile._family_dt["@F_test1"].husband_id = "@I3@"
-        GedcomFile._family_dt["@F_test1"].wife_name = "Safia /Alofi/"
-        GedcomFile._family_dt["@F_test1"].wife_id= "@I6@"
-        GedcomFile._family_dt["@F_test1"].children = "@I3@"
+        self.gedcom._family_dt["@F_test0"].id = "@F_test0@"
+        self.gedcom._family_dt["@F_test0"].husband_name = "Rami /Alofi/"
+        self.gedcom._family_dt["@F_test0"].husband_id = "@I2@"
+        self.gedcom._family_dt["@F_test0"].wife_name = "Lana /Alofi/"
+        self.gedcom._family_dt["@F_test0"].wife_id= "@I5@"
+        self.gedcom._family_dt["@F_test0"].children = set(["@I5@"])
+        self.gedcom._family_dt["@F_test1"].id = "@F_test1@"
+        self.gedcom._family_dt["@F_test1"].husband_name = "Saad /Alofi/"
+        self.gedcom._family_dt["@F_test1"].husband_id = "@I3@"
+        self.gedcom._family_dt["@F_test1"].wife_name = "Safia /Alofi/"
+        self.gedcom._family_dt["@F_test1"].wife_id= "@I6@"
+        self.gedcom._family_dt["@F_test1"].children = set(["@I3@"])
         result = GedcomFile.US17_no_marraige_2_children(self.gedcom)
         expect = ["Error US17 Family ID @F_test0@ Father: Father's ID @I2@ husban's name Rami /Alofi/ is married to his child's ID @I5@ child's name Lana /Alofi/",
                   "Error US17 Family ID @F_test1@ Mother: wife's ID @I6@ wife's name Safia /Alofi/ is married to her child's ID @I3@ child's name Saad /Alofi/", 
@@ -933,10 +946,10 @@ class main_testing(unittest.TestCase):
 
     def test_US23_uni_name_birth(self):
         # Rise an error if the both individuals have same name and birthdates 
-        GedcomFile._individual_dt["@I5@"].name = "Safa /Alofi/"
-        GedcomFile._individual_dt["@I5@"].birth =  datetime.date(1990,5,16)
-        GedcomFile._individual_dt["@I6@"].name = "Safa /Alofi/"
-        GedcomFile._individual_dt["@I6@"].birth =  datetime.date(1990,5,16)
+        self.gedcom._individual_dt["@I5@"].name = "Safa /Alofi/"
+        self.gedcom._individual_dt["@I5@"].birth =  datetime.date(1990,5,16)
+        self.gedcom._individual_dt["@I6@"].name = "Safa /Alofi/"
+        self.gedcom._individual_dt["@I6@"].birth =  datetime.date(1990,5,16)
         result = GedcomFile.US23_uni_name_birth(self.gedcom)
         expect = ["ERROR US23 Individuals ids @I5@ and name Safa /Alofi/ found duplicated name and birthdate", "ERROR US23 Individuals ids @I6@ and name Safa /Alofi/ found duplicated name and birthdate"] 
         self.assertEqual(expect, result)
@@ -945,12 +958,12 @@ class main_testing(unittest.TestCase):
 
     def test_US02_birth_before_marriage(self):
         # Family 0: birth of individual before their marriage by 1 day (Not possible, but not an error!)
-        GedcomFile._family_dt["@F_test0"].marriage_date = datetime.date(1985,11,11)
-        GedcomFile._individual_dt["@I0@"].birth = datetime.date(1985,11,10)
+        self.gedcom._family_dt["@F_test0"].marriage_date = datetime.date(1985,11,11)
+        self.gedcom._individual_dt["@I0@"].birth = datetime.date(1985,11,10)
 
         # Family 2: birth of individual after their marriage by 1 day (Error Expected)
-        GedcomFile._family_dt["@F_test1"].marriage_date = datetime.date(1985,11,11)
-        GedcomFile._individual_dt["@I2@"].birth = datetime.date(1985,11,12)
+        self.gedcom._family_dt["@F_test1"].marriage_date = datetime.date(1985,11,11)
+        self.gedcom._individual_dt["@I2@"].birth = datetime.date(1985,11,12)
   
         result = GedcomFile.US2_birth_before_marriage(self.gedcom)
         expect = ["ERROR: US2: FAMILY: @F_test1"]
@@ -959,58 +972,58 @@ class main_testing(unittest.TestCase):
 
     def test_US5_marriage_before_death(self):
         # Family 0: marriage occurs after death of husband by 1 day (Error Expected)
-        GedcomFile._family_dt["@F_test0"].marriage_date = datetime.date(1985,11,11)
-        id = GedcomFile._family_dt["@F_test0"].husband_id
-        GedcomFile._individual_dt[id].death_date = datetime.date(1985,11,10)
-        GedcomFile._individual_dt[id].living = False
-        id = GedcomFile._family_dt["@F_test0"].wife_id
-        GedcomFile._individual_dt[id].death_date = "NA"
-        GedcomFile._individual_dt[id].living = True
+        self.gedcom._family_dt["@F_test0"].marriage_date = datetime.date(1985,11,11)
+        id = self.gedcom._family_dt["@F_test0"].husband_id
+        self.gedcom._individual_dt[id].death_date = datetime.date(1985,11,10)
+        self.gedcom._individual_dt[id].living = False
+        id = self.gedcom._family_dt["@F_test0"].wife_id
+        self.gedcom._individual_dt[id].death_date = "NA"
+        self.gedcom._individual_dt[id].living = True
 
         # Family 1: marriage occurs after death of wife by 1 day (Error Expected)
-        GedcomFile._family_dt["@F_test1"].marriage_date = datetime.date(1985,11,11)
-        id = GedcomFile._family_dt["@F_test1"].wife_id
-        GedcomFile._individual_dt[id].death_date = datetime.date(1985,11,10)
-        GedcomFile._individual_dt[id].living = False
-        id = GedcomFile._family_dt["@F_test1"].husband_id
-        GedcomFile._individual_dt[id].death_date = "NA"
-        GedcomFile._individual_dt[id].living = True
+        self.gedcom._family_dt["@F_test1"].marriage_date = datetime.date(1985,11,11)
+        id = self.gedcom._family_dt["@F_test1"].wife_id
+        self.gedcom._individual_dt[id].death_date = datetime.date(1985,11,10)
+        self.gedcom._individual_dt[id].living = False
+        id = self.gedcom._family_dt["@F_test1"].husband_id
+        self.gedcom._individual_dt[id].death_date = "NA"
+        self.gedcom._individual_dt[id].living = True
 
         # Family 2: marriage occurs before death of husband by 1 day (no error expected)
-        GedcomFile._family_dt["@F_test2"].marriage_date = datetime.date(1985,11,11)
-        id = GedcomFile._family_dt["@F_test2"].husband_id
-        GedcomFile._individual_dt[id].death_date = datetime.date(1985,11,12)
-        GedcomFile._individual_dt[id].living = False
-        id = GedcomFile._family_dt["@F_test2"].wife_id
-        GedcomFile._individual_dt[id].death_date = "NA"
-        GedcomFile._individual_dt[id].living = True
+        self.gedcom._family_dt["@F_test2"].marriage_date = datetime.date(1985,11,11)
+        id = self.gedcom._family_dt["@F_test2"].husband_id
+        self.gedcom._individual_dt[id].death_date = datetime.date(1985,11,12)
+        self.gedcom._individual_dt[id].living = False
+        id = self.gedcom._family_dt["@F_test2"].wife_id
+        self.gedcom._individual_dt[id].death_date = "NA"
+        self.gedcom._individual_dt[id].living = True
 
         # Family 3: marriage occurs before death of wife by 1 day (no error expected)
-        GedcomFile._family_dt["@F_test3"].marriage_date = datetime.date(1985,11,11)
-        id = GedcomFile._family_dt["@F_test3"].wife_id
-        GedcomFile._individual_dt[id].death_date = datetime.date(1985,11,12)
-        GedcomFile._individual_dt[id].living = False
-        id = GedcomFile._family_dt["@F_test3"].husband_id
-        GedcomFile._individual_dt[id].death_date = "NA"
-        GedcomFile._individual_dt[id].living = True
+        self.gedcom._family_dt["@F_test3"].marriage_date = datetime.date(1985,11,11)
+        id = self.gedcom._family_dt["@F_test3"].wife_id
+        self.gedcom._individual_dt[id].death_date = datetime.date(1985,11,12)
+        self.gedcom._individual_dt[id].living = False
+        id = self.gedcom._family_dt["@F_test3"].husband_id
+        self.gedcom._individual_dt[id].death_date = "NA"
+        self.gedcom._individual_dt[id].living = True
 
         # Family 4: marriage occurs after death of husband and wife by 1 day (Error Expected twice!)
-        GedcomFile._family_dt["@F_test4"].marriage_date = datetime.date(1985,11,11)
-        id = GedcomFile._family_dt["@F_test4"].wife_id
-        GedcomFile._individual_dt[id].death_date = datetime.date(1985,11,10)
-        GedcomFile._individual_dt[id].living = False
-        id = GedcomFile._family_dt["@F_test4"].husband_id
-        GedcomFile._individual_dt[id].death_date = datetime.date(1985,11,10)
-        GedcomFile._individual_dt[id].living = False
+        self.gedcom._family_dt["@F_test4"].marriage_date = datetime.date(1985,11,11)
+        id = self.gedcom._family_dt["@F_test4"].wife_id
+        self.gedcom._individual_dt[id].death_date = datetime.date(1985,11,10)
+        self.gedcom._individual_dt[id].living = False
+        id = self.gedcom._family_dt["@F_test4"].husband_id
+        self.gedcom._individual_dt[id].death_date = datetime.date(1985,11,10)
+        self.gedcom._individual_dt[id].living = False
 
         # Family 5: marriage occurs before death of husband and wife by 1 day (No Error Expected)
-        GedcomFile._family_dt["@F_test5"].marriage_date = datetime.date(1985,11,11)
-        id = GedcomFile._family_dt["@F_test5"].wife_id
-        GedcomFile._individual_dt[id].death_date = datetime.date(1985,11,12)
-        GedcomFile._individual_dt[id].living = False
-        id = GedcomFile._family_dt["@F_test5"].husband_id
-        GedcomFile._individual_dt[id].death_date = datetime.date(1985,11,12)
-        GedcomFile._individual_dt[id].living = False
+        self.gedcom._family_dt["@F_test5"].marriage_date = datetime.date(1985,11,11)
+        id = self.gedcom._family_dt["@F_test5"].wife_id
+        self.gedcom._individual_dt[id].death_date = datetime.date(1985,11,12)
+        self.gedcom._individual_dt[id].living = False
+        id = self.gedcom._family_dt["@F_test5"].husband_id
+        self.gedcom._individual_dt[id].death_date = datetime.date(1985,11,12)
+        self.gedcom._individual_dt[id].living = False
 
         result = GedcomFile.US5_marriage_before_death(self.gedcom)
         expect = [
@@ -1026,32 +1039,32 @@ class main_testing(unittest.TestCase):
         '''tests that the method implemented for US28 correctly orders sibling for every family: from Oldest to Youngest'''
 
         # Define 1st family with 3 children of different ages.
-        GedcomFile._family_dt["@F_test0"].children = set(["@I3@", "@I4@", "@I6@"])
-        GedcomFile._individual_dt["@I3@"].age = 30
-        GedcomFile._individual_dt["@I3@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I4@"].age = 18
-        GedcomFile._individual_dt["@I4@"].famc = set(["@F_test0"])
-        GedcomFile._individual_dt["@I6@"].age = 26
-        GedcomFile._individual_dt["@I6@"].famc = set(["@F_test0"])
+        self.gedcom._family_dt["@F_test0"].children = set(["@I3@", "@I4@", "@I6@"])
+        self.gedcom._individual_dt["@I3@"].age = 30
+        self.gedcom._individual_dt["@I3@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I4@"].age = 18
+        self.gedcom._individual_dt["@I4@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I6@"].age = 26
+        self.gedcom._individual_dt["@I6@"].famc = set(["@F_test0"])
 
         # Define a second fammily with 3 children of different ages.
-        GedcomFile._family_dt["@F_test1"].children = set(["@I2@", "@I5@", "@I7@"])
-        GedcomFile._individual_dt["@I2@"].age = 35
-        GedcomFile._individual_dt["@I2@"].famc = set(["@F_test1"])
-        GedcomFile._individual_dt["@I5@"].age = 24
-        GedcomFile._individual_dt["@I5@"].famc = set(["@F_test1"])
-        GedcomFile._individual_dt["@I7@"].age = 22
-        GedcomFile._individual_dt["@I7@"].famc = set(["@F_test1"])        
+        self.gedcom._family_dt["@F_test1"].children = set(["@I2@", "@I5@", "@I7@"])
+        self.gedcom._individual_dt["@I2@"].age = 35
+        self.gedcom._individual_dt["@I2@"].famc = set(["@F_test1"])
+        self.gedcom._individual_dt["@I5@"].age = 24
+        self.gedcom._individual_dt["@I5@"].famc = set(["@F_test1"])
+        self.gedcom._individual_dt["@I7@"].age = 22
+        self.gedcom._individual_dt["@I7@"].famc = set(["@F_test1"])        
         
         result: List[List[str]] = GedcomFile.US28_list_all_siblings_from_oldest_to_youngest(self.gedcom)
 
         expected: List[List[str]] = [
-                                    ['@F_test0', '@I3@', GedcomFile._individual_dt["@I3@"].name, 30],
-                                    ['@F_test0', '@I6@', GedcomFile._individual_dt["@I6@"].name, 26],
-                                    ['@F_test0', '@I4@', GedcomFile._individual_dt["@I4@"].name, 18],
-                                    ['@F_test1', '@I2@', GedcomFile._individual_dt["@I2@"].name, 35],
-                                    ['@F_test1', '@I5@', GedcomFile._individual_dt["@I5@"].name, 24],
-                                    ['@F_test1', '@I7@', GedcomFile._individual_dt["@I7@"].name, 22],
+                                    ['@F_test0', '@I3@', self.gedcom._individual_dt["@I3@"].name, 30],
+                                    ['@F_test0', '@I6@', self.gedcom._individual_dt["@I6@"].name, 26],
+                                    ['@F_test0', '@I4@', self.gedcom._individual_dt["@I4@"].name, 18],
+                                    ['@F_test1', '@I2@', self.gedcom._individual_dt["@I2@"].name, 35],
+                                    ['@F_test1', '@I5@', self.gedcom._individual_dt["@I5@"].name, 24],
+                                    ['@F_test1', '@I7@', self.gedcom._individual_dt["@I7@"].name, 22],
                                     ]
                                    
 
@@ -1088,47 +1101,47 @@ class main_testing(unittest.TestCase):
 
     def test_US32_Multiple_Births(self) -> None:
         # Define 1st family with 5 children. 3 are multiple birth, 2 are not.
-        GedcomFile._family_dt["@F_test0"].children = set(["@I3@", "@I4@", "@I6@", "@I8@", "@I10@"])
+        self.gedcom._family_dt["@F_test0"].children = set(["@I3@", "@I4@", "@I6@", "@I8@", "@I10@"])
 
         # These 3 are born one day apart (part of same multiple birth)
-        GedcomFile._individual_dt["@I3@"].birth = datetime.date(1980, 1, 1)
-        GedcomFile._individual_dt["@I4@"].birth = datetime.date(1979, 12, 31)
-        GedcomFile._individual_dt["@I6@"].birth = datetime.date(1980, 1, 1)
+        self.gedcom._individual_dt["@I3@"].birth = datetime.date(1980, 1, 1)
+        self.gedcom._individual_dt["@I4@"].birth = datetime.date(1979, 12, 31)
+        self.gedcom._individual_dt["@I6@"].birth = datetime.date(1980, 1, 1)
 
         # These 2 are not part of multiple birth
-        GedcomFile._individual_dt["@I8@"].birth = datetime.date(1985, 1, 1)
-        GedcomFile._individual_dt["@I10@"].birth = datetime.date(1986, 1, 1)
+        self.gedcom._individual_dt["@I8@"].birth = datetime.date(1985, 1, 1)
+        self.gedcom._individual_dt["@I10@"].birth = datetime.date(1986, 1, 1)
 
         # Make sure each child is actually part of the test family.
-        for child in GedcomFile._family_dt["@F_test0"].children:
-            GedcomFile._individual_dt[child].living = True
-            GedcomFile._individual_dt[child].setAge()
-            GedcomFile._individual_dt[child].famc = set(["@F_test0"])    
+        for child in self.gedcom._family_dt["@F_test0"].children:
+            self.gedcom._individual_dt[child].living = True
+            self.gedcom._individual_dt[child].setAge()
+            self.gedcom._individual_dt[child].famc = set(["@F_test0"])    
 
 
         # Define 2nd family with 3 children. 2 are multiple birth, 1 is not.
-        GedcomFile._family_dt["@F_test1"].children = set(["@I2@", "@I5@", "@I7@"])
+        self.gedcom._family_dt["@F_test1"].children = set(["@I2@", "@I5@", "@I7@"])
 
         # These 2 are born one day apart (part of same multiple birth)
-        GedcomFile._individual_dt["@I2@"].birth = datetime.date(1980, 1, 1)
-        GedcomFile._individual_dt["@I5@"].birth = datetime.date(1980, 1, 2)
+        self.gedcom._individual_dt["@I2@"].birth = datetime.date(1980, 1, 1)
+        self.gedcom._individual_dt["@I5@"].birth = datetime.date(1980, 1, 2)
 
         # This one is not
-        GedcomFile._individual_dt["@I7@"].birth = datetime.date(1985, 1, 1)
+        self.gedcom._individual_dt["@I7@"].birth = datetime.date(1985, 1, 1)
 
         # Make sure each child is actually part of the test family.
-        for child in GedcomFile._family_dt["@F_test1"].children:
-            GedcomFile._individual_dt[child].living = True
-            GedcomFile._individual_dt[child].setAge()
-            GedcomFile._individual_dt[child].famc = set(["@F_test1"]) 
+        for child in self.gedcom._family_dt["@F_test1"].children:
+            self.gedcom._individual_dt[child].living = True
+            self.gedcom._individual_dt[child].setAge()
+            self.gedcom._individual_dt[child].famc = set(["@F_test1"]) 
 
 
         expected_pt: PrettyTable = PrettyTable(field_names = ['Family ID', 'Child ID', 'Child Name', 'Child Birth Date'])
-        expected_pt.add_row([set(["@F_test0"]), "@I3@", GedcomFile._individual_dt["@I3@"].name, GedcomFile._individual_dt["@I3@"].birth])
-        expected_pt.add_row([set(["@F_test0"]), "@I4@", GedcomFile._individual_dt["@I4@"].name, GedcomFile._individual_dt["@I4@"].birth])
-        expected_pt.add_row([set(["@F_test0"]), "@I6@", GedcomFile._individual_dt["@I6@"].name, GedcomFile._individual_dt["@I6@"].birth])
-        expected_pt.add_row([set(["@F_test1"]), "@I2@", GedcomFile._individual_dt["@I2@"].name, GedcomFile._individual_dt["@I2@"].birth])
-        expected_pt.add_row([set(["@F_test1"]), "@I5@", GedcomFile._individual_dt["@I5@"].name, GedcomFile._individual_dt["@I5@"].birth])
+        expected_pt.add_row([set(["@F_test0"]), "@I3@", self.gedcom._individual_dt["@I3@"].name, self.gedcom._individual_dt["@I3@"].birth])
+        expected_pt.add_row([set(["@F_test0"]), "@I4@", self.gedcom._individual_dt["@I4@"].name, self.gedcom._individual_dt["@I4@"].birth])
+        expected_pt.add_row([set(["@F_test0"]), "@I6@", self.gedcom._individual_dt["@I6@"].name, self.gedcom._individual_dt["@I6@"].birth])
+        expected_pt.add_row([set(["@F_test1"]), "@I2@", self.gedcom._individual_dt["@I2@"].name, self.gedcom._individual_dt["@I2@"].birth])
+        expected_pt.add_row([set(["@F_test1"]), "@I5@", self.gedcom._individual_dt["@I5@"].name, self.gedcom._individual_dt["@I5@"].birth])
 
 
         actual = self.gedcom.US32_list_multiple_births()
@@ -1139,26 +1152,26 @@ class main_testing(unittest.TestCase):
 
     def test_US33_Orphans(self) -> None:
         # Define family with 3 children. Both parents are deceased
-        GedcomFile._family_dt["@F_test0"].children = set(["@I2@", "@I5@", "@I7@"])
-        GedcomFile._individual_dt["@I2@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*18))
-        GedcomFile._individual_dt["@I5@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*17))
-        GedcomFile._individual_dt["@I7@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*19))
+        self.gedcom._family_dt["@F_test0"].children = set(["@I2@", "@I5@", "@I7@"])
+        self.gedcom._individual_dt["@I2@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*18))
+        self.gedcom._individual_dt["@I5@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*17))
+        self.gedcom._individual_dt["@I7@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*19))
 
         # Make sure each child is actually part of the test family.
-        for child in GedcomFile._family_dt["@F_test0"].children:
-            GedcomFile._individual_dt[child].setAge()
-            GedcomFile._individual_dt[child].famc = set(["@F_test0"]) 
+        for child in self.gedcom._family_dt["@F_test0"].children:
+            self.gedcom._individual_dt[child].setAge()
+            self.gedcom._individual_dt[child].famc = set(["@F_test0"]) 
 
-        father = GedcomFile._family_dt["@F_test0"].husband_id
-        mother = GedcomFile._family_dt["@F_test0"].wife_id
+        father = self.gedcom._family_dt["@F_test0"].husband_id
+        mother = self.gedcom._family_dt["@F_test0"].wife_id
 
 
 
         #####Test 1: Both parents deceased
-        GedcomFile._individual_dt[father].living = False
-        GedcomFile._individual_dt[mother].living = False
+        self.gedcom._individual_dt[father].living = False
+        self.gedcom._individual_dt[mother].living = False
         expected_pt: PrettyTable = PrettyTable(field_names = ['Family ID (as child)', 'Individual ID', 'Name']) 
-        expected_pt.add_row([set(["@F_test0"]), "@I5@", GedcomFile._individual_dt["@I5@"].name])
+        expected_pt.add_row([set(["@F_test0"]), "@I5@", self.gedcom._individual_dt["@I5@"].name])
 
         actual = self.gedcom.US33_list_orphans()
         self.assertEqual(expected_pt.get_string(), actual.get_string())
@@ -1166,8 +1179,8 @@ class main_testing(unittest.TestCase):
 
 
          #####Test 2: Father is alive, mother is deceased
-        GedcomFile._individual_dt[father].living = True
-        GedcomFile._individual_dt[mother].living = False
+        self.gedcom._individual_dt[father].living = True
+        self.gedcom._individual_dt[mother].living = False
 
         expected_pt: PrettyTable = PrettyTable(field_names = ['Family ID (as child)', 'Individual ID', 'Name']) 
         # We don't expect any entries in the table
@@ -1178,8 +1191,8 @@ class main_testing(unittest.TestCase):
 
 
          #####Test 3: Father is deceased, mother is alive
-        GedcomFile._individual_dt[father].living = False
-        GedcomFile._individual_dt[mother].living = True
+        self.gedcom._individual_dt[father].living = False
+        self.gedcom._individual_dt[mother].living = True
 
         expected_pt: PrettyTable = PrettyTable(field_names = ['Family ID (as child)', 'Individual ID', 'Name']) 
         # We don't expect any entries in the table
@@ -1190,20 +1203,20 @@ class main_testing(unittest.TestCase):
 
 
          #####Test 4: both parents deceased, more than one sibling is younger than 18
-        GedcomFile._individual_dt[father].living = False
-        GedcomFile._individual_dt[mother].living = False
-        GedcomFile._individual_dt["@I2@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*17))
-        GedcomFile._individual_dt["@I5@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*16))
-        GedcomFile._individual_dt["@I7@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*18))
+        self.gedcom._individual_dt[father].living = False
+        self.gedcom._individual_dt[mother].living = False
+        self.gedcom._individual_dt["@I2@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*17))
+        self.gedcom._individual_dt["@I5@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*16))
+        self.gedcom._individual_dt["@I7@"].birth = datetime.datetime.date(self.today - datetime.timedelta(days=365*18))
 
         # Make sure each child is actually part of the test family.
-        for child in GedcomFile._family_dt["@F_test0"].children:
-            GedcomFile._individual_dt[child].setAge()
-            GedcomFile._individual_dt[child].famc = set(["@F_test0"]) 
+        for child in self.gedcom._family_dt["@F_test0"].children:
+            self.gedcom._individual_dt[child].setAge()
+            self.gedcom._individual_dt[child].famc = set(["@F_test0"]) 
 
         expected_pt: PrettyTable = PrettyTable(field_names = ['Family ID (as child)', 'Individual ID', 'Name']) 
-        expected_pt.add_row([set(["@F_test0"]), "@I5@", GedcomFile._individual_dt["@I5@"].name])
-        expected_pt.add_row([set(["@F_test0"]), "@I2@", GedcomFile._individual_dt["@I2@"].name])
+        expected_pt.add_row([set(["@F_test0"]), "@I5@", self.gedcom._individual_dt["@I5@"].name])
+        expected_pt.add_row([set(["@F_test0"]), "@I2@", self.gedcom._individual_dt["@I2@"].name])
         expected_pt.sortby = 'Individual ID'
         actual = self.gedcom.US33_list_orphans()
         self.assertEqual(expected_pt.get_string(), actual.get_string())
@@ -1212,18 +1225,18 @@ class main_testing(unittest.TestCase):
         '''tests that the method implemented for US24 highlight the case where more than one family has the same spouses and marriage date'''
 
         #Making @F_test1 and @F_test2 the same as @F_test0:
-        GedcomFile._family_dt['@F_test1'].husband_name = 'Test Subject0'
-        GedcomFile._family_dt['@F_test1'].wife_name = 'Test Subject1'
-        GedcomFile._family_dt['@F_test1'].marriage_date = datetime.date(1930,1,1)
+        self.gedcom._family_dt['@F_test1'].husband_name = 'Test Subject0'
+        self.gedcom._family_dt['@F_test1'].wife_name = 'Test Subject1'
+        self.gedcom._family_dt['@F_test1'].marriage_date = datetime.date(1930,1,1)
 
-        GedcomFile._family_dt['@F_test2'].husband_name = 'Test Subject0'
-        GedcomFile._family_dt['@F_test2'].wife_name = 'Test Subject1'
-        GedcomFile._family_dt['@F_test2'].marriage_date = datetime.date(1930,1,1)
+        self.gedcom._family_dt['@F_test2'].husband_name = 'Test Subject0'
+        self.gedcom._family_dt['@F_test2'].wife_name = 'Test Subject1'
+        self.gedcom._family_dt['@F_test2'].marriage_date = datetime.date(1930,1,1)
 
         #Making @F_test4 the same as @F_test3:
-        GedcomFile._family_dt['@F_test4'].husband_name = 'Test Subject6'
-        GedcomFile._family_dt['@F_test4'].wife_name = 'Test Subject7'
-        GedcomFile._family_dt['@F_test4'].marriage_date = datetime.date(1960,4,4)
+        self.gedcom._family_dt['@F_test4'].husband_name = 'Test Subject6'
+        self.gedcom._family_dt['@F_test4'].wife_name = 'Test Subject7'
+        self.gedcom._family_dt['@F_test4'].marriage_date = datetime.date(1960,4,4)
         
         result: List[str] = GedcomFile.US24_unique_families_by_spouses(self.gedcom)
 
@@ -1239,21 +1252,21 @@ class main_testing(unittest.TestCase):
         '''tests that the method implemented for US25 highlights the case where more than one child has the same name and birth date in the same family'''
 
         #Setting individuals "@I1@" and "@I2@" to have same name and birth date as inividual "@I0@", and putting them all as children in family "@F_test0"
-        GedcomFile._individual_dt['@I1@'].name = 'Test Subject0'
-        GedcomFile._individual_dt['@I1@'].birth = datetime.date(1900,12,12)
-        GedcomFile._individual_dt['@I2@'].name = 'Test Subject0'
-        GedcomFile._individual_dt['@I2@'].birth = datetime.date(1900,12,12)
-        GedcomFile._family_dt['@F_test0'].children = ({'@I0@', '@I1@', '@I2@'})
+        self.gedcom._individual_dt['@I1@'].name = 'Test Subject0'
+        self.gedcom._individual_dt['@I1@'].birth = datetime.date(1900,12,12)
+        self.gedcom._individual_dt['@I2@'].name = 'Test Subject0'
+        self.gedcom._individual_dt['@I2@'].birth = datetime.date(1900,12,12)
+        self.gedcom._family_dt['@F_test0'].children = ({'@I0@', '@I1@', '@I2@'})
 
         #Setting individual "@I6@" to have same name and birth date as individual "@I5@", and putting them all as children in family "@F_test3"
-        GedcomFile._individual_dt['@I6@'].name = 'Test Subject5'
-        GedcomFile._individual_dt['@I6@'].birth = datetime.date(1920,7,7)
-        GedcomFile._family_dt['@F_test3'].children = ({'@I5@', '@I6@'})
+        self.gedcom._individual_dt['@I6@'].name = 'Test Subject5'
+        self.gedcom._individual_dt['@I6@'].birth = datetime.date(1920,7,7)
+        self.gedcom._family_dt['@F_test3'].children = ({'@I5@', '@I6@'})
 
         result: List[str] = GedcomFile.US25_unique_first_names_in_families(self.gedcom)
 
-        child_ids_for_fam0: Set[str] = ', '.join(GedcomFile._family_dt['@F_test0'].children)
-        child_ids_for_fam3: Set[str] = ', '.join(GedcomFile._family_dt['@F_test3'].children)
+        child_ids_for_fam0: Set[str] = ', '.join(sorted(self.gedcom._family_dt['@F_test0'].children))
+        child_ids_for_fam3: Set[str] = ', '.join(sorted(self.gedcom._family_dt['@F_test3'].children))
         
         expected: List[str] = [
                 f'ANOMALY: US25: Individuals {child_ids_for_fam0} from family @F_test0, have the same name and birth date: Name: Test Subject0, Birth Date: 1900-12-12',
@@ -1270,32 +1283,32 @@ class main_testing(unittest.TestCase):
         family roles in an individual record are specified as follows: spouse = "fams", child = "famc"
         '''
         #Clears tags to be used in test cases:
-        for individuals in GedcomFile._individual_dt.values():
+        for individuals in self.gedcom._individual_dt.values():
             individuals.fams: Set[str] = set()
             individuals.famc: Set[str] = set()
 
-        for family in GedcomFile._family_dt.values():
+        for family in self.gedcom._family_dt.values():
             family.husband_id: str = ''
             family.wife_id: str = ''
             family.children: Set[str] = set()
 
         #Case where spouse and child roles are inconsistent with family record
-        GedcomFile._individual_dt['@I0@'].fams = ({'@F_test2'})
-        GedcomFile._individual_dt['@I0@'].famc = ({'@F_test3'})
+        self.gedcom._individual_dt['@I0@'].fams = ({'@F_test2'})
+        self.gedcom._individual_dt['@I0@'].famc = ({'@F_test3'})
 
         #Case where only spouse role is inconsistent with family record
-        GedcomFile._individual_dt['@I1@'].fams = ({'@F_test4'})
+        self.gedcom._individual_dt['@I1@'].fams = ({'@F_test4'})
 
         #Case where only child role is inconsistent with family record
-        GedcomFile._individual_dt['@I2@'].famc = ({'@F_test5'})
+        self.gedcom._individual_dt['@I2@'].famc = ({'@F_test5'})
 
         #Family records that are inconsistent with the above individual records:
-        GedcomFile._family_dt['@F_test2'].husband_id = '@I4@'
-        GedcomFile._family_dt['@F_test3'].children = ({'@I5@', '@I6@'})
-        GedcomFile._family_dt['@F_test4'].wife_id = '@I9@'
-        GedcomFile._family_dt['@F_test5'].children = ({'@I8@'})
+        self.gedcom._family_dt['@F_test2'].husband_id = '@I4@'
+        self.gedcom._family_dt['@F_test3'].children = ({'@I5@', '@I6@'})
+        self.gedcom._family_dt['@F_test4'].wife_id = '@I9@'
+        self.gedcom._family_dt['@F_test5'].children = ({'@I8@'})
 
-        fam3_children: str = ', '.join(GedcomFile._family_dt['@F_test3'].children)
+        fam3_children: str = ', '.join(sorted(self.gedcom._family_dt['@F_test3'].children))
 
         result: List[str] = GedcomFile.US26_corresponding_entries_individuals(self.gedcom)
 
@@ -1316,43 +1329,43 @@ class main_testing(unittest.TestCase):
         '''
 
         #Clears tags to be used in test cases:
-        for individuals in GedcomFile._individual_dt.values():
+        for individuals in self.gedcom._individual_dt.values():
             individuals.fams: Set[str] = set()
             individuals.famc: Set[str] = set()
 
-        for family in GedcomFile._family_dt.values():
+        for family in self.gedcom._family_dt.values():
             family.husband_id: str = ''
             family.wife_id: str = ''
             family.children: Set[str] = set()
 
         #Case where husband, wife, and child roles are inconsistent with individual record:
-        GedcomFile._family_dt['@F_test0'].husband_id = '@I0@'
-        GedcomFile._family_dt['@F_test0'].wife_id = '@I1@'
-        GedcomFile._family_dt['@F_test0'].children = ({'@I2@', '@I3@', '@I4@'})
+        self.gedcom._family_dt['@F_test0'].husband_id = '@I0@'
+        self.gedcom._family_dt['@F_test0'].wife_id = '@I1@'
+        self.gedcom._family_dt['@F_test0'].children = ({'@I2@', '@I3@', '@I4@'})
 
         #Case where wife role is inconsistent with individual record:
-        GedcomFile._family_dt['@F_test1'].wife_id = '@I5@'
+        self.gedcom._family_dt['@F_test1'].wife_id = '@I5@'
 
         #Case where husband role is inconsistent with individual record:
-        GedcomFile._family_dt['@F_test2'].husband_id = '@I6@'
+        self.gedcom._family_dt['@F_test2'].husband_id = '@I6@'
 
         #Case where a child role is inconsistent with individual record:
-        GedcomFile._family_dt['@F_test3'].children = ({'@I7@'})
+        self.gedcom._family_dt['@F_test3'].children = ({'@I7@'})
 
         #Individual records that are inconsistent with the above family records:
-        GedcomFile._individual_dt['@I0@'].fams = ({'@F_test5'})
-        GedcomFile._individual_dt['@I1@'].fams = ({'@F_test5'})
-        GedcomFile._individual_dt['@I2@'].famc = ({'@F_test5'})
-        GedcomFile._individual_dt['@I3@'].famc = ({'@F_test5'})
-        GedcomFile._individual_dt['@I4@'].famc = ({'@F_test5'})
-        GedcomFile._individual_dt['@I5@'].fams = ({'@F_test4'})
-        GedcomFile._individual_dt['@I6@'].fams = ({'@F_test3'})
-        GedcomFile._individual_dt['@I7@'].famc = ({'@F_test1'})
-
-        fam0_children: List[str] = list(GedcomFile._family_dt['@F_test0'].children)
-        fam0_child1: str = f'{fam0_children[0]}-{GedcomFile._individual_dt[fam0_children[0]].name}'
-        fam0_child2: str = f'{fam0_children[1]}-{GedcomFile._individual_dt[fam0_children[1]].name}'
-        fam0_child3: str = f'{fam0_children[2]}-{GedcomFile._individual_dt[fam0_children[2]].name}'
+        self.gedcom._individual_dt['@I0@'].fams = ({'@F_test5'})
+        self.gedcom._individual_dt['@I1@'].fams = ({'@F_test5'})
+        self.gedcom._individual_dt['@I2@'].famc = ({'@F_test5'})
+        self.gedcom._individual_dt['@I3@'].famc = ({'@F_test5'})
+        self.gedcom._individual_dt['@I4@'].famc = ({'@F_test5'})
+        self.gedcom._individual_dt['@I5@'].fams = ({'@F_test4'})
+        self.gedcom._individual_dt['@I6@'].fams = ({'@F_test3'})
+        self.gedcom._individual_dt['@I7@'].famc = ({'@F_test1'})
+
+        fam0_children: List[str] = sorted(self.gedcom._family_dt['@F_test0'].children)
+        fam0_child1: str = f'{fam0_children[0]}-{self.gedcom._individual_dt[fam0_children[0]].name}'
+        fam0_child2: str = f'{fam0_children[1]}-{self.gedcom._individual_dt[fam0_children[1]].name}'
+        fam0_child3: str = f'{fam0_children[2]}-{self.gedcom._individual_dt[fam0_children[2]].name}'
 
         result: List[str] = GedcomFile.US26_corresponding_entries_families(self.gedcom)
 
@@ -1376,14 +1389,14 @@ class main_testing(unittest.TestCase):
     def test_US29_list_deceased_individuals(self) -> None:
         '''tests that the method implented for US29 stores the ID and Name for all individuals that are deceased'''
 
-        GedcomFile._individual_dt['@I0@'].living = False
-        GedcomFile._individual_dt['@I0@'].death_date = datetime.date(1990,10,12)
+        self.gedcom._individual_dt['@I0@'].living = False
+        self.gedcom._individual_dt['@I0@'].death_date = datetime.date(1990,10,12)
 
-        GedcomFile._individual_dt['@I1@'].living = False
-        GedcomFile._individual_dt['@I1@'].death_date = datetime.date(1985,11,11)
+        self.gedcom._individual_dt['@I1@'].living = False
+        self.gedcom._individual_dt['@I1@'].death_date = datetime.date(1985,11,11)
 
-        GedcomFile._individual_dt['@I2@'].living = False
-        GedcomFile._individual_dt['@I2@'].death_date = datetime.date(1995,11,11)
+        self.gedcom._individual_dt['@I2@'].living = False
+        self.gedcom._individual_dt['@I2@'].death_date = datetime.date(1995,11,11)
 
 
         result: Dict[str, str] = GedcomFile.US29_list_deceased_individuals(self.gedcom)
@@ -1411,35 +1424,35 @@ class main_testing(unittest.TestCase):
         expected_persons_list = list()
 
         # 30 Days Ahead - Expected in the output
-        person = GedcomFile._individual_dt["@I0@"]
+        person = self.gedcom._individual_dt["@I0@"]
         person.birth = datetime.datetime.date(self.today + datetime.timedelta(days=30))
         expected_persons_list.append([person.id, person.name, person.birth, 30])
 
         # 30 Days Ahead, but deceased - Not expected in the output
-        person = GedcomFile._individual_dt["@I1@"]
+        person = self.gedcom._individual_dt["@I1@"]
         person.birth = datetime.datetime.date(self.today + datetime.timedelta(days=30))
         person.living = False
 
         # 30 Days already past - not Expected in the output
-        person = GedcomFile._individual_dt["@I2@"]
+        person = self.gedcom._individual_dt["@I2@"]
         person.birth = datetime.datetime.date(self.today - datetime.timedelta(days=30))
 
         # Birthday Tomorrow! - Expected in the output
-        person = GedcomFile._individual_dt["@I3@"]
+        person = self.gedcom._individual_dt["@I3@"]
         person.birth = datetime.datetime.date(self.today + datetime.timedelta(days=1))
         expected_persons_list.append([person.id, person.name, person.birth, 1])
 
         # Birthday Yesterday -Not Expected in the output
-        person = GedcomFile._individual_dt["@I4@"]
+        person = self.gedcom._individual_dt["@I4@"]
         person.birth = datetime.datetime.date(self.today - datetime.timedelta(days=1))
 
         # Birthday Today! - Expected in the output
-        person = GedcomFile._individual_dt["@I5@"]
+        person = self.gedcom._individual_dt["@I5@"]
         person.birth =  datetime.date(self.today.year, self.today.month, self.today.day) 
         expected_persons_list.append([person.id, person.name, person.birth, 0])
 
         # 31 Days ahead - Not expected in the output
-        person = GedcomFile._individual_dt["@I11@"]
+        person = self.gedcom._individual_dt["@I11@"]
         person.birth = datetime.datetime.date(self.today - datetime.timedelta(days=31))
 
 
@@ -1478,31 +1491,31 @@ class main_testing(unittest.TestCase):
         expected_family_list = list()
 
         # 30 Days Ahead - Expected in the output
-        family = GedcomFile._family_dt["@F_test0"]
+        family = self.gedcom._family_dt["@F_test0"]
         family.marriage_date = datetime.datetime.date(self.today + datetime.timedelta(days=30))
         expected_family_list.append([family.id, 30])
 
         # 30 Days Ahead, but divorced - Not expected in the output
-        family = GedcomFile._family_dt["@F_test1"]
+        family = self.gedcom._family_dt["@F_test1"]
         family.marriage_date = datetime.datetime.date(self.today + datetime.timedelta(days=30))
         family.divorce_date =  datetime.datetime.date(self.today + datetime.timedelta(days=365))
 
         # 1 Day already past - not Expected in the output
-        family = GedcomFile._family_dt["@F_test2"]
+        family = self.gedcom._family_dt["@F_test2"]
         family.marriage_date = datetime.datetime.date(self.today - datetime.timedelta(days=1))
 
         # Anniversary Tomorrow! - Expected in the output
-        family = GedcomFile._family_dt["@F_test3"]
+        family = self.gedcom._family_dt["@F_test3"]
         family.marriage_date = datetime.datetime.date(self.today + datetime.timedelta(days=1))
         expected_family_list.append([family.id, 1])
 
         # Anniversary Today, but spouse is deceased. Not Expected in the output
-        family = GedcomFile._family_dt["@F_test4"]
+        family = self.gedcom._family_dt["@F_test4"]
         family.marriage_date =  datetime.date(self.today.year, self.today.month, self.today.day)
         self.gedcom._individual_dt[family.wife_id].living = False
 
         # 31 Days ahead - Not expected in the output
-        family = GedcomFile._family_dt["@F_test5"]
+        family = self.gedcom._family_dt["@F_test5"]
         family.marriage_date = datetime.datetime.date(self.today + datetime.timedelta(days=31))
 
         # Invoke method under test, determine result.
@@ -1522,6 +1535,991 @@ class main_testing(unittest.TestCase):
         actual_pt = self.gedcom.US39_print_upcoming_anniversaries()
         self.assertEqual(test_pt_upcoming_adays.get_string(), actual_pt.get_string())
 
+    def test_parse_file_streaming(self) -> None:
+        '''tests that the single pass streaming ingest builds the same records as the step by step read/validate/parse ingest'''
+
+        gedcom_lines: str = "\n".join([
+            "0 HEAD",
+            "0 NOTE a note that mentions INDI",
+            "0 @S1@ INDI",
+            "1 NAME Stream /Test/",
+            "2 NAME Invalid Level",
+            "1 SEX F",
+            "1 BIRT",
+            "2 DATE 3 MAR 1950",
+            "1 FAMS @SF1@",
+            "",
+            "0 @S2@ INDI",
+            "1 NAME Other /Test/",
+            "1 SEX M",
+            "1 FAMS @SF1@",
+            "0 @SF1@ FAM",
+            "1 HUSB @S2@",
+            "1 WIFE @S1@",
+            "1 MARR",
+            "2 DATE 1 JAN 1970",
+            "1 _CURRENT Y",
+            "0 @S1@ INDI",
+            "1 NAME Duplicate /Test/",
+            "0 TRLR",
+        ])
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_name: str = os.path.join(directory, 'stream.ged')
+            with open(file_name, 'w') as file:
+                file.write(gedcom_lines)
+
+            staged: GedcomFile = GedcomFile()
+            staged.read_file(file_name)
+            staged.validate_tags_for_output()
+            staged.update_validated_list()
+            staged.parse_validated_gedcom()
+            expected_individuals = [individual.return_pretty_table_row() for individual in staged._individual_dt.values()]
+            expected_families = [family.return_pretty_table_row() for family in staged._family_dt.values()]
+            expected_duplicates = [individual.name for individual in staged._list_of_duplicate_individual_ids]
+
+            streamed: GedcomFile = GedcomFile()
+            streamed.parse_file_streaming(file_name)
+
+        self.assertEqual(expected_individuals, [individual.return_pretty_table_row() for individual in streamed._individual_dt.values()])
+        self.assertEqual(expected_families, [family.return_pretty_table_row() for family in streamed._family_dt.values()])
+        self.assertEqual(expected_duplicates, [individual.name for individual in streamed._list_of_duplicate_individual_ids])
+        self.assertEqual(['Duplicate /Test/'], expected_duplicates)
+        self.assertEqual([], streamed._validated_list)
+
+
+    def test_decode_gedcom_date(self) -> None:
+        '''tests that full, partial and qualified GEDCOM dates are decoded without raising'''
+
+        self.assertEqual(datetime.date(1991, 3, 20), decode_gedcom_date('20 MAR 1991'))
+        self.assertEqual(datetime.date(1991, 3, 20), decode_gedcom_date('20 Mar 1991'))
+        self.assertEqual(datetime.date(1950, 5, 1), decode_gedcom_date('MAY 1950'))
+        self.assertEqual(datetime.date(1950, 1, 1), decode_gedcom_date('1950'))
+        self.assertEqual(datetime.date(1900, 1, 1), decode_gedcom_date('ABT 1900'))
+        self.assertEqual(datetime.date(1900, 2, 1), decode_gedcom_date('BET FEB 1900 AND 1910'))
+        self.assertEqual(None, decode_gedcom_date('31 FEB 1900'))
+        self.assertEqual(None, decode_gedcom_date('UNKNOWN'))
+        self.assertEqual(None, decode_gedcom_date(''))
+
+        # An undecodable date leaves the individual's birth unset instead of failing the whole load
+        person: Individual = Individual()
+        person.details('BIRT', '')
+        person.details('DATE', 'SOMETIME')
+        person.details('DEAT', '')
+        person.details('DATE', 'ABT 1990')
+        self.assertEqual(('', '', False), (person.birth, person.age, person.living))
+        self.assertEqual(datetime.date(1990, 1, 1), person.death_date)
+
+
+    def test_instance_scoped_records(self) -> None:
+        '''tests that records parsed by one GedcomFile are not visible to another GedcomFile'''
+
+        other: GedcomFile = GedcomFile()
+        other.parse_entries([(0, 'INDI', '@X1@'), (1, 'NAME', 'Other /Tree/'), (0, 'INDI', '@X1@')])
+
+        self.assertEqual(['@X1@'], list(other._individual_dt))
+        self.assertEqual(1, len(other._list_of_duplicate_individual_ids))
+        self.assertEqual(dict(), other._family_dt)
+        self.assertNotIn('@X1@', self.gedcom._individual_dt)
+        self.assertEqual(12, len(self.gedcom._individual_dt))
+        self.assertEqual([], self.gedcom._list_of_duplicate_individual_ids)
+
+        # Slotted records do not carry a per-instance __dict__
+        self.assertFalse(hasattr(Individual(), '__dict__'))
+        self.assertFalse(hasattr(Family(), '__dict__'))
+
+
+    def test_relationship_index(self) -> None:
+        '''tests the parents, children, spouses, siblings and families lookups of the relationship index'''
+
+        # @I0@ and @I1@ (@F_test0) are the parents of @I2@ and @I5@. @I2@ and @I3@ (@F_test1) are the parents of @I4@.
+        self.gedcom._family_dt["@F_test0"].children = set(["@I2@", "@I5@"])
+        self.gedcom._family_dt["@F_test1"].children = set(["@I4@"])
+        self.gedcom._individual_dt["@I2@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I5@"].famc = set(["@F_test0"])
+        self.gedcom._individual_dt["@I4@"].famc = set(["@F_test1"])
+
+        # @I7@ claims a family that does not exist
+        self.gedcom._individual_dt["@I7@"].famc = set(["@F_missing"])
+
+        relationships = self.gedcom.build_relationship_index()
+
+        self.assertEqual(["@I0@", "@I1@"], relationships.parents_of("@I2@"))
+        self.assertEqual(["@I2@", "@I3@"], relationships.parents_of("@I4@"))
+        self.assertEqual([], relationships.parents_of("@I7@"))
+        self.assertEqual({"@I2@", "@I5@"}, set(relationships.children_of("@I1@")))
+        self.assertEqual([("@F_test1", "@I3@")], relationships.spouses_of("@I2@"))
+        self.assertEqual([("@F_test1", "@I2@")], relationships.spouses_of("@I3@"))
+        self.assertEqual(["@I5@"], relationships.siblings_of("@I2@"))
+        self.assertEqual(({"@F_test0"}, {"@F_test1"}), relationships.families_of("@I2@"))
+        self.assertEqual((set(), set()), relationships.families_of("@unknown@"))
+        self.assertEqual(["@I0@", "@I1@"], self.gedcom.find_grandparents("@I4@"))
+        self.assertIs(relationships, self.gedcom.relationship_index())
+
+
+    def test_US17_child_linked_through_other_spouse_or_famc(self):
+        # @I0@ and @I1@ (@F_test0) are the parents of @I3@. @I0@ later marries his daughter @I3@ (@F_test1).
+        self.gedcom._family_dt["@F_test0"].children = set(["@I3@"])
+        self.gedcom._family_dt["@F_test1"].husband_id = "@I0@"
+        self.gedcom._family_dt["@F_test1"].husband_name = self.gedcom._individual_dt["@I0@"].name
+
+        # @I4@ and @I5@ (@F_test2) are the parents of @I6@, but only @I6@'s record says so (FAMC without a matching CHIL).
+        # @I5@ later marries her son @I6@ (@F_test3).
+        self.gedcom._individual_dt["@I6@"].famc = set(["@F_test2"])
+        self.gedcom._family_dt["@F_test3"].wife_id = "@I5@"
+        self.gedcom._family_dt["@F_test3"].wife_name = self.gedcom._individual_dt["@I5@"].name
+
+        result = GedcomFile.US17_no_marraige_2_children(self.gedcom)
+        expect = ["Error US17 Family ID @F_test1 Father: Father's ID @I0@ husban's name Test Subject0 is married to his child's ID @I1@ child's name Test Subject1",
+                  "Error US17 Family ID @F_test3 Mother: wife's ID @I5@ wife's name Test Subject5 is married to her child's ID @I4@ child's name Test Subject4",
+                  ]
+        self.assertEqual(expect, result)
+
+
+    def test_group_by_key(self) -> None:
+        '''tests that records are bucketed by key in one pass, keeping the input order, and that only repeated keys are reported as duplicates'''
+
+        records: List[Tuple[str, int]] = [('b', 1), ('a', 2), ('b', 3), ('c', 4), ('b', 5), ('a', 6)]
+
+        groups = group_by_key(records, key = lambda record: record[0])
+        self.assertEqual(['b', 'a', 'c'], list(groups))
+        self.assertEqual([('b', 1), ('b', 3), ('b', 5)], groups['b'])
+
+        duplicates = list(find_duplicate_groups(records, key = lambda record: record[0]))
+        self.assertEqual([('b', [('b', 1), ('b', 3), ('b', 5)]), ('a', [('a', 2), ('a', 6)])], duplicates)
+
+
+    def test_US14_counts_each_birth_event(self):
+        '''tests that US14 counts the siblings of each birth event instead of all siblings that are part of any multiple birth'''
+
+        # Triplets born in 1980 and quadruplets born in 1990: 7 siblings in multiple births, but no birth event larger than 5
+        children: List[str] = ["@I2@", "@I3@", "@I4@", "@I5@", "@I6@", "@I7@", "@I8@"]
+        self.gedcom._family_dt["@F_test0"].children = set(children)
+        for child in children[:3]:
+            self.gedcom._individual_dt[child].birth = datetime.date(1980, 1, 1)
+        for child in children[3:]:
+            self.gedcom._individual_dt[child].birth = datetime.date(1990, 6, 6)
+        self.gedcom._individual_dt["@I8@"].birth = datetime.date(1990, 6, 7)
+
+        birth_events = self.gedcom.multiple_birth_groups(self.gedcom._family_dt["@F_test0"].children)
+
+        self.assertEqual([{"@I2@", "@I3@", "@I4@"}, {"@I5@", "@I6@", "@I7@", "@I8@"}], [{child.id for child in event} for event in birth_events])
+        self.assertEqual("@I8@", birth_events[1][-1].id)
+        self.assertEqual(7, len(self.gedcom.Determine_multiple_birth(self.gedcom._family_dt["@F_test0"].children)))
+        self.assertEqual([], GedcomFile.US14_multiple_births(self.gedcom))
+
+
+    def test_descendant_and_ancestor_traversal(self) -> None:
+        '''tests the iterative descendant and ancestor walks on a lineage deeper than the recursion limit, and on cyclic data'''
+
+        # A single line of descent: @D0@ is the only child of @DF0@, and @D(n)@ is the husband of @DF(n+1)@
+        generations: int = sys.getrecursionlimit() + 100
+        for n in range(generations):
+            person = Individual()
+            person.id = f"@D{n}@"
+            person.fams = set([f"@DF{n + 1}@"])
+            person.famc = set([f"@DF{n}@"])
+            self.gedcom._individual_dt[person.id] = person
+
+            family = Family()
+            family.id = f"@DF{n}@"
+            family.husband_id = f"@D{n - 1}@" if n > 0 else ""
+            family.children = set([person.id])
+            self.gedcom._family_dt[family.id] = family
+
+        descendants = self.gedcom.iter_family_descendants("@DF0@")
+        self.assertEqual("@D0@", next(descendants))
+        self.assertEqual([f"@D{n}@" for n in range(1, generations)], list(descendants))
+        self.assertEqual(f"@D{generations - 2}@", next(self.gedcom.iter_ancestors(f"@D{generations - 1}@")))
+        self.assertEqual(generations - 1, len(list(self.gedcom.iter_ancestors(f"@D{generations - 1}@"))))
+
+        # Bad data: @I0@ is listed as a child of his own grandchild's family
+        self.gedcom._family_dt["@F_test0"].children = set(["@I2@"])
+        self.gedcom._individual_dt["@I2@"].famc = set(["@F_test0"])
+        self.gedcom._family_dt["@F_test1"].children = set(["@I4@"])
+        self.gedcom._individual_dt["@I4@"].famc = set(["@F_test1"])
+        self.gedcom._family_dt["@F_test2"].children = set(["@I0@"])
+        self.gedcom._individual_dt["@I0@"].famc = set(["@F_test2"])
+        self.gedcom.build_relationship_index()
+
+        self.assertEqual(["@I2@", "@I4@", "@I0@"], list(self.gedcom.iter_descendants("@I0@")))
+        self.assertEqual(["@I2@", "@I4@", "@I0@"], list(self.gedcom.iter_family_descendants("@F_test0")))
+        self.assertEqual({"@I0@", "@I1@", "@I2@", "@I3@", "@I5@"}, set(self.gedcom.iter_ancestors("@I4@")))
+        self.assertEqual([], list(self.gedcom.iter_descendants("@unknown@")))
+
+
+    def test_related_couples(self) -> None:
+        '''tests the ancestor depths and the detection of couples sharing an ancestor at a configurable generation distance'''
+
+        # @I0@ + @I1@ (@F_test0) are the parents of @I2@ and @I3@ (siblings).
+        # @I2@ has @I4@ (@F_test1, with @I5@), @I3@ has @I6@ (@F_test2, with @I7@), so @I4@ and @I6@ are first cousins.
+        # @I4@ has @I8@ (@F_test3, with @I9@). @I8@ marries his first cousin once removed @I6@ (@F_test4).
+        # @F_test5 points at an individual that does not exist.
+        def make_family(family_id, husband_id, wife_id, children):
+            family = self.gedcom._family_dt[family_id]
+            family.husband_id, family.wife_id, family.children = husband_id, wife_id, set(children)
+            for child_id in children:
+                self.gedcom._individual_dt[child_id].famc = set([family_id])
+
+        make_family("@F_test0", "@I0@", "@I1@", ["@I2@", "@I3@"])
+        make_family("@F_test1", "@I2@", "@I5@", ["@I4@"])
+        make_family("@F_test2", "@I7@", "@I3@", ["@I6@"])
+        make_family("@F_test3", "@I4@", "@I9@", ["@I8@"])
+        make_family("@F_test4", "@I8@", "@I6@", [])
+        make_family("@F_test5", "@I10@", "@I_missing@", [])
+
+        self.assertEqual({"@I4@": 1, "@I9@": 1, "@I2@": 2, "@I5@": 2, "@I0@": 3, "@I1@": 3}, self.gedcom.ancestor_depths("@I8@"))
+        self.assertEqual({"@I0@": (3, 2), "@I1@": (3, 2)}, self.gedcom.common_ancestors("@I8@", "@I6@"))
+
+        self.assertEqual([], list(self.gedcom.find_related_couples(2)))
+
+        related = list(self.gedcom.find_related_couples(3))
+        self.assertEqual(1, len(related))
+        family, ancestor_id, husband_depth, wife_depth = related[0]
+        self.assertEqual(("@F_test4", 3, 2), (family.id, husband_depth, wife_depth))
+        self.assertIn(ancestor_id, {"@I0@", "@I1@"})
+        self.assertEqual("first cousins once removed", self.gedcom.describe_consanguinity(husband_depth, wife_depth))
+
+        self.assertEqual("siblings", self.gedcom.describe_consanguinity(1, 1))
+        self.assertEqual("uncle/aunt and niece/nephew", self.gedcom.describe_consanguinity(1, 2))
+        self.assertEqual("great-grand-uncle/aunt and great-grand-niece/nephew", self.gedcom.describe_consanguinity(4, 1))
+        self.assertEqual("second cousins", self.gedcom.describe_consanguinity(3, 3))
+
+        # Missing spouses do not raise, and no couple here are first cousins
+        self.assertEqual([], GedcomFile.US19_married_first_cousins(self.gedcom))
+
+        # With max generations, US19 reports the related couples with how they are related
+        self.gedcom._max_generations = 3
+        self.gedcom.family_set_spouse_names()
+        findings = list(self.gedcom.US19_findings())
+        self.assertEqual(1, len(findings))
+        self.assertEqual(("@F_test4", "@I8@", "@I6@", ancestor_id), findings[0].record_ids)
+        self.assertEqual(f"ANOMALY: US19: Family id: @F_test4 Husband name: {self.gedcom._individual_dt['@I8@'].name}, husband id: @I8@ and wife name: "
+                         f"{self.gedcom._individual_dt['@I6@'].name}, wife id: @I6@ are first cousins once removed, sharing ancestor {ancestor_id}", findings[0].render())
+        self.assertEqual(["@F_test4"], GedcomFile.US19_married_first_cousins(self.gedcom))
+
+        self.gedcom._max_generations = 2
+        self.assertEqual([], list(self.gedcom.US19_findings()))
+
+    def test_first_cousins_pedigree_collapse(self) -> None:
+        '''tests that a husband whose parents are siblings is not taken for his wife's first cousin, and that a cyclic lineage gives the same ancestors whatever is asked first'''
+
+        # @I2@ and @I3@ are siblings (@F_test0) and the parents of @I4@ (@F_test1), whose two grandparents are @I0@ and @I1@ on both sides.
+        # @I4@ marries @I5@ (@F_test2), a daughter of @I6@ and @I7@ (@F_test3), who are not related to him.
+        # @I8@ is the son of @I10@ (@F_test4), who is the son of @I8@ (@F_test5).
+        def make_family(family_id, husband_id, wife_id, children):
+            family = self.gedcom._family_dt[family_id]
+            family.husband_id, family.wife_id, family.children = husband_id, wife_id, set(children)
+            for child_id in children:
+                self.gedcom._individual_dt[child_id].famc = set([family_id])
+
+        make_family("@F_test0", "@I0@", "@I1@", ["@I2@", "@I3@"])
+        make_family("@F_test1", "@I2@", "@I3@", ["@I4@"])
+        make_family("@F_test2", "@I4@", "@I5@", [])
+        make_family("@F_test3", "@I6@", "@I7@", ["@I5@"])
+        make_family("@F_test4", "@I10@", "@I11@", ["@I8@"])
+        make_family("@F_test5", "@I8@", "@I9@", ["@I10@"])
+        self.gedcom.family_set_spouse_names()
+
+        self.assertEqual({"@I2@": 1, "@I3@": 1, "@I0@": 2, "@I1@": 2}, self.gedcom.ancestor_depths("@I4@"))
+        self.assertEqual({"@I2@": 1, "@I3@": 1}, self.gedcom.ancestor_depths("@I4@", 1))
+        self.assertEqual({}, self.gedcom.common_ancestors("@I4@", "@I5@"))
+        self.assertEqual([], list(self.gedcom.US19_findings()))
+
+        # His parents are the related couple
+        self.assertEqual([("@F_test1", "@I0@", 1, 1)], [(family.id, ancestor_id, husband_depth, wife_depth)
+                                                        for family, ancestor_id, husband_depth, wife_depth in self.gedcom.find_related_couples(1)])
+
+        self.assertEqual({"@I10@": 1, "@I11@": 1, "@I9@": 2}, self.gedcom.ancestor_depths("@I8@"))
+        self.assertEqual({"@I8@": 1, "@I9@": 1, "@I11@": 2}, self.gedcom.ancestor_depths("@I10@"))
+        self.assertEqual({"@I10@": 1, "@I11@": 1, "@I9@": 2}, self.gedcom.ancestor_depths("@I8@"))
+
+    def test_collect_findings(self):
+        self.gedcom._individual_dt["@I11@"].death_date = datetime.date(2000,4,13)
+        self.gedcom._individual_dt["@I11@"].birth = datetime.date(2000,4,14)
+        husband_id = self.gedcom._family_dt["@F_test0"].husband_id
+        self.gedcom._individual_dt[husband_id].sex = "F"
+
+        # Quiet mode neither formats nor prints the messages
+        stdout = sys.stdout
+        sys.stdout = output = io.StringIO()
+        try:
+            findings = self.gedcom.collect_findings()
+        finally:
+            sys.stdout = stdout
+        self.assertEqual("", output.getvalue())
+
+        us03 = [finding for finding in findings if finding.story == 'US03']
+        self.assertEqual(1, len(us03))
+        self.assertEqual(('ERROR', ('@I11@',), (datetime.date(2000,4,13), datetime.date(2000,4,14))), (us03[0].severity, us03[0].record_ids, us03[0].dates))
+        self.assertEqual(GedcomFile.US03_birth_death(self.gedcom), [us03[0].render()])
+
+        us21 = [finding for finding in findings if finding.story == 'US21']
+        self.assertEqual([("@F_test0", husband_id)], [finding.record_ids for finding in us21])
+
+        output = io.StringIO()
+        self.assertEqual(len(findings), render_findings(findings, file = output))
+        self.assertEqual([finding.render() for finding in findings], output.getvalue().splitlines())
+
+    def test_collect_findings_in_parallel(self):
+        self.gedcom._individual_dt["@I11@"].death_date = datetime.date(2000,4,13)
+        self.gedcom._individual_dt["@I11@"].birth = datetime.date(2000,4,14)
+        self.gedcom._family_dt["@F_test1"].divorce_date = datetime.date(1900,1,1)
+
+        expected = self.gedcom.collect_findings()
+        self.assertNotEqual([], expected)
+
+        # Same findings, in the same order, whichever pool runs the stories
+        self.assertEqual(expected, self.gedcom.collect_findings(workers = 3))
+        self.assertEqual(expected, self.gedcom.collect_findings(workers = 3, use_threads = True))
+
+    def test_select_stories(self):
+        self.assertEqual(len(GedcomFile._stories), len(GedcomFile.select_stories()))
+
+        stories = GedcomFile.select_stories(['us3', 'US26'])
+        self.assertEqual(['US03', 'US26', 'US26'], [story.id for story in stories])
+        self.assertEqual(['US30', 'US31', 'US03', 'US28'], [story.id for story in GedcomFile.select_stories(['US3'], ['list'])][:4])
+        self.assertTrue(all(story.category == 'error' for story in GedcomFile.select_stories(categories = ['error'])))
+
+        with self.assertRaises(ValueError):
+            GedcomFile.select_stories(['US99'])
+
+        # Stories that do not need the relationship index do not build it
+        stories = GedcomFile.select_stories(['US03', 'US07'])
+        self.gedcom.prepare_stories(stories)
+        self.assertIsNone(self.gedcom._relationship_index)
+
+        self.gedcom.prepare_stories(GedcomFile.select_stories(['US17']))
+        self.assertIsNotNone(self.gedcom._relationship_index)
+
+    def test_parse_file_sharded(self) -> None:
+        '''tests that parsing a file in shards on worker processes builds the same records, duplicates included, as parsing it in one pass'''
+
+        records: List[str] = ["0 HEAD"]
+        for i in range(0, 40):
+            # Every tenth individual reuses an earlier ID, so some duplicates land in another shard than the original
+            individual_id: str = f"@I{i - 9}@" if i % 10 == 9 else f"@I{i}@"
+            records += [f"0 {individual_id} INDI", f"1 NAME Shard{i} /Test/", "1 SEX M", "1 BIRT", f"2 DATE {i % 28 + 1} MAR 1950", "1 FAMS @F0@"]
+        records += ["0 @F0@ FAM", "1 HUSB @I0@", "1 MARR", "2 DATE 1 JAN 1970", "0 @F0@ FAM", "1 HUSB @I1@", "0 TRLR"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_name: str = os.path.join(directory, 'shards.ged')
+            with open(file_name, 'w') as file:
+                file.write("\n".join(records))
+
+            with open(file_name, 'rb') as file:
+                buffer: bytes = file.read()
+            boundaries: List[int] = find_record_boundaries(buffer, 8)
+            self.assertEqual((0, len(buffer)), (boundaries[0], boundaries[-1]))
+            self.assertEqual(9, len(boundaries))
+            self.assertTrue(all(buffer[start:].startswith(b"0 @") for start in boundaries[1:-1]))
+
+            streamed: GedcomFile = GedcomFile()
+            streamed.parse_file_streaming(file_name)
+
+            sharded: GedcomFile = GedcomFile()
+            sharded.parse_file_sharded(file_name, workers = 3)
+
+        self.assertEqual([individual.return_pretty_table_row() for individual in streamed._individual_dt.values()],
+                         [individual.return_pretty_table_row() for individual in sharded._individual_dt.values()])
+        self.assertEqual([family.return_pretty_table_row() for family in streamed._family_dt.values()],
+                         [family.return_pretty_table_row() for family in sharded._family_dt.values()])
+        self.assertEqual([individual.name for individual in streamed._list_of_duplicate_individual_ids],
+                         [individual.name for individual in sharded._list_of_duplicate_individual_ids])
+        self.assertEqual(4, len(sharded._list_of_duplicate_individual_ids))
+        self.assertEqual(['@I1@'], [family.husband_id for family in sharded._list_of_duplicate_family_ids])
+
+    def test_sharded_findings_order(self) -> None:
+        '''tests that the findings are rendered in the same order whether the file was parsed on 1 or on several workers'''
+
+        # Old parents with many children, some of them also claimed by another family, so US12, US16, US25 and US26 report several children per family
+        records: List[str] = ["0 HEAD"]
+        for f in range(0, 6):
+            records += [f"0 @H{f}@ INDI", f"1 NAME Father{f} /Old/", "1 SEX M", "1 BIRT", "2 DATE 1 JAN 1900", f"1 FAMS @F{f}@",
+                        f"0 @W{f}@ INDI", f"1 NAME Mother{f} /Old/", "1 SEX F", "1 BIRT", "2 DATE 1 JAN 1910", f"1 FAMS @F{f}@"]
+            for c in range(0, 14):
+                records += [f"0 @C{f}_{c}@ INDI", f"1 NAME Child{c % 7} /{'Old' if c % 2 else 'New'}/", "1 SEX M", "1 BIRT", f"2 DATE {c % 3 + 1} JAN 1995",
+                            f"1 FAMC @F{f}@", f"1 FAMC @F{(f + 1) % 6}@"]
+        for f in range(0, 6):
+            records += [f"0 @F{f}@ FAM", f"1 HUSB @H{f}@", f"1 WIFE @W{f}@"] + [f"1 CHIL @C{f}_{c}@" for c in range(0, 14)] + ["1 CHIL @C_missing@"]
+        records += ["0 TRLR"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_name: str = os.path.join(directory, 'children.ged')
+            with open(file_name, 'w') as file:
+                file.write("\n".join(records))
+
+            rendered: List[List[str]] = list()
+            for workers in (1, 4):
+                gedcom: GedcomFile = GedcomFile()
+                gedcom.parse_file_sharded(file_name, workers)
+                gedcom.prepare_stories(GedcomFile._stories)
+                rendered.append([finding.render() for finding in gedcom.collect_findings()])
+
+        self.assertEqual(rendered[0], rendered[1])
+        self.assertEqual(6 * 14 * 2, len([message for message in rendered[0] if message.startswith("ANOMALY: US12")]))
+        self.assertTrue(any(message.startswith("ERROR: US16") for message in rendered[0]))
+
+    def test_parse_file_mapped(self) -> None:
+        '''tests that the memory-mapped reader finds the same valid lines, and builds the same records, as the text reader'''
+
+        gedcom_lines: str = "\r\n".join([
+            "0 HEAD",
+            "0 NOTE a note that mentions INDI",
+            "0 @M1@ INDI",
+            "1  NAME   Mapped  /Test/ ",
+            "2 NAME Invalid Level",
+            "1 SEX F",
+            "1 BIRT",
+            "2 DATE 3 MAR 1950",
+            "2 PLAC Skipped, Town",
+            "3 TIME 12:00:00",
+            "1 FAMS @MF1@",
+            "",
+            " 1 FAMS @MF2@",
+            "0 @M2@ INDI",
+            "1 NAME Other /Tést/",
+            "1 SEX\tM",
+            "1 FAMS @MF1@",
+            "1 FAMC @INDIANA@",
+            "0 @MF1@ FAM",
+            "1 HUSB @M2@",
+            "1 WIFE @M1@",
+            "1 _CURRENT Y",
+            "0 @M1@ INDI",
+            "1 NAME Duplicate FAM",
+            "0 TRLR",
+        ])
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_name: str = os.path.join(directory, 'mapped.ged')
+            with open(file_name, 'w', encoding = 'utf-8', newline = '') as file:
+                file.write(gedcom_lines)
+
+            with open(file_name, 'rb') as file, mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ) as buffer:
+                mapped: GedcomFile = GedcomFile()
+                entries = list(mapped.stream_valid_tokens(buffer))
+                # Chunks smaller than most lines still end at the end of a line
+                self.assertEqual(entries, list(mapped.stream_valid_tokens(buffer, chunk_size = 16)))
+
+            streamed: GedcomFile = GedcomFile()
+            streamed.parse_file_streaming(file_name)
+
+            mapped: GedcomFile = GedcomFile()
+            mapped.parse_file_mapped(file_name)
+
+        # The same lines are valid, but the arguments the records do not use are never decoded
+        self.assertEqual([entry if entry[1] in GedcomFile._decoded_tags or entry[1] in ('INDI', 'FAM') else entry[:2] + ('',)
+                          for entry in streamed.stream_valid_entries(gedcom_lines.split("\r\n"))], entries)
+        self.assertEqual((0, 'INDI', '@M1@'), entries[2])
+        self.assertEqual((1, 'NAME', 'Mapped /Test/'), entries[3])
+        self.assertEqual((0, 'TRLR', ''), entries[-1])
+
+        self.assertEqual([individual.return_pretty_table_row() for individual in streamed._individual_dt.values()],
+                         [individual.return_pretty_table_row() for individual in mapped._individual_dt.values()])
+        self.assertEqual([family.return_pretty_table_row() for family in streamed._family_dt.values()],
+                         [family.return_pretty_table_row() for family in mapped._family_dt.values()])
+        self.assertEqual([individual.name for individual in streamed._list_of_duplicate_individual_ids],
+                         [individual.name for individual in mapped._list_of_duplicate_individual_ids])
+        self.assertEqual(1, len(mapped._list_of_duplicate_individual_ids))
+        self.assertEqual(('Mapped /Test/', 'Other /Tést/'), (mapped._individual_dt['@M1@'].name, mapped._individual_dt['@M2@'].name))
+
+    def test_parse_encoding(self) -> None:
+        '''tests that every reader decodes a file with the encoding it is given, including encodings whose lines can not be found in the raw bytes'''
+
+        records: List[str] = ["0 HEAD"]
+        for i in range(0, 20):
+            records += [f"0 @E{i}@ INDI", f"1 NAME José{i} /Niño/", "1 SEX M", "1 BIRT", "2 DATE 1 MAR 1950"]
+        records += ["0 TRLR"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            for encoding in ('latin-1', 'utf-16'):
+                file_name: str = os.path.join(directory, f'{encoding}.ged')
+                with open(file_name, 'w', encoding = encoding) as file:
+                    file.write("\n".join(records))
+
+                streamed: GedcomFile = GedcomFile(encoding = encoding)
+                streamed.parse_file_streaming(file_name)
+                mapped: GedcomFile = GedcomFile(encoding = encoding)
+                mapped.parse_file_mapped(file_name)
+                sharded: GedcomFile = GedcomFile(encoding = encoding)
+                sharded.parse_file_sharded(file_name, workers = 3)
+                revalidated: GedcomFile = GedcomFile(encoding = encoding)
+                revalidated.revalidate_file(file_name)
+                read: GedcomFile = GedcomFile(encoding = encoding)
+                read.read_file(file_name)
+                read.validate_tags_for_output()
+                read.update_validated_list()
+                read.parse_validated_gedcom()
+
+                for gedcom in (streamed, mapped, sharded, revalidated, read):
+                    self.assertEqual([f"José{i} /Niño/" for i in range(0, 20)], [individual.name for individual in gedcom._individual_dt.values()], encoding)
+
+    def test_snapshot(self) -> None:
+        '''tests that a snapshot restores the parsed records while the GEDCOM file is unchanged, and is ignored once it changes'''
+
+        gedcom_lines: List[str] = ["0 @N1@ INDI", "1 NAME Snap /Shot/", "1 BIRT", "2 DATE 1 JAN 1950", "1 FAMS @NF1@",
+                                   "0 @N1@ INDI", "1 NAME Duplicate /Shot/", "0 @NF1@ FAM", "1 WIFE @N1@", "0 TRLR"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_name: str = os.path.join(directory, 'snapshot.ged')
+            snapshot_file: str = os.path.join(directory, 'snapshot.pickle')
+            with open(file_name, 'w') as file:
+                file.write("\n".join(gedcom_lines))
+
+            parsed: GedcomFile = GedcomFile()
+            self.assertFalse(parsed.load_snapshot(snapshot_file, file_name))
+            parsed.parse_file_streaming(file_name)
+            parsed.save_snapshot(snapshot_file, file_name)
+
+            loaded: GedcomFile = GedcomFile()
+            self.assertTrue(loaded.load_snapshot(snapshot_file, file_name))
+
+            # Same content with a new modification time is still a match
+            os.utime(file_name, ns = (0, 0))
+            self.assertTrue(GedcomFile().load_snapshot(snapshot_file, file_name))
+
+            with open(file_name, 'w') as file:
+                file.write("\n".join(gedcom_lines).replace("Snap", "Snip"))
+            self.assertFalse(GedcomFile().load_snapshot(snapshot_file, file_name))
+
+        self.assertEqual([individual.return_pretty_table_row() for individual in parsed._individual_dt.values()],
+                         [individual.return_pretty_table_row() for individual in loaded._individual_dt.values()])
+        self.assertEqual([family.return_pretty_table_row() for family in parsed._family_dt.values()],
+                         [family.return_pretty_table_row() for family in loaded._family_dt.values()])
+        self.assertEqual(['Duplicate /Shot/'], [individual.name for individual in loaded._list_of_duplicate_individual_ids])
+
+    def test_revalidate_file(self) -> None:
+        '''tests that revalidating a changed file only parses the changed records, and finds what a full validation finds'''
+
+        gedcom_lines: List[str] = ["0 HEAD", "0 @R1@ INDI", "1 NAME Pat /Doe/", "1 SEX M", "1 BIRT", "2 DATE 1 JAN 1950", "1 FAMS @RF1@",
+                                   "0 @R2@ INDI", "1 NAME Sam /Doe/", "1 SEX F", "1 BIRT", "2 DATE 1 JAN 1952", "1 FAMS @RF1@",
+                                   "0 @R3@ INDI", "1 NAME Kim /Doe/", "1 SEX M", "1 BIRT", "2 DATE 1 JAN 1980", "1 FAMC @RF1@",
+                                   "0 @RF1@ FAM", "1 HUSB @R1@", "1 WIFE @R2@", "1 CHIL @R3@", "1 MARR", "2 DATE 1 JAN 1975", "0 TRLR"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_name: str = os.path.join(directory, 'revalidate.ged')
+            with open(file_name, 'w') as file:
+                file.write("\n".join(gedcom_lines))
+
+            incremental: GedcomFile = GedcomFile()
+            self.assertEqual([], incremental.revalidate_file(file_name))
+            unchanged: Individual = incremental._individual_dt['@R1@']
+            relationships = incremental.relationship_index()
+
+            # A snapshot keeps the digests of the records, not the text, and is revalidated from them
+            snapshot_file: str = os.path.join(directory, 'revalidate.pickle')
+            incremental.save_snapshot(snapshot_file, file_name)
+            loaded: GedcomFile = GedcomFile()
+            self.assertTrue(loaded.load_snapshot(snapshot_file))
+            loaded_unchanged: Individual = loaded._individual_dt['@R1@']
+
+            # The wife is now born after the marriage (US02) and the son has a new last name (US16)
+            gedcom_text: str = "\n".join(gedcom_lines).replace("Kim /Doe/", "Kim /Roe/").replace("1 JAN 1952", "1 JAN 1976")
+            with open(file_name, 'w') as file:
+                file.write(gedcom_text)
+
+            findings: List[str] = [finding.render() for finding in incremental.revalidate_file(file_name)]
+
+            full: GedcomFile = GedcomFile()
+            full.parse_file_streaming(file_name)
+            full.prepare_stories(GedcomFile._stories)
+
+            self.assertEqual([finding.render() for finding in full.collect_findings()], findings)
+            self.assertEqual(['US02', 'US16'], sorted({finding.story for finding in full.collect_findings()}))
+            self.assertIs(unchanged, incremental._individual_dt['@R1@'])
+            self.assertIs(relationships, incremental.relationship_index())
+
+            self.assertEqual(findings, [finding.render() for finding in loaded.revalidate_file(file_name)])
+            self.assertIs(loaded_unchanged, loaded._individual_dt['@R1@'])
+
+            # A second son, born the same day as the first, is added between the records
+            with open(file_name, 'w') as file:
+                file.write(gedcom_text.replace("0 @RF1@ FAM", "0 @R4@ INDI\n1 NAME Lou /Doe/\n1 SEX M\n1 BIRT\n2 DATE 1 JAN 1980\n1 FAMC @RF1@\n0 @RF1@ FAM\n1 CHIL @R4@"))
+
+            findings = [finding.render() for finding in incremental.revalidate_file(file_name)]
+
+            full = GedcomFile()
+            full.parse_file_streaming(file_name)
+            full.prepare_stories(GedcomFile._stories)
+
+        self.assertEqual([finding.render() for finding in full.collect_findings()], findings)
+        self.assertEqual(list(full._individual_dt), list(incremental._individual_dt))
+        self.assertEqual(['@R3@'], incremental.relationship_index().siblings_of('@R4@'))
+        self.assertEqual(['@R3@', '@R4@'], incremental.relationship_index().children_of('@R1@'))
+        self.assertIs(relationships, incremental.relationship_index())
+
+    def test_matching_length(self) -> None:
+        '''tests that the length two texts have in common from two positions on is found whatever its size'''
+
+        self.assertEqual(0, matching_length('', 0, '', 0))
+        self.assertEqual(3, matching_length('abc', 0, 'abc', 0))
+        self.assertEqual(1, matching_length('abc', 0, 'axc', 0))
+        self.assertEqual(2, matching_length('xabc', 1, 'abd', 0))
+        self.assertEqual(0, matching_length('abc', 3, 'abc', 0))
+
+        previous: str = ''.join(f'{number}\n' for number in range(100000))
+        current: str = previous.replace('5000\n', '5000\n0 @X@ INDI\n', 1)
+        start: int = previous.index('5000\n') + 5
+        self.assertEqual(start, matching_length(previous, 0, current, 0, block_size = 64))
+        self.assertEqual(len(previous) - start, matching_length(previous, start, current, start + 11, block_size = 64))
+
+    def test_watch_file(self) -> None:
+        '''tests that watching a file reports every finding first, then only the new and resolved findings after each save'''
+
+        gedcom_lines: List[str] = ["0 @W1@ INDI", "1 NAME Wat /Ch/", "1 BIRT", "2 DATE 1 JAN 1990", "1 DEAT", "2 DATE 1 JAN 1980", "0 TRLR"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_name: str = os.path.join(directory, 'watch.ged')
+            with open(file_name, 'w') as file:
+                file.write("\n".join(gedcom_lines))
+
+            watch: Iterator = self.gedcom.watch_file(file_name, interval = 0)
+            new_findings, resolved_findings = next(watch)
+            self.assertEqual(['US03'], [finding.story for finding in new_findings])
+            self.assertEqual([], resolved_findings)
+
+            # Death now follows birth, but both are in the future
+            with open(file_name, 'w') as file:
+                file.write("\n".join(gedcom_lines).replace("1 JAN 1980", "1 JAN 3000").replace("1 JAN 1990", "1 JAN 2999"))
+            os.utime(file_name, ns = (0, 0))
+
+            new_findings, resolved_findings = next(watch)
+            self.assertEqual(['US01', 'US01'], [finding.story for finding in new_findings])
+            self.assertEqual(['US03'], [finding.story for finding in resolved_findings])
+
+            # The record links are updated in place, and the records set aside from the garbage collector are handed back when the watch stops
+            record_links: RecordLinks = self.gedcom.record_links()
+            with open(file_name, 'a') as file:
+                file.write("\n0 @W2@ INDI\n1 NAME Sec /Ond/\n0 TRLR")
+            os.utime(file_name, ns = (1, 1))
+
+            frozen: int = gc.get_freeze_count()
+            self.assertGreater(frozen, 0)
+            self.assertEqual(([], []), next(watch))
+            self.assertIs(record_links, self.gedcom.record_links())
+            self.assertLessEqual(gc.get_freeze_count(), frozen)
+
+            # A file that can not be read is reported, and the watch goes on with the next save
+            with open(file_name, 'wb') as file:
+                file.write(b"0 @W1@ INDI\n1 NAME \xff\xfe /Ch/\n0 TRLR")
+            os.utime(file_name, ns = (2, 2))
+
+            def save_again() -> None:
+                # Replace the file in one step, so the watch does not read it half written
+                with open(file_name + '.new', 'w') as file:
+                    file.write("\n".join(gedcom_lines))
+                os.utime(file_name + '.new', ns = (3, 3))
+                os.replace(file_name + '.new', file_name)
+
+            errors: io.StringIO = io.StringIO()
+            timer: threading.Timer = threading.Timer(0.2, save_again)
+            timer.start()
+            with contextlib.redirect_stderr(errors):
+                new_findings, resolved_findings = next(watch)
+            timer.join()
+            self.assertIn('could not validate, UnicodeDecodeError', errors.getvalue())
+            self.assertEqual(['US03'], [finding.story for finding in new_findings])
+
+            watch.close()
+            self.assertEqual(0, gc.get_freeze_count())
+
+    def test_validation_server(self) -> None:
+        '''tests that the validation server returns the findings of GEDCOM text and paths, and turns away invalid and oversized requests'''
+
+        gedcom_text: str = "\n".join(["0 @V1@ INDI", "1 NAME Ser /Ver/", "1 BIRT", "2 DATE 1 JAN 1990", "1 DEAT", "2 DATE 1 JAN 1980", "0 TRLR"])
+        server: ValidationServer = ValidationServer(('127.0.0.1', 0), workers = 1, queue_size = 2, max_request_size = 4096)
+        threading.Thread(target = server.serve_forever, daemon = True).start()
+
+        def post(body: Dict) -> Tuple[int, Dict]:
+            request = urllib.request.Request(f'http://127.0.0.1:{server.server_address[1]}/validate', data = json.dumps(body).encode('utf-8'))
+            try:
+                with urllib.request.urlopen(request) as reply:
+                    return reply.status, json.load(reply)
+            except urllib.error.HTTPError as error:
+                return error.code, json.load(error)
+
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                file_name: str = os.path.join(directory, 'server.ged')
+                with open(file_name, 'w') as file:
+                    file.write(gedcom_text)
+
+                status, reply = post({ 'gedcom' : gedcom_text })
+                self.assertEqual(200, status)
+                self.assertEqual(['US03'], [finding['story'] for finding in reply['findings']])
+                self.assertEqual(['1980-01-01', '1990-01-01'], reply['findings'][0]['dates'])
+
+                status, reply = post({ 'files' : [{ 'path' : file_name }, { 'path' : os.path.join(directory, 'missing.ged') }], 'stories' : ['US1'] })
+                self.assertEqual(200, status)
+                self.assertEqual([], reply['results'][0]['findings'])
+                self.assertIn('FileNotFoundError', reply['results'][1]['error'])
+
+            self.assertEqual(400, post({ 'gedcom' : gedcom_text, 'stories' : ['US99'] })[0])
+            self.assertEqual(400, post({ 'file' : 'typo.ged' })[0])
+            self.assertEqual(413, post({ 'files' : [{ 'gedcom' : gedcom_text }] * 3 })[0])
+
+            # Stories and categories are lists of strings, not a string whose characters would be taken for stories
+            self.assertEqual((400, { 'error' : '"stories" must be a list of strings' }), post({ 'gedcom' : gedcom_text, 'stories' : 'US19' }))
+            self.assertEqual(400, post({ 'gedcom' : gedcom_text, 'stories' : 19 })[0])
+            self.assertEqual(400, post({ 'gedcom' : gedcom_text, 'categories' : [1] })[0])
+
+            # A large request is turned away from its Content-Length, without waiting for its body
+            connection: http.client.HTTPConnection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout = 10)
+            connection.putrequest('POST', '/validate')
+            connection.putheader('Content-Length', str(1 << 40))
+            connection.endheaders()
+            reply: http.client.HTTPResponse = connection.getresponse()
+            self.assertEqual(413, reply.status)
+            reply.read()
+            connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_validate_files(self) -> None:
+        '''tests that batch validation reports every file of a directory or glob pattern, and sums up their findings'''
+
+        with tempfile.TemporaryDirectory() as directory:
+            os.mkdir(os.path.join(directory, 'family'))
+            gedcom_files: Dict[str, str] = { 'a.ged' : "0 @B1@ INDI\n1 BIRT\n2 DATE 1 JAN 2999\n0 TRLR",
+                                             os.path.join('family', 'b.ged') : "0 @B2@ INDI\n1 BIRT\n2 DATE 1 JAN 1990\n1 DEAT\n2 DATE 1 JAN 1980\n0 TRLR",
+                                             'c.ged' : "0 @B3@ INDI\n1 FAMS @BF1@\n0 TRLR",
+                                             'notes.txt' : "not a GEDCOM file" }
+            for name, text in gedcom_files.items():
+                with open(os.path.join(directory, name), 'w') as file:
+                    file.write(text)
+
+            file_names: List[str] = expand_gedcom_paths(directory)
+            self.assertEqual([os.path.join(directory, name) for name in ('a.ged', 'c.ged', os.path.join('family', 'b.ged'))], file_names)
+            self.assertEqual([os.path.join(directory, 'a.ged')], expand_gedcom_paths(os.path.join(directory, 'a*')))
+
+            output: IO[str] = io.StringIO()
+            summary: Dict = asyncio.run(validate_files(file_names, workers = 2, file = output))
+
+        results: Dict[str, Dict] = { os.path.basename(result['path']) : result for result in map(json.loads, output.getvalue().splitlines()) }
+        self.assertEqual(['US01'], [finding['story'] for finding in results['a.ged']['findings']])
+        self.assertEqual(['US03'], [finding['story'] for finding in results['b.ged']['findings']])
+        # A FAMS pointer to a family that does not exist is reported, not a crash
+        self.assertEqual(['ERROR: US26: Individual @B3@- and Family @BF1@ show spouse inconsistency. @B3@- is identified as spouse in @BF1@, but @BF1@ does not exist'],
+                         [finding['message'] for finding in results['c.ged']['findings']])
+        self.assertEqual((3, 0, 3, 0), (summary['files'], summary['failed'], summary['errors'], summary['anomalies']))
+
+    def test_generate_gedcom(self) -> None:
+        '''tests that the synthetic GEDCOM generator writes the number of individuals asked for, with consistent families, and that anomalies can be turned off'''
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_name: str = os.path.join(directory, 'synthetic.ged')
+            write_gedcom(file_name, generate_gedcom(500, depth = 4, anomaly_rate = 0))
+            synthetic: GedcomFile = GedcomFile()
+            synthetic.parse_file_streaming(file_name)
+
+        synthetic.prepare_stories(GedcomFile._stories)
+        stories: Set[str] = {finding.story for finding in synthetic.collect_findings()}
+
+        self.assertEqual(500, len(synthetic._individual_dt))
+        self.assertTrue(synthetic._family_dt)
+        self.assertTrue(stories.isdisjoint({'US01', 'US03', 'US04', 'US22', 'US26'}))
+        self.assertTrue(any(family.children for family in synthetic._family_dt.values()))
+
+    def test_profiler(self) -> None:
+        '''tests that a profiler measures every dependency and story that runs, with their counts, and that the measurements can be written as JSON'''
+
+        profiler: Profiler = Profiler()
+        gedcom: GedcomFile = GedcomFile(profiler)
+        gedcom._individual_dt = self.gedcom._individual_dt
+        gedcom._family_dt = self.gedcom._family_dt
+
+        stories: List = GedcomFile.select_stories(['US03', 'US21'])
+        gedcom.prepare_stories(stories)
+        findings: List = gedcom.collect_findings(stories = stories)
+
+        self.assertEqual(['prepare spouse_names', 'US21_findings', 'US03_findings'], [stage['stage'] for stage in profiler.stages])
+        self.assertEqual(len(findings), sum(stage['counts'].get('findings', 0) for stage in profiler.stages))
+        self.assertTrue(all(stage['wall_seconds'] >= 0 and stage['cpu_seconds'] >= 0 for stage in profiler.stages))
+
+        measurements: Dict = json.loads(json.dumps(profiler.as_dict()))
+        self.assertEqual(3, len(measurements['stages']))
+        self.assertEqual(3, len(profiler.summary_table().rows))
+
+        # The batch and incremental modes write their profile too
+        with tempfile.TemporaryDirectory() as directory:
+            file_name: str = os.path.join(directory, 'profiled.ged')
+            with open(file_name, 'w') as file:
+                file.write("0 @P1@ INDI\n1 BIRT\n2 DATE 1 JAN 1990\n1 DEAT\n2 DATE 1 JAN 1980\n0 TRLR\n")
+
+            profile_file: str = os.path.join(directory, 'profile.json')
+            for arguments, stages in ((['--batch', directory], ['batch']),
+                                      ([file_name, '--snapshot', os.path.join(directory, 'snapshot'), '--incremental'], ['load snapshot', 'save snapshot', 'render findings'])):
+                subprocess.run([sys.executable, 'SSW555_Group_Project.py', *arguments, '--profile-json', profile_file], check = True, stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL,
+                               cwd = os.path.dirname(os.path.abspath(__file__)))
+                with open(profile_file) as file:
+                    measured: List[str] = [stage['stage'] for stage in json.load(file)['stages']]
+                self.assertTrue(set(stages).issubset(measured), measured)
+
+    def test_method_profiler(self) -> None:
+        '''tests that the chosen methods of one GedcomFile are profiled on every call, with a .pstats file and an allocation report each, and still return the same results'''
+
+        self.assertEqual(['US23_uni_name_birth', 'US23_findings', 'family_set_spouse_names'],
+                         GedcomFile.profiled_methods(['us23', 'US23', 'family_set_spouse_names']))
+        self.assertRaises(ValueError, GedcomFile.profiled_methods, ['US99'])
+        self.assertRaises(ValueError, GedcomFile.profiled_methods, ['_family_dt'])
+
+        expected: List = list(self.gedcom.US03_findings())
+
+        with tempfile.TemporaryDirectory() as directory:
+            method_profiler: MethodProfiler = MethodProfiler(directory)
+            method_profiler.attach(self.gedcom, GedcomFile.profiled_methods(['US03']))
+
+            self.assertEqual(expected, list(self.gedcom.US03_findings()))
+            self.assertEqual(expected, list(self.gedcom.US03_findings()))
+            # US03_findings called by US03_birth_death is measured as part of it
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.gedcom.US03_birth_death()
+
+            self.assertEqual({'US03_findings': 2, 'US03_birth_death': 1}, dict(method_profiler.calls))
+            self.assertEqual(sorted(['US03_findings.1.pstats', 'US03_findings.1.allocations.txt', 'US03_findings.2.pstats', 'US03_findings.2.allocations.txt',
+                                     'US03_birth_death.1.pstats', 'US03_birth_death.1.allocations.txt']), sorted(os.listdir(directory)))
+
+            stats: pstats.Stats = pstats.Stats(os.path.join(directory, 'US03_birth_death.1.pstats'))
+            self.assertIn('US03_findings', {function for _, _, function in stats.stats})
+
+            # Other instances are not wrapped
+            GedcomFile().US03_findings()
+            self.assertEqual(2, method_profiler.calls['US03_findings'])
+
+    def test_streaming_table(self) -> None:
+        '''tests that a streaming table prints like PrettyTable when it fits in one chunk, grows its columns for wider rows, and that the listings print the same either way'''
+
+        rows: List = [['@I1@', 'Ann /Lee/'], ['@I2@', 'Bo /Li/'], ['@I3@', 'Christopher /Longname/']]
+        expected: PrettyTable = PrettyTable(field_names = ['ID', 'Name'])
+        expected.add_rows(rows)
+
+        output: io.StringIO = io.StringIO()
+        with StreamingTable(['ID', 'Name'], output) as table:
+            for row in rows:
+                table.add_row(row)
+        self.assertEqual(f'{expected}\n', output.getvalue())
+
+        output = io.StringIO()
+        with StreamingTable(['ID', 'Name'], output, chunk_size = 2) as table:
+            for row in rows:
+                table.add_row(row)
+        # The first chunk sets the widths, the wider row of the second chunk widens the Name column
+        self.assertEqual(['+------+-----------+', '|  ID  |    Name   |', '+------+-----------+', '| @I1@ | Ann /Lee/ |', '| @I2@ |  Bo /Li/  |',
+                          '+------+------------------------+', '| @I3@ | Christopher /Longname/ |', '+------+------------------------+'], output.getvalue().splitlines())
+
+        output = io.StringIO()
+        StreamingTable(['ID', 'Name'], output).close()
+        self.assertEqual(f"{PrettyTable(field_names = ['ID', 'Name'])}\n", output.getvalue())
+
+        streaming: GedcomFile = GedcomFile(table_options = { 'chunk_size' : 1000 })
+        streaming._individual_dt = self.gedcom._individual_dt
+        streaming._family_dt = self.gedcom._family_dt
+
+        for method in ('print_individuals_pretty', 'print_family_pretty', 'US28_list_all_siblings_from_oldest_to_youngest', 'US29_list_deceased_individuals'):
+            printed: io.StringIO = io.StringIO()
+            with contextlib.redirect_stdout(printed):
+                getattr(self.gedcom, method)()
+            streamed: io.StringIO = io.StringIO()
+            with contextlib.redirect_stdout(streamed):
+                getattr(streaming, method)()
+            self.assertEqual(printed.getvalue(), streamed.getvalue(), method)
+
+        # The rows are printed as the listing yields them, one chunk at a time, rather than kept until the end
+        self.gedcom._individual_dt['@I0@'].living = False
+        self.gedcom._individual_dt['@I1@'].living = False
+        streaming._table_options = { 'chunk_size' : 1 }
+        streamed = io.StringIO()
+        with contextlib.redirect_stdout(streamed):
+            rows: Iterator = streaming.US29_print_deceased_individuals()
+            self.assertEqual('@I0@', next(rows)[0])
+            self.assertIn('@I0@', streamed.getvalue())
+            self.assertNotIn('@I1@', streamed.getvalue())
+            self.assertEqual(['@I1@'], [row[0] for row in rows])
+        self.assertEqual(1, streamed.getvalue().count('@I1@'))
+
+    def test_export_records(self) -> None:
+        '''tests that the individuals, families and findings are written as JSON Lines, CSV and columnar arrays with the same values'''
+
+        stories: List = GedcomFile.select_stories(['INDI', 'FAM', 'US03', 'US21'])
+        self.gedcom.prepare_stories(stories)
+
+        with tempfile.TemporaryDirectory() as directory:
+            counts: Dict[str, Dict[str, int]] = dict()
+            for name, writer in (('jsonl', JsonLinesWriter(os.path.join(directory, 'records.jsonl'))), ('csv', CsvWriter(os.path.join(directory, 'csv'))),
+                                 ('columnar', ColumnarWriter(os.path.join(directory, 'columnar')))):
+                with writer:
+                    counts[name] = self.gedcom.export_records(writer, stories)
+
+            expected: Dict[str, int] = { 'individuals' : len(self.gedcom._individual_dt), 'families' : len(self.gedcom._family_dt),
+                                         'findings' : len(self.gedcom.collect_findings(stories = stories)) }
+            self.assertEqual({ 'jsonl' : expected, 'csv' : expected, 'columnar' : expected }, counts)
+
+            with open(os.path.join(directory, 'records.jsonl')) as file:
+                records: List[Dict] = [json.loads(line) for line in file]
+            self.assertEqual(sorted(self.gedcom._individual_dt), [record['id'] for record in records if record['table'] == 'individuals'])
+
+            tables: Dict[str, List[Dict]] = group_by_key(records, lambda record: record.pop('table'))
+            for table in ('individuals', 'families', 'findings'):
+                rows: List[Dict] = tables[table]
+                columns: Dict[str, List] = read_columnar_table(os.path.join(directory, 'columnar'), table)
+                self.assertEqual(rows, [dict(zip(columns, values)) for values in zip(*columns.values())], table)
+
+                # The arrays have a fixed width whatever the size of the platform's C int
+                widths: Dict[str, int] = { 'i8' : 1, 'i32' : 4, 'i64' : 8 }
+                sizes: Dict[str, int] = { file_name : os.path.getsize(file_name) for file_name in glob.glob(os.path.join(directory, 'columnar', f'{table}.*'))
+                                          if file_name.rsplit('.', 1)[1] in widths }
+                self.assertTrue(sizes, table)
+                self.assertEqual({ file_name : widths[file_name.rsplit('.', 1)[1]] * len(rows) for file_name in sizes }, sizes)
+
+                with open(os.path.join(directory, 'csv', f'{table}.csv'), newline = '') as file:
+                    self.assertEqual([row['id' if table != 'findings' else 'message'] for row in rows],
+                                     [row['id' if table != 'findings' else 'message'] for row in csv.DictReader(file)])
+
+    def test_check_findings(self) -> None:
+        '''tests that check mode only runs the error stories, and stops running them once the limit is reached'''
+
+        for individual_id in ('@I0@', '@I1@'):
+            self.gedcom._individual_dt[individual_id].birth = datetime.date(2000, 1, 1)
+            self.gedcom._individual_dt[individual_id].death_date = datetime.date(1990, 1, 1)
+
+        stories: List = GedcomFile.select_stories()
+        self.gedcom.prepare_stories(stories)
+        errors: List = [finding for story in stories if story.category == 'error' and story.findings for finding in getattr(self.gedcom, story.findings)()]
+
+        self.assertLess(1, len(errors))
+        self.assertEqual(errors, self.gedcom.check_findings(stories))
+        self.assertEqual(errors, self.gedcom.check_findings())
+        self.assertEqual([], self.gedcom.check_findings(GedcomFile.select_stories(categories = ['anomaly', 'list', 'table'])))
+        self.assertEqual(errors[:1], self.gedcom.check_findings(stories, 1))
+
+        # The stories after the first finding never run
+        first_story: int = [story.id for story in stories].index(errors[0].story)
+        for story in stories[first_story + 1:]:
+            if story.category == 'error' and story.findings:
+                setattr(self.gedcom, story.findings, None)
+        self.assertEqual(errors[:1], self.gedcom.check_findings(stories, 1))
+
+    def test_missing_records(self) -> None:
+        '''tests that pointers to individuals and families without a record are reported by US26, and that no story fails on them'''
+
+        gedcom_text: str = ("0 @I1@ INDI\n1 NAME Al /Bo/\n1 SEX M\n1 BIRT\n2 DATE 1 JAN 1950\n1 FAMS @F1@\n1 FAMS @F9@\n1 FAMC @F8@\n"
+                            "0 @I2@ INDI\n1 NAME Cy /Bo/\n1 SEX F\n1 FAMS @F1@\n"
+                            "0 @F1@ FAM\n1 HUSB @I1@\n1 WIFE @I2@\n1 CHIL @I7@\n1 MARR\n2 DATE 1 JAN 1975\n1 DIV\n2 DATE 1 JAN 1980\n"
+                            "0 @F2@ FAM\n1 HUSB @I5@\n1 WIFE @I6@\n1 CHIL @I1@\n1 CHIL @I2@\n1 MARR\n2 DATE 1 JAN 1940\n0 TRLR\n")
+        gedcom: GedcomFile = GedcomFile()
+        gedcom.parse_entries(gedcom.stream_valid_entries(io.StringIO(gedcom_text)))
+
+        stories: List = GedcomFile.select_stories()
+        gedcom.prepare_stories(stories)
+        with contextlib.redirect_stdout(io.StringIO()):
+            gedcom.run_stories(stories)
+
+        missing: List = [finding.record_ids for finding in gedcom.collect_findings() if finding.story == 'US26' and 'does not exist' in finding.render()]
+        self.assertEqual([('@I1@', '@F9@'), ('@I1@', '@F8@'), ('@F1@', '@I7@'), ('@F2@', '@I5@'), ('@F2@', '@I6@')], missing)
+
+
 
 
 